@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+#
+# Measures the overhead of a single call to ``Evaluator.evaluate()``, for
+# different numbers of positions, using a function that takes (almost) no time
+# to evaluate.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import numpy as np
+import pints
+
+
+def nothing(x):
+    """ A function that does nothing. """
+    return 0.0
+
+
+def overhead(evaluator, n, repeats):
+    """
+    Returns the mean time per call to ``evaluator.evaluate()`` for ``n``
+    positions.
+    """
+    xs = np.zeros((n, 2))
+    evaluator.evaluate(xs)  # Warm up: starts workers, allocates buffers
+    timer = pints.Timer()
+    for i in range(repeats):
+        evaluator.evaluate(xs)
+    return timer.time() / repeats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    evaluators = [
+        ('Sequential', pints.SequentialEvaluator(nothing)),
+        ('Parallel', pints.ParallelEvaluator(
+            nothing, n_workers=args.workers)),
+        ('Parallel (shared)', pints.ParallelEvaluator(
+            nothing, n_workers=args.workers, shared_memory=True)),
+        ('Parallel (chunks)', pints.ParallelEvaluator(
+            nothing, n_workers=args.workers, chunk_size='auto')),
+    ]
+
+    print('Overhead per call to evaluate(), in ms')
+    print('Evaluator                  1         10        100       1000')
+    for name, e in evaluators:
+        times = [overhead(e, n, args.repeats) for n in (1, 10, 100, 1000)]
+        print('{:18s} '.format(name)
+              + ' '.join(['{:10.4f}'.format(t * 1e3) for t in times]))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+#
+# Measures the throughput of the ParallelEvaluator for a high-dimensional
+# Gaussian target (whose gradient uses multithreaded BLAS routines), with and
+# without limits on the number of native threads per worker and CPU pinning.
+#
+# For each setting, the largest number of threads used by a native thread pool
+# in any worker is shown, to check that the limit took effect. This requires
+# the optional threadpoolctl package.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import warnings
+import numpy as np
+import pints
+import pints.toy
+
+try:
+    import threadpoolctl
+except ImportError:
+    threadpoolctl = None
+
+
+def bench(evaluator, xs, repeats):
+    """ Returns the number of evaluations per second. """
+    evaluator.evaluate(xs)  # Warm up: starts workers
+    timer = pints.Timer()
+    for i in range(repeats):
+        evaluator.evaluate(xs)
+    return repeats * len(xs) / timer.time()
+
+
+def pool_threads(x):
+    """
+    Returns the largest number of threads used by a native thread pool in
+    the current process.
+    """
+    return max(p['num_threads'] for p in threadpoolctl.threadpool_info())
+
+
+def worker_threads(evaluator, n):
+    """
+    Returns the largest number of threads used by a native thread pool in any
+    of the evaluator's workers, or ``'?'`` if this can't be determined.
+    """
+    if threadpoolctl is None:
+        return '?'
+    evaluator.set_function(pool_threads)
+    return max(evaluator.evaluate(list(range(4 * n))))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--dimension', type=int, default=500)
+    parser.add_argument('--positions', type=int, default=32)
+    args = parser.parse_args()
+
+    # Create target with a dense covariance matrix
+    d = args.dimension
+    a = np.random.normal(0, 1, (d, d))
+    log_pdf = pints.toy.GaussianLogPDF(np.zeros(d), a.dot(a.T) + d * np.eye(d))
+    xs = np.random.normal(0, 1, (args.positions, d))
+
+    settings = [
+        ('No limits', {}),
+        ('1 thread per worker', {'max_threads_per_worker': 1}),
+        ('1 thread per worker, pinned', {
+            'max_threads_per_worker': 1, 'pin_workers': True}),
+    ]
+
+    n = args.workers or pints.ParallelEvaluator.cpu_count()
+    print('Dimension ' + str(d) + ', ' + str(n) + ' workers')
+    if threadpoolctl is None:
+        print('Install threadpoolctl to check the number of threads used.')
+    print('Settings                      Evaluations/s  Threads')
+    for name, kwargs in settings:
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            e = pints.ParallelEvaluator(
+                log_pdf.evaluateS1, n_workers=args.workers, **kwargs)
+        speed = bench(e, xs, args.repeats)
+        print('{:<28s}  {:13.1f}  {:>7}'.format(
+            name, speed, worker_threads(e, n)))
+        for warning in w:
+            print('  Warning: ' + str(warning.message))
+        del e
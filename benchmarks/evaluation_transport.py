@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+#
+# Compares the queue-based and shared-memory position/result transport used
+# by the ParallelEvaluator.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import numpy as np
+import pints
+
+
+def cheap(x):
+    """ A very cheap function, so that communication time dominates. """
+    return float(np.sum(x ** 2))
+
+
+def bench(evaluator, xs, repeats):
+    """ Returns the mean time per call to ``evaluator.evaluate(xs)``. """
+    evaluator.evaluate(xs)  # Warm up: starts workers, allocates buffers
+    timer = pints.Timer()
+    for i in range(repeats):
+        evaluator.evaluate(xs)
+    return timer.time() / repeats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--dimension', type=int, default=10)
+    args = parser.parse_args()
+
+    print('Positions  Queue (ms)  Shared (ms)  Speed-up')
+    for n in (10, 100, 500, 1000, 5000):
+        xs = np.random.normal(0, 1, (n, args.dimension))
+        e1 = pints.ParallelEvaluator(cheap, n_workers=args.workers)
+        e2 = pints.ParallelEvaluator(
+            cheap, n_workers=args.workers, shared_memory=True)
+        t1 = bench(e1, xs, args.repeats)
+        t2 = bench(e2, xs, args.repeats)
+        print('{:9d}  {:10.3f}  {:11.3f}  {:8.2f}'.format(
+            n, t1 * 1e3, t2 * 1e3, t1 / t2))
+        del e1, e2
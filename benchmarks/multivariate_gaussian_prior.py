@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+#
+# Compares the MultivariateGaussianLogPrior, which factorises its covariance
+# matrix once, with evaluation and sampling that refactorise it on every call.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import argparse
+import numpy as np
+import scipy.stats
+import pints
+
+
+def bench(f, repeats):
+    """ Returns the mean time per call to ``f()``. """
+    f()     # Warm up
+    timer = pints.Timer()
+    for i in range(repeats):
+        f()
+    return timer.time() / repeats
+
+
+def report(name, t1, t2):
+    """ Prints a line comparing times ``t1`` (old) and ``t2`` (new). """
+    print('  {:18s} {:10.3f}  {:10.3f}  {:8.1f}'.format(
+        name, t1 * 1e3, t2 * 1e3, t1 / t2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--batch', type=int, default=100)
+    args = parser.parse_args()
+
+    for d in (100, 1000):
+        np.random.seed(1)
+        a = np.random.normal(size=(d, d))
+        mean = np.random.normal(size=d)
+        cov = a.dot(a.T) / d + np.eye(d)
+        x = np.random.normal(size=d)
+        xs = np.random.normal(size=(args.batch, d))
+        p = pints.MultivariateGaussianLogPrior(mean, cov)
+
+        print('d = ' + str(d))
+        print('  Operation          Old (ms)    New (ms)  Speed-up')
+        report(
+            'evaluate',
+            bench(lambda: scipy.stats.multivariate_normal.logpdf(
+                x, mean, cov), args.repeats),
+            bench(lambda: p(x), args.repeats))
+        report(
+            'evaluateS1',
+            bench(lambda: (
+                scipy.stats.multivariate_normal.logpdf(x, mean, cov),
+                -np.linalg.solve(cov, x - mean)), args.repeats),
+            bench(lambda: p.evaluateS1(x), args.repeats))
+        report(
+            'evaluate x ' + str(args.batch),
+            bench(lambda: scipy.stats.multivariate_normal.logpdf(
+                xs, mean, cov), args.repeats),
+            bench(lambda: p.evaluate_batch(xs), args.repeats))
+        report(
+            'sample(1)',
+            bench(lambda: np.random.multivariate_normal(mean, cov, size=1),
+                  args.repeats),
+            bench(lambda: p.sample(1), args.repeats))
@@ -60,7 +60,7 @@ from ._core import SingleOutputProblem, MultiOutputProblem
 #
 # Utility classes and methods
 #
-from ._util import strfloat, vector, matrix2d
+from ._util import strfloat, vector, matrix2d, shared_array
 from ._util import Timer
 from ._logger import Logger, Loggable
 
@@ -137,10 +137,17 @@ from ._error_measures import (
 #
 from ._evaluation import (
     evaluate,
+    AutoParallelEvaluator,
+    BatchEvaluator,
+    CachingEvaluator,
     Evaluator,
+    EvaluatorStats,
+    Future,
     ParallelEvaluator,
     SequentialEvaluator,
+    ThreadedEvaluator,
 )
+from ._distributed import DistributedEvaluator, distributed_worker
 
 
 #
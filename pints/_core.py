@@ -11,6 +11,8 @@ from __future__ import print_function, unicode_literals
 import numpy as np
 import pints
 
+from ._util import _memmap_view
+
 
 class ForwardModel(object):
 
@@ -54,6 +56,31 @@ class ForwardModel(object):
         """
         raise NotImplementedError
 
+    def simulate_batch(self, parameters, times):
+        """
+        Runs a forward simulation for every parameter vector in
+        ``parameters``, and returns the results as a single NumPy array.
+
+        Arguments:
+
+        ``parameters``
+            A sequence of ``n`` parameter vectors, for example a NumPy array
+            of shape ``(n, n_parameters)``.
+        ``times``
+            The times at which to evaluate, as in :meth:`simulate()`.
+
+        Returns:
+
+        A NumPy array of shape ``(n, n_times)`` (for single output problems)
+        or ``(n, n_times, n_outputs)`` (for multi-output problems).
+
+        The default implementation calls :meth:`simulate()` once for every
+        parameter vector. Models that can simulate several parameter vectors
+        at once (for example using NumPy broadcasting) can override it to
+        provide a faster implementation.
+        """
+        return np.array([self.simulate(p, times) for p in parameters])
+
     def n_outputs(self):
         """
         Returns the number of outputs this model has. The default is 1.
@@ -118,10 +145,19 @@ class SingleOutputProblem(object):
         A sequence of points in time. Must be non-negative and increasing.
     ``values``
         A sequence of scalar output values, measured at the times in ``times``.
+    ``shared``
+        Set to ``True`` to store ``times`` and ``values`` in a memory-mapped
+        file (see :meth:`shared_array()`), so that copies of this problem sent
+        to other processes (e.g. to the workers of a
+        :class:`ParallelEvaluator`) share its data instead of copying it.
+
+    Memory-mapped arrays of floats, such as those returned by
+    :meth:`pints.io.load_array()`, can be passed in as ``times`` and
+    ``values``, and will be used without copying them.
 
     """
 
-    def __init__(self, model, times, values):
+    def __init__(self, model, times, values, shared=False):
 
         # Check model
         self._model = model
@@ -131,15 +167,17 @@ class SingleOutputProblem(object):
                 ' SingleOutputProblem.')
 
         # Check times, copy so that they can no longer be changed and set them
-        # to read-only
-        self._times = pints.vector(times)
-        if np.any(self._times < 0):
+        # to read-only. Memory-mapped arrays are used without copying, and
+        # checked in chunks.
+        self._times = _read_only(times, pints.vector, 1)
+        negative, decreasing = _check_times(self._times, True)
+        if negative:
             raise ValueError('Times can not be negative.')
-        if np.any(self._times[:-1] >= self._times[1:]):
+        if decreasing:
             raise ValueError('Times must be increasing.')
 
         # Check values, copy so that they can no longer be changed
-        self._values = pints.vector(values)
+        self._values = _read_only(values, pints.vector, 1)
 
         # Check dimensions
         self._n_parameters = int(model.n_parameters())
@@ -150,6 +188,13 @@ class SingleOutputProblem(object):
             raise ValueError(
                 'Times and values arrays must have same length.')
 
+        # Move data to shared memory
+        if shared:
+            if not isinstance(self._times, np.memmap):
+                self._times = pints.shared_array(self._times)
+            if not isinstance(self._values, np.memmap):
+                self._values = pints.shared_array(self._values)
+
     def evaluate(self, parameters):
         """
         Runs a simulation using the given parameters, returning the simulated
@@ -158,6 +203,17 @@ class SingleOutputProblem(object):
         y = np.asarray(self._model.simulate(parameters, self._times))
         return y.reshape((self._n_times,))
 
+    def evaluate_batch(self, parameters):
+        """
+        Runs a simulation for every parameter vector in ``parameters`` (for
+        example a NumPy array of shape ``(n, n_parameters)``), returning the
+        simulated values as a NumPy array of shape ``(n, n_times)``.
+
+        See :meth:`ForwardModel.simulate_batch()`.
+        """
+        y = np.asarray(self._model.simulate_batch(parameters, self._times))
+        return y.reshape((len(parameters), self._n_times))
+
     def evaluateS1(self, parameters):
         """
         Runs a simulation with first-order sensitivity calculation, returning
@@ -230,24 +286,35 @@ class MultiOutputProblem(object):
         A sequence of multi-valued measurements. Must have shape
         ``(n_times, n_outputs)``, where ``n_times`` is the number of points in
         ``times`` and ``n_outputs`` is the number of outputs in the model.
+    ``shared``
+        Set to ``True`` to store ``times`` and ``values`` in a memory-mapped
+        file (see :meth:`shared_array()`), so that copies of this problem sent
+        to other processes (e.g. to the workers of a
+        :class:`ParallelEvaluator`) share its data instead of copying it.
+
+    Memory-mapped arrays of floats, such as those returned by
+    :meth:`pints.io.load_array()`, can be passed in as ``times`` and
+    ``values``, and will be used without copying them.
 
     """
 
-    def __init__(self, model, times, values):
+    def __init__(self, model, times, values, shared=False):
 
         # Check model
         self._model = model
 
         # Check times, copy so that they can no longer be changed and set them
-        # to read-only
-        self._times = pints.vector(times)
-        if np.any(self._times < 0):
+        # to read-only. Memory-mapped arrays are used without copying, and
+        # checked in chunks.
+        self._times = _read_only(times, pints.vector, 1)
+        negative, decreasing = _check_times(self._times, False)
+        if negative:
             raise ValueError('Times cannot be negative.')
-        if np.any(self._times[:-1] > self._times[1:]):
+        if decreasing:
             raise ValueError('Times must be non-decreasing.')
 
         # Check values, copy so that they can no longer be changed
-        self._values = pints.matrix2d(values)
+        self._values = _read_only(values, pints.matrix2d, 2)
 
         # Check dimensions
         self._n_parameters = int(model.n_parameters())
@@ -259,6 +326,13 @@ class MultiOutputProblem(object):
             raise ValueError(
                 'Values array must have shape `(n_times, n_outputs)`.')
 
+        # Move data to shared memory
+        if shared:
+            if not isinstance(self._times, np.memmap):
+                self._times = pints.shared_array(self._times)
+            if not isinstance(self._values, np.memmap):
+                self._values = pints.shared_array(self._values)
+
     def evaluate(self, parameters):
         """
         Runs a simulation using the given parameters, returning the simulated
@@ -269,6 +343,20 @@ class MultiOutputProblem(object):
         y = np.asarray(self._model.simulate(parameters, self._times))
         return y.reshape(self._n_times, self._n_outputs)
 
+    def evaluate_batch(self, parameters):
+        """
+        Runs a simulation for every parameter vector in ``parameters`` (for
+        example a NumPy array of shape ``(n, n_parameters)``), returning the
+        simulated values.
+
+        The returned data is a NumPy array with shape
+        ``(n, n_times, n_outputs)``.
+
+        See :meth:`ForwardModel.simulate_batch()`.
+        """
+        y = np.asarray(self._model.simulate_batch(parameters, self._times))
+        return y.reshape(len(parameters), self._n_times, self._n_outputs)
+
     def evaluateS1(self, parameters):
         """
         Runs a simulation using the given parameters, returning the simulated
@@ -367,3 +455,66 @@ class TunableMethod(object):
               hyper-parameters
         """
         pass
+
+
+def _batch_sum_of_squares(values, ys):
+    """
+    Returns the sums of squared residuals between a problem's ``values`` and a
+    stack of model outputs ``ys`` (see
+    :meth:`SingleOutputProblem.evaluate_batch()` and
+    :meth:`MultiOutputProblem.evaluate_batch()`), as an array of shape
+    ``(n, n_outputs)``.
+    """
+    values = values.reshape((len(values), -1))
+    ys = np.asarray(ys, dtype=float)
+    try:
+        r = ys.reshape((len(ys), ) + values.shape) - values
+    except ValueError:
+        raise ValueError(
+            'Model outputs must have shape (n, n_times, n_outputs).')
+    return np.sum(np.square(r, out=r), axis=1)
+
+
+def _check_times(times, strict, chunk_size=2**20):
+    """
+    Checks a 1d array of ``times`` in chunks of at most ``chunk_size`` points,
+    so that no large temporary arrays are created for long (memory-mapped)
+    time series.
+
+    Returns a tuple ``(negative, decreasing)``, where ``negative`` is ``True``
+    if any of the times are negative, and ``decreasing`` is ``True`` if the
+    times are not increasing (if ``strict=True``) or are decreasing (if
+    ``strict=False``).
+    """
+    negative = decreasing = False
+    for i in range(0, len(times), chunk_size):
+        # Include last point of previous chunk
+        t = times[max(0, i - 1):i + chunk_size]
+        negative = negative or bool(np.any(t < 0))
+        if strict:
+            decreasing = decreasing or bool(np.any(t[:-1] >= t[1:]))
+        else:
+            decreasing = decreasing or bool(np.any(t[:-1] > t[1:]))
+        if negative:
+            break
+    return negative, decreasing
+
+
+def _read_only(x, convert, ndim):
+    """
+    Returns the data in ``x`` as a read-only array with ``ndim`` dimensions.
+
+    Memory-mapped arrays of floats (see :meth:`pints.io.load_array()`) are
+    used without copying, if they can be reshaped without copying. Any other
+    input is copied with ``convert``, e.g. :meth:`pints.vector()`.
+    """
+    y = _memmap_view(x)
+    if y is not None:
+        if y.ndim < ndim:
+            y = y.reshape(y.shape + (1, ) * (ndim - y.ndim))
+        elif y.ndim > ndim and y.size == y.shape[0]:
+            y = y.reshape((len(y), ) + (1, ) * (ndim - 1))
+        if y.ndim == ndim and np.may_share_memory(x, y):
+            return y
+    return convert(x)
+
@@ -0,0 +1,425 @@
+#
+# Evaluator that sends tasks to worker processes over TCP, so that
+# evaluations can be spread out over several machines.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+from __future__ import absolute_import, division
+from __future__ import print_function, unicode_literals
+import os
+import pickle
+import socket
+import threading
+import time
+import timeit
+import traceback
+import multiprocessing
+import multiprocessing.connection
+import pints
+try:
+    # Python 3
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class DistributedEvaluator(pints.Evaluator):
+    """
+    Evaluates a single-valued function object for any set of input values
+    given, using worker processes that connect to it over TCP. The workers
+    can run on the same machine, or on any other machine that can connect to
+    the evaluator's address.
+
+    The evaluator listens for connections at the given ``host`` and ``port``.
+    Workers can be started on local or remote machines with
+    :meth:`distributed_worker()`, for example using::
+
+        python -c "import pints; pints.distributed_worker(('server', 12345),
+        b'secret')"
+
+    For testing, or to use the evaluator on a single machine, workers can be
+    started on the local machine using :meth:`start_local_workers()`.
+
+    When a worker connects, it is sent the function to evaluate (which is
+    pickled only once, and then sent as-is to every worker). Positions are
+    sent in batches of ``chunk_size`` positions per task. While evaluating a
+    task, workers send regular "heartbeat" messages. If a worker's
+    connection is lost, or no heartbeat is received for ``heartbeat_timeout``
+    seconds, the worker is assumed dead and its task is sent to a different
+    worker.
+
+    Note that messages are pickled, and unpickling data received from a
+    malicious connection can be unsafe. Connections are authenticated using
+    the ``authkey`` (see Python's ``multiprocessing.connection`` module), but
+    are not encrypted: only use on trusted networks.
+
+    Arguments:
+
+    ``function``
+        The function to evaluate. Must be picklable.
+    ``host``
+        The host name or IP address to listen on. Use ``''`` or ``'0.0.0.0'``
+        to accept connections on all network interfaces.
+    ``port``
+        The port to listen on. If set to ``0``, any free port will be used
+        (see :meth:`address()`).
+    ``args``
+        An optional sequence of extra arguments to ``f``. If ``args`` is
+        specified, ``f`` will be called as ``f(x, *args)``.
+    ``authkey``
+        A byte string that workers must know to connect. If not set, a random
+        key is generated (see :meth:`authkey()`).
+    ``chunk_size``
+        The number of positions sent to a worker in a single task.
+    ``heartbeat_interval``
+        The time (in seconds) between heartbeats sent by workers.
+    ``heartbeat_timeout``
+        The time (in seconds) after which a worker that hasn't sent any
+        messages during a task is assumed dead.
+    ``connect_timeout``
+        The maximum time (in seconds) to wait for at least one worker to be
+        connected, before raising an exception.
+
+    *Extends:* :class:`Evaluator`
+    """
+    def __init__(
+            self, function, host='127.0.0.1', port=0, args=None,
+            authkey=None, chunk_size=1, heartbeat_interval=1,
+            heartbeat_timeout=10, connect_timeout=60):
+        super(DistributedEvaluator, self).__init__(function, args)
+
+        # Check chunk size
+        self._chunk_size = int(chunk_size)
+        if self._chunk_size < 1:
+            raise ValueError('Chunk size must be an integer greater than 0.')
+
+        # Check timing settings
+        self._heartbeat_interval = float(heartbeat_interval)
+        self._heartbeat_timeout = float(heartbeat_timeout)
+        self._connect_timeout = float(connect_timeout)
+        if self._heartbeat_interval <= 0:
+            raise ValueError('Heartbeat interval must be greater than 0.')
+        if self._heartbeat_timeout <= self._heartbeat_interval:
+            raise ValueError(
+                'Heartbeat timeout must be greater than heartbeat interval.')
+        if self._connect_timeout <= 0:
+            raise ValueError('Connect timeout must be greater than 0.')
+
+        # Maximum time to wait for a result, before checking for workers
+        self._poll_interval = 0.1
+
+        # Pickle function once, to send to all workers
+        self._version = 0
+        self._payload = None
+        self._pickle_function()
+
+        # Tasks and results are shared between all connection threads. Tasks
+        # are stored as tuples (call, i, xs) where call is a number that
+        # identifies the call to evaluate() the task belongs to.
+        self._call = 0
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+
+        # Open connections, and lock to access them
+        self._connections = []
+        self._lock = threading.Lock()
+        self._stopped = False
+
+        # Local worker processes
+        self._local_workers = []
+
+        # Start listening
+        if authkey is None:
+            authkey = os.urandom(32)
+        self._authkey = bytes(authkey)
+        self._listener = multiprocessing.connection.Listener(
+            (host, int(port)), authkey=self._authkey)
+        self._address = self._listener.address
+        t = threading.Thread(target=self._accept)
+        t.daemon = True
+        t.start()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:   # pragma: no cover
+            pass
+
+    def _accept(self):
+        """ Accepts new connections, until the evaluator is closed. """
+        while not self._stopped:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                # Failed authentication, or connection closed during
+                # authentication
+                continue
+            if self._stopped:
+                conn.close()
+                return
+            t = threading.Thread(target=self._serve, args=(conn, ))
+            t.daemon = True
+            t.start()
+
+    def address(self):
+        """
+        Returns the address ``(host, port)`` that workers can connect to.
+        """
+        return self._address
+
+    def authkey(self):
+        """ Returns the key that workers need to connect. """
+        return self._authkey
+
+    def close(self):
+        """
+        Stops accepting new connections, tells all connected workers to stop,
+        and terminates any workers started with
+        :meth:`start_local_workers()`.
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+
+        # Wake up thread waiting for connections (by connecting and then
+        # closing the connection without authenticating), and stop listening
+        try:
+            s = socket.create_connection(self._address, timeout=1)
+            s.close()
+        except Exception:   # pragma: no cover
+            pass
+        self._listener.close()
+
+        # Stop local workers
+        for p in self._local_workers:
+            p.join(self._heartbeat_timeout)
+            if p.is_alive():    # pragma: no cover
+                p.terminate()
+                p.join()
+        self._local_workers = []
+
+    def _evaluate(self, positions):
+        n = len(positions)
+        if n == 0:
+            return []
+        if self._stopped:
+            raise RuntimeError('Evaluator has been closed.')
+        self._wait_for_workers()
+
+        # Enqueue tasks
+        self._call += 1
+        call = self._call
+        k = self._chunk_size
+        for i in range(0, n, k):
+            self._tasks.put((call, i, list(positions[i:i + k])))
+
+        # Collect results
+        m = 0
+        results = [0] * n
+        try:
+            while m < n:
+                try:
+                    c, i, fs, trace = self._results.get(
+                        timeout=self._poll_interval)
+                except queue.Empty:
+                    self._wait_for_workers()
+                    continue
+                if c != call:   # pragma: no cover
+                    # Result from an earlier, interrupted call
+                    continue
+                if trace is not None:
+                    raise Exception(
+                        'Exception in remote worker:\n' + trace
+                        + '\nException in remote worker')
+                results[i:i + len(fs)] = fs
+                m += len(fs)
+        except (Exception, SystemExit, KeyboardInterrupt):
+            # Stop any remaining tasks for this call from being evaluated
+            self._call += 1
+            raise
+
+        return results
+
+    def n_workers(self):
+        """ Returns the number of workers currently connected. """
+        with self._lock:
+            return len(self._connections)
+
+    def _pickle_function(self):
+        """ Pickles the current function and arguments, to send to workers. """
+        self._version += 1
+        self._payload = (self._version, pickle.dumps(
+            (self._function, self._args), pickle.HIGHEST_PROTOCOL))
+
+    def _serve(self, conn):
+        """
+        Sends tasks to, and receives results from, a single connected worker,
+        until the worker's connection is lost or the evaluator is closed.
+        """
+        with self._lock:
+            self._connections.append(conn)
+        version = None
+        task = None
+        try:
+            conn.send(('config', self._heartbeat_interval))
+            while not self._stopped:
+                try:
+                    task = self._tasks.get(timeout=self._poll_interval)
+                except queue.Empty:
+                    task = None
+                    continue
+                call, i, xs = task
+                if call != self._call:
+                    # Task from an earlier, interrupted call
+                    task = None
+                    continue
+
+                # Send function, if not sent before or changed
+                payload = self._payload
+                if payload[0] != version:
+                    version = payload[0]
+                    conn.send(('function', payload[1]))
+
+                # Send task, and wait for reply (ignoring heartbeats)
+                conn.send(('task', i, xs))
+                message = ('heartbeat', )
+                while message[0] == 'heartbeat':
+                    if not conn.poll(self._heartbeat_timeout):
+                        raise IOError('No heartbeat received from worker.')
+                    message = conn.recv()
+                if message[0] == 'result':
+                    self._results.put((call, i, message[2], None))
+                else:
+                    self._results.put((call, i, None, message[2]))
+                task = None
+
+            # Evaluator closed: tell worker to stop
+            conn.send(('stop', ))
+
+        except (IOError, OSError, EOFError):
+            # Connection lost or worker unresponsive: requeue task
+            if task is not None:
+                self._tasks.put(task)
+
+        finally:
+            with self._lock:
+                self._connections.remove(conn)
+            try:
+                conn.close()
+            except Exception:   # pragma: no cover
+                pass
+
+    def set_function(self, function, args=None):
+        """
+        Replaces the function evaluated by this evaluator. The new function is
+        pickled once, and sent to each worker before its next task.
+
+        See :meth:`Evaluator.set_function()`.
+        """
+        super(DistributedEvaluator, self).set_function(function, args)
+        self._pickle_function()
+
+    def start_local_workers(self, n_workers):
+        """
+        Starts ``n_workers`` worker processes on the local machine, that
+        connect to this evaluator, and waits until they are connected. The
+        workers are stopped when :meth:`close()` is called.
+        """
+        n_workers = int(n_workers)
+        if n_workers < 1:
+            raise ValueError('Number of workers must be at least 1.')
+        n_connected = self.n_workers() + n_workers
+        host, port = self._address
+        if host in ('', '0.0.0.0'):
+            host = '127.0.0.1'
+        for k in range(n_workers):
+            p = multiprocessing.Process(
+                target=distributed_worker,
+                args=((host, port), self._authkey))
+            p.daemon = True
+            p.start()
+            self._local_workers.append(p)
+
+        # Wait for workers to connect
+        timer = timeit.default_timer()
+        while self.n_workers() < n_connected:
+            if timeit.default_timer() - timer > self._connect_timeout:
+                raise Exception('Local workers failed to connect.')
+            time.sleep(0.01)
+
+    def _wait_for_workers(self):
+        """
+        Waits until at least one worker is connected, or raises an exception
+        if no worker connects within the connect timeout.
+        """
+        if self.n_workers():
+            return
+        timer = timeit.default_timer()
+        while not self.n_workers():
+            if timeit.default_timer() - timer > self._connect_timeout:
+                raise Exception('No workers connected to evaluator.')
+            time.sleep(self._poll_interval)
+
+
+def distributed_worker(address, authkey):
+    """
+    Connects to a :class:`DistributedEvaluator` at the given ``address`` (a
+    tuple ``(host, port)``), using the given ``authkey``, and evaluates tasks
+    until the evaluator closes the connection.
+
+    Messages are pickled tuples, where the first entry is a string indicating
+    the type of message. The evaluator can send ``('config', interval)`` to
+    set the heartbeat interval, ``('function', payload)`` with a pickled
+    tuple ``(function, args)``, ``('task', i, xs)`` with a list of positions
+    ``xs`` to evaluate, or ``('stop', )``. The worker replies to each task
+    with ``('result', i, fs)`` or ``('error', i, traceback)``, and sends
+    ``('heartbeat', )`` messages while a task is being evaluated.
+    """
+    conn = multiprocessing.connection.Client(
+        tuple(address), authkey=bytes(authkey))
+
+    # Sending is done from two threads, so use a lock
+    lock = threading.Lock()
+    busy = threading.Event()
+    stopped = threading.Event()
+    interval = [1.0]
+
+    def heartbeat():
+        while not stopped.wait(interval[0]):
+            if busy.is_set():
+                with lock:
+                    conn.send(('heartbeat', ))
+
+    t = threading.Thread(target=heartbeat)
+    t.daemon = True
+    t.start()
+
+    function, args = None, ()
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except (IOError, OSError, EOFError):
+                break
+            if message[0] == 'task':
+                i, xs = message[1:]
+                busy.set()
+                try:
+                    reply = ('result', i, [function(x, *args) for x in xs])
+                except (Exception, SystemExit):
+                    reply = ('error', i, traceback.format_exc())
+                busy.clear()
+                with lock:
+                    conn.send(reply)
+            elif message[0] == 'function':
+                function, args = pickle.loads(message[1])
+            elif message[0] == 'config':
+                interval[0] = message[1]
+            else:
+                break
+    finally:
+        stopped.set()
+        conn.close()
@@ -11,6 +11,8 @@ from __future__ import print_function, unicode_literals
 import pints
 import numpy as np
 
+from ._core import _batch_sum_of_squares
+
 
 class ErrorMeasure(object):
     """
@@ -25,6 +27,22 @@ class ErrorMeasure(object):
     def __call__(self, x):
         raise NotImplementedError
 
+    def evaluate_batch(self, xs):
+        """
+        Evaluates this error measure for every point in ``xs``, and returns
+        the results as a NumPy array of shape ``(n, )``.
+
+        The argument ``xs`` should be a sequence of ``n`` points, for example
+        a NumPy array of shape ``(n, n_parameters)``.
+
+        The default implementation evaluates this error measure once for
+        every point. Error measures that can evaluate several points at once
+        (for example using NumPy broadcasting) can override it to provide a
+        faster implementation, which will be used by
+        :class:`pints.BatchEvaluator`.
+        """
+        return np.array([self(x) for x in xs], dtype=float)
+
     def evaluateS1(self, x):
         """
         Evaluates this error measure, and returns the result plus the partial
@@ -87,6 +105,10 @@ class ProbabilityBasedError(ErrorMeasure):
     def __call__(self, x):
         return -self._log_pdf(x)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`ErrorMeasure.evaluate_batch()`. """
+        return -np.asarray(self._log_pdf.evaluate_batch(xs))
+
     def evaluateS1(self, x):
         """
         See :meth:`ErrorMeasure.evaluateS1()`.
@@ -176,6 +198,14 @@ class SumOfErrors(ErrorMeasure):
             total += e(x) * next(i)
         return total
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`ErrorMeasure.evaluate_batch()`. """
+        i = iter(self._weights)
+        total = np.zeros(len(xs))
+        for e in self._errors:
+            total += np.asarray(e.evaluate_batch(xs)) * next(i)
+        return total
+
     def evaluateS1(self, x):
         """
         See :meth:`ErrorMeasure.evaluateS1()`.
@@ -233,6 +263,20 @@ class MeanSquaredError(ProblemErrorMeasure):
                                axis=0) * self._weights) * self._ninv),
                       axis=0)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`ErrorMeasure.evaluate_batch()`. """
+        return self.evaluate_outputs(self._problem.evaluate_batch(xs))
+
+    def evaluate_outputs(self, ys):
+        """
+        Calculates the error for a stack of ``n`` simulation results ``ys``
+        (for example as returned by :meth:`MultiOutputProblem.evaluate_batch()`
+        with shape ``(n, n_times, n_outputs)``), and returns the results as a
+        NumPy array of shape ``(n, )``.
+        """
+        sse = _batch_sum_of_squares(self._values, ys)
+        return np.sum(sse * self._weights * self._ninv, axis=1)
+
     def evaluateS1(self, x):
         """ See :meth:`ErrorMeasure.evaluateS1()`. """
         y, dy = self._problem.evaluateS1(x)
@@ -298,6 +342,20 @@ class SumOfSquaresError(ProblemErrorMeasure):
                               axis=0) * self._weights),
                       axis=0)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`ErrorMeasure.evaluate_batch()`. """
+        return self.evaluate_outputs(self._problem.evaluate_batch(xs))
+
+    def evaluate_outputs(self, ys):
+        """
+        Calculates the error for a stack of ``n`` simulation results ``ys``
+        (for example as returned by :meth:`MultiOutputProblem.evaluate_batch()`
+        with shape ``(n, n_times, n_outputs)``), and returns the results as a
+        NumPy array of shape ``(n, )``.
+        """
+        sse = _batch_sum_of_squares(self._values, ys)
+        return np.sum(sse * self._weights, axis=1)
+
     def evaluateS1(self, x):
         """ See :meth:`ErrorMeasure.evaluateS1()`. """
         y, dy = self._problem.evaluateS1(x)
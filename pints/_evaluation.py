@@ -11,12 +11,22 @@
 #
 from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
+import binascii
+import collections
 import gc
 import os
+import pickle
+import shelve
 import sys
 import time
+import timeit
+import threading
 import traceback
+import warnings
 import multiprocessing
+import numpy as np
+import pints
+from ._util import _array_key
 try:
     # Python 3
     import queue
@@ -24,7 +34,7 @@ except ImportError:
     import Queue as queue
 
 
-def evaluate(f, x, parallel=False, args=None):
+def evaluate(f, x, parallel=False, args=None, threads=False):
     """
     Evaluates the function ``f`` on every value present in ``x`` and returns
     a sequence of evaluations ``f(x[i])``.
@@ -45,19 +55,30 @@ def evaluate(f, x, parallel=False, args=None):
         ``False``.
     ``args``
         Optional extra arguments to pass into ``f``.
+    ``threads=False``
+        Set to ``True`` to use threads instead of processes for parallel
+        evaluation (see :class:`ThreadedEvaluator`).
 
     Returns a list of evaluations ``y = f(x, *args)``.
     """
     if parallel is True:
-        evaluator = ParallelEvaluator(f, args=args)
+        if threads:
+            evaluator = ThreadedEvaluator(f, args=args)
+        else:
+            evaluator = ParallelEvaluator(f, args=args)
     elif parallel >= 1:
-        evaluator = ParallelEvaluator(f, n_workers=int(parallel), args=args)
+        if threads:
+            evaluator = ThreadedEvaluator(
+                f, n_workers=int(parallel), args=args)
+        else:
+            evaluator = ParallelEvaluator(
+                f, n_workers=int(parallel), args=args)
     else:
         evaluator = SequentialEvaluator(f, args=args)
     return evaluator.evaluate(x)
 
 
-class Evaluator(object):
+class Evaluator(pints.Loggable):
     """
     *Abstract class*
 
@@ -67,6 +88,19 @@ class Evaluator(object):
     switching between parallel or sequential implementations of the same
     algorithm.
 
+    Besides the synchronous :meth:`evaluate()`, evaluators provide an
+    asynchronous interface: single positions can be submitted for evaluation
+    using :meth:`submit()`, which returns a :class:`Future`, and
+    :meth:`as_completed()` can be used to iterate over a set of futures in
+    the order in which their evaluations finish. This allows methods to act
+    on results as soon as they arrive, instead of waiting for the slowest
+    evaluation in a set.
+
+    All evaluators implement the :class:`pints.Loggable` interface, allowing
+    them to add information (for example an :class:`EvaluatorStats` summary)
+    to the logs of the :class:`OptimisationController` and
+    :class:`MCMCController`.
+
     Arguments:
 
     ``function``
@@ -78,6 +112,81 @@ class Evaluator(object):
 
     """
     def __init__(self, function, args=None):
+        self._set_function(function, args)
+
+    def as_completed(self, futures):
+        """
+        Takes a sequence of :class:`Future` objects created by this evaluator,
+        and returns an iterator that yields them as their evaluations finish
+        (either by returning a result or by raising an exception).
+        """
+        remaining = list(futures)
+        while remaining:
+            done = [future for future in remaining if future.done()]
+            if done:
+                for future in done:
+                    remaining.remove(future)
+                    yield future
+            else:
+                self._collect()
+
+    def _collect(self):
+        """
+        Waits until at least one pending asynchronous evaluation has finished,
+        and stores its result (or exception) in the corresponding
+        :class:`Future`.
+        """
+        raise NotImplementedError
+
+    def evaluate(self, positions):
+        """
+        Evaluate the function for every value in the sequence ``positions``.
+
+        Returns a list with the returned evaluations.
+        """
+        try:
+            len(positions)
+        except TypeError:
+            raise ValueError(
+                'The argument `positions` must be a sequence of input values'
+                ' to the evaluator\'s function.')
+        return self._evaluate(positions)
+
+    def _evaluate(self, positions):
+        """ See :meth:`evaluate()`. """
+        raise NotImplementedError
+
+    def set_function(self, function, args=None):
+        """
+        Replaces the function evaluated by this evaluator, and the optional
+        sequence of extra arguments ``args``.
+
+        This allows a single evaluator (and any worker processes or threads it
+        has started) to be re-used for several functions, for example by
+        passing it to :meth:`OptimisationController.set_parallel()` and
+        :meth:`MCMCController.set_parallel()`.
+        """
+        self._set_function(function, args)
+
+    def submit(self, x):
+        """
+        Submits a single position ``x`` for evaluation, and returns a
+        :class:`Future` that can be used to obtain the result.
+
+        The default implementation evaluates the function immediately, so that
+        the returned future is always done. Evaluators that use worker
+        processes or threads return immediately instead, so that several
+        evaluations can be submitted and run at the same time.
+        """
+        future = Future(self, x)
+        try:
+            future._set_result(self._evaluate([x])[0])
+        except Exception as e:
+            future._set_exception(e)
+        return future
+
+    def _set_function(self, function, args):
+        """ Checks and stores a function and its extra arguments. """
 
         # Check function
         if not callable(function):
@@ -95,23 +204,727 @@ class Evaluator(object):
                     'The argument `args` must be either None or a sequence.')
             self._args = args
 
-    def evaluate(self, positions):
+
+class AutoParallelEvaluator(Evaluator):
+    """
+    Evaluates a function (or callable object) for a list of input values,
+    automatically choosing between sequential evaluation and parallel
+    evaluation with a suitable number of worker processes.
+
+    Parallel evaluation only pays off if the time saved by evaluating
+    positions at the same time outweighs the overhead of sending positions
+    and results to and from worker processes. This evaluator measures both:
+
+    1. The first calls to :meth:`evaluate()` (with at least two positions)
+       are made in parallel, using ``max_workers`` workers (or fewer, if the
+       first call has fewer positions), and the time per evaluation and the
+       overhead per position are measured. Because starting the workers
+       takes time, the overhead is measured on the second call.
+    2. The expected time of a sequential call (``n * cost``) is then compared
+       to that of a parallel call with ``w`` workers
+       (``ceil(n / w) * cost + n * overhead``), and the fastest option is
+       used for subsequent calls. The number of workers is the smallest
+       number that gives the same ``ceil(n / w)`` as ``max_workers``.
+    3. The time per evaluation is measured for every call. If it drifts by
+       more than a factor ``drift`` from the value used to make the last
+       choice (for example when an optimiser converges to a region where
+       evaluations are cheaper), a new choice is made.
+
+    Arguments:
+
+    ``function``
+        The function to evaluate.
+    ``max_workers``
+        The maximum number of worker processes to use. If left at the default
+        value ``max_workers=None`` the number of CPU cores in the machine is
+        used.
+    ``args``
+        An optional sequence of extra arguments to ``f``. If ``args`` is
+        specified, ``f`` will be called as ``f(x, *args)``.
+    ``drift``
+        The factor by which the time per evaluation needs to change before a
+        new choice is made. Must be greater than 1.
+    ``max_tasks_per_worker``
+        Passed on to the :class:`ParallelEvaluator`.
+
+    This evaluator is used by the :class:`OptimisationController` and the
+    :class:`MCMCController` when ``set_parallel('auto')`` is called.
+
+    *Extends:* :class:`Evaluator`
+    """
+    def __init__(self, function, max_workers=None, args=None, drift=2,
+                 max_tasks_per_worker=500):
+        super(AutoParallelEvaluator, self).__init__(function, args)
+
+        # Maximum number of workers
+        if max_workers is None:
+            self._max_workers = ParallelEvaluator.cpu_count()
+        else:
+            self._max_workers = int(max_workers)
+            if self._max_workers < 1:
+                raise ValueError(
+                    'Maximum number of workers must be an integer greater'
+                    ' than 0 or `None` to use the default value.')
+
+        self._drift = float(drift)
+        if not self._drift > 1:
+            raise ValueError('Drift factor must be greater than 1.')
+        self._max_tasks = max_tasks_per_worker
+
+        # Sequential evaluator, and parallel evaluator (created when needed)
+        self._sequential = SequentialEvaluator(
+            self._function, self._args, stats=True)
+        self._parallel = None
+
+        # Current choice of workers (1 for sequential evaluation), or None if
+        # no choice has been made yet
+        self._n_workers = None
+
+        # Time per evaluation in the last call, time per evaluation used to
+        # make the current choice, and overhead per position
+        self._cost = None
+        self._reference_cost = None
+        self._overhead = None
+
+    def _choose(self, n):
         """
-        Evaluate the function for every value in the sequence ``positions``.
+        Chooses the number of workers to use to evaluate ``n`` positions.
+        """
+        self._reference_cost = self._cost
+        self._n_workers = 1
+        w = min(self._max_workers, n)
+        if w > 1:
+            tasks = int(np.ceil(n / w))
+            t_parallel = tasks * self._cost + n * self._overhead
+            if t_parallel < n * self._cost:
+                self._n_workers = int(np.ceil(n / tasks))
+
+        # Stop workers that are no longer needed
+        if self._parallel is not None and (
+                self._parallel.n_workers() != self._n_workers):
+            self._parallel._stop()
+            self._parallel = None
+
+    def current_n_workers(self):
+        """
+        Returns the number of workers currently used (where ``1`` indicates
+        sequential evaluation), or ``None`` if no choice has been made yet.
+        """
+        return self._n_workers
 
-        Returns a list with the returned evaluations.
+    def _evaluate(self, positions):
+        n = len(positions)
+        if n == 0:
+            return []
+
+        # Probe with the maximum number of workers until the overhead is
+        # known, re-using any running workers so that calls with different
+        # numbers of positions can still be made to warm workers
+        w = self._n_workers
+        if self._overhead is None:
+            w = min(self._max_workers, n)
+            if w > 1 and self._parallel is not None:
+                w = self._parallel.n_workers()
+        if w is None or w < 2:
+            self._sequential._stats.reset()
+            results = self._sequential.evaluate(positions)
+            cost = self._sequential._stats.mean_evaluation_time()
+        else:
+            if self._parallel is None:
+                self._parallel = ParallelEvaluator(
+                    self._function, n_workers=w, args=self._args,
+                    max_tasks_per_worker=self._max_tasks, stats=True)
+            # The first call includes the time taken by the workers to start
+            # up, so only calls to running workers are used to measure the
+            # overhead
+            warm = len(self._parallel._workers) == self._parallel.n_workers()
+            stats = self._parallel._stats
+            stats.reset()
+            results = self._parallel.evaluate(positions)
+            cost = stats.mean_evaluation_time()
+            if warm:
+                tasks = int(np.ceil(n / w))
+                self._overhead = max(
+                    0, (stats.wall_time() - tasks * cost) / n)
+
+        # Make a new choice if required
+        self._cost = cost
+        if self._overhead is not None:
+            if self._n_workers is None:
+                self._choose(n)
+            else:
+                ratio = self._cost / max(self._reference_cost, 1e-12)
+                if ratio > self._drift or ratio * self._drift < 1:
+                    self._choose(n)
+
+        return results
+
+    def _log_init(self, logger):
+        """ See :meth:`Loggable._log_init()`. """
+        logger.add_int('Workers')
+
+    def _log_write(self, logger):
+        """ See :meth:`Loggable._log_write()`. """
+        logger.log(self._n_workers or 0)
+
+    def n_workers(self):
         """
-        try:
-            len(positions)
-        except TypeError:
+        Returns the maximum number of worker processes used by this evaluator.
+        """
+        return self._max_workers
+
+    def set_function(self, function, args=None):
+        """
+        Replaces the function evaluated by this evaluator, and the optional
+        sequence of extra arguments ``args``.
+
+        Any running workers are kept alive, but the time per evaluation and
+        the overhead are measured again, after which a new choice is made.
+        """
+        super(AutoParallelEvaluator, self).set_function(function, args)
+        self._sequential.set_function(function, args)
+        if self._parallel is not None:
+            self._parallel.set_function(function, args)
+        self._n_workers = None
+        self._cost = self._reference_cost = self._overhead = None
+
+
+class BatchEvaluator(Evaluator):
+    """
+    Evaluates a :class:`LogPDF` or :class:`ErrorMeasure` for a list of input
+    values, using a single call to its ``evaluate_batch()`` method.
+
+    Functions that implement ``evaluate_batch()`` in a vectorised manner (for
+    example using NumPy broadcasting) can evaluate all positions proposed by
+    an optimiser or sampler in a single call, which avoids the overhead of
+    calling the function from Python once per position.
+
+    Shares an interface with the :class:`SequentialEvaluator`.
+
+    Arguments:
+
+    ``function``
+        The function to evaluate. This must be an object with a method
+        ``evaluate_batch(xs)`` that takes a NumPy array of positions, with
+        shape ``(n, n_parameters)`` and returns a sequence of ``n`` scalars,
+        for example a :class:`LogPDF` or an :class:`ErrorMeasure`.
+    ``args``
+        An optional tuple containing extra arguments to ``evaluate_batch``.
+        If ``args`` is specified, ``evaluate_batch`` will be called as
+        ``function.evaluate_batch(xs, *args)``.
+
+    Returns a list containing the calculated function evaluations.
+
+    *Extends:* :class:`Evaluator`
+    """
+    def __init__(self, function, args=None):
+        super(BatchEvaluator, self).__init__(function, args)
+
+    def _evaluate(self, positions):
+        if len(positions) == 0:
+            return []
+        return list(self._function.evaluate_batch(
+            np.asarray(positions), *self._args))
+
+    def _set_function(self, function, args):
+        """ See :meth:`Evaluator._set_function()`. """
+        # Check function has a batch method
+        if not callable(getattr(function, 'evaluate_batch', None)):
             raise ValueError(
-                'The argument `positions` must be a sequence of input values'
-                ' to the evaluator\'s function.')
-        return self._evaluate(positions)
+                'Given function must have a callable method evaluate_batch().')
+        super(BatchEvaluator, self)._set_function(function, args)
+
+
+class CachingEvaluator(Evaluator):
+    """
+    Wraps around another :class:`Evaluator`, and stores the results of all
+    evaluations so that positions that are evaluated more than once only need
+    to be passed to the wrapped evaluator the first time.
+
+    Positions are identified by their exact binary representation (as NumPy
+    arrays of floats), so that two positions are only considered equal if all
+    their entries are exactly equal.
+
+    The number of results kept in memory is bounded: once ``max_size``
+    results are stored, the least recently used result is discarded whenever
+    a new result is added. Optionally, discarded results can be "spilled" to
+    a file on disk (using Python's ``shelve`` module), so that they can still
+    be retrieved later, at the cost of reading from disk.
+
+    Example::
+
+        e = pints.CachingEvaluator(pints.ParallelEvaluator(f))
+        fx = e.evaluate(x)
+        fx = e.evaluate(x)   # Returns stored results
+        print(e.hits(), e.misses())
+
+    A caching evaluator can be passed to
+    :meth:`OptimisationController.set_parallel()` and
+    :meth:`MCMCController.set_parallel()` in the same way as the evaluator it
+    wraps.
+
+    Note that caching assumes the function is deterministic, and that it does
+    not change between evaluations. If the function is replaced using
+    :meth:`set_function()`, the stored results are discarded (unless the new
+    function and arguments are the same as the old ones).
+
+    Arguments:
+
+    ``evaluator``
+        The :class:`Evaluator` to pass any positions that have not been
+        evaluated before to.
+    ``max_size``
+        The maximum number of results to store in memory.
+    ``filename``
+        An optional path to a file in which results are stored when they are
+        removed from memory. Any existing results in this file are discarded.
+
+    *Extends:* :class:`Evaluator`
+    """
+    def __init__(self, evaluator, max_size=10000, filename=None):
+
+        # Check evaluator
+        if not isinstance(evaluator, Evaluator):
+            raise ValueError('Given evaluator must extend pints.Evaluator.')
+        super(CachingEvaluator, self).__init__(
+            evaluator._function, evaluator._args)
+        self._evaluator = evaluator
+
+        # Check maximum size
+        self._max_size = int(max_size)
+        if self._max_size < 1:
+            raise ValueError('Maximum cache size must be at least 1.')
+
+        # Results in memory, ordered from least to most recently used
+        self._cache = collections.OrderedDict()
+
+        # Results on disk
+        self._shelf = None
+        if filename is not None:
+            self._shelf = shelve.open(
+                filename, flag='n', protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Futures for submitted positions that haven't been stored yet
+        self._submitted = []
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:   # pragma: no cover
+            pass
+
+    def clear(self):
+        """
+        Discards all stored results, and resets the hit and miss counts.
+        """
+        self._cache.clear()
+        if self._shelf is not None:
+            self._shelf.clear()
+        self._submitted = []
+        self._hits = 0
+        self._misses = 0
+
+    def close(self):
+        """
+        Closes the file used to store results on disk, if any. After closing,
+        results removed from memory are no longer stored.
+        """
+        if self._shelf is not None:
+            self._shelf.close()
+            self._shelf = None
+
+    def _collect(self):
+        """ See :meth:`Evaluator._collect()`. """
+        self._evaluator._collect()
+        self._harvest()
 
     def _evaluate(self, positions):
-        """ See :meth:`evaluate()`. """
-        raise NotImplementedError
+        self._harvest()
+
+        # Look up stored results, and find unique positions to evaluate
+        results = [None] * len(positions)
+        missing = collections.OrderedDict()
+        for i, x in enumerate(positions):
+            key = _array_key(x)
+            found, value = self._lookup(key)
+            if found:
+                self._hits += 1
+                results[i] = value
+            elif key in missing:
+                self._hits += 1
+                missing[key].append(i)
+            else:
+                self._misses += 1
+                missing[key] = [i]
+
+        # Evaluate and store
+        if missing:
+            values = self._evaluator.evaluate(
+                [positions[js[0]] for js in missing.values()])
+            for (key, js), value in zip(missing.items(), values):
+                self._store(key, value)
+                for i in js:
+                    results[i] = value
+
+        return results
+
+    def evaluator(self):
+        """ Returns the wrapped :class:`Evaluator`. """
+        return self._evaluator
+
+    def _harvest(self):
+        """ Stores the results of any finished submitted evaluations. """
+        if self._submitted:
+            pending = []
+            for key, future in self._submitted:
+                if not future.done():
+                    pending.append((key, future))
+                elif future._exception is None:
+                    self._store(key, future._result)
+            self._submitted = pending
+
+    def hits(self):
+        """
+        Returns the number of evaluations that were answered using a stored
+        result.
+        """
+        return self._hits
+
+    def _log_init(self, logger):
+        """ See :meth:`Loggable._log_init()`. """
+        self._evaluator._log_init(logger)
+
+    def _log_write(self, logger):
+        """ See :meth:`Loggable._log_write()`. """
+        self._evaluator._log_write(logger)
+
+    def _lookup(self, key):
+        """
+        Looks up a stored result, and returns a tuple ``(found, value)``.
+        """
+        try:
+            value = self._cache.pop(key)
+        except KeyError:
+            if self._shelf is not None:
+                try:
+                    value = self._shelf[self._shelf_key(key)]
+                except KeyError:
+                    return False, None
+                self._store(key, value)
+                return True, value
+            return False, None
+
+        # Re-insert as most recently used
+        self._cache[key] = value
+        return True, value
+
+    def max_size(self):
+        """ Returns the maximum number of results stored in memory. """
+        return self._max_size
+
+    def misses(self):
+        """
+        Returns the number of evaluations that were passed to the wrapped
+        evaluator.
+        """
+        return self._misses
+
+    def n_workers(self):
+        """
+        Returns the number of workers used by the wrapped evaluator, or ``1``
+        if it does not use workers.
+        """
+        try:
+            return self._evaluator.n_workers()
+        except AttributeError:
+            return 1
+
+    def set_function(self, function, args=None):
+        """
+        Replaces the function evaluated by the wrapped evaluator, and discards
+        all stored results (unless the new function and arguments are the
+        same as the current ones).
+
+        See :meth:`Evaluator.set_function()`.
+        """
+        old_function, old_args = self._function, self._args
+        self._evaluator.set_function(function, args)
+        super(CachingEvaluator, self).set_function(function, args)
+
+        # Check if results can be kept
+        same = (function == old_function
+                and len(self._args) == len(old_args)
+                and all([a is b for a, b in zip(self._args, old_args)]))
+        if not same:
+            self.clear()
+
+    def _shelf_key(self, key):
+        """ Converts a key to a string that can be used with ``shelve``. """
+        return str(binascii.hexlify(key).decode('ascii'))
+
+    def size(self):
+        """ Returns the number of results currently stored in memory. """
+        return len(self._cache)
+
+    def _store(self, key, value):
+        """
+        Stores a result, removing the least recently used result if the
+        maximum size is exceeded.
+        """
+        self._cache[key] = value
+        while len(self._cache) > self._max_size:
+            key, value = self._cache.popitem(last=False)
+            if self._shelf is not None:
+                self._shelf[self._shelf_key(key)] = value
+
+    def submit(self, x):
+        """
+        Returns a finished :class:`Future` if ``x`` has been evaluated
+        before, or passes ``x`` to the wrapped evaluator's :meth:`submit()`
+        method otherwise.
+
+        See :meth:`Evaluator.submit()`.
+        """
+        self._harvest()
+        key = _array_key(x)
+        found, value = self._lookup(key)
+        if found:
+            self._hits += 1
+            future = Future(self, x)
+            future._set_result(value)
+            return future
+
+        self._misses += 1
+        future = self._evaluator.submit(x)
+        self._submitted.append((key, future))
+        return future
+
+
+class EvaluatorStats(pints.Loggable):
+    """
+    Collects timing statistics for the evaluations performed by a
+    :class:`ParallelEvaluator` or :class:`SequentialEvaluator`.
+
+    Statistics are aggregated over all calls to :meth:`Evaluator.evaluate()`
+    made since the object was created or :meth:`reset()` was last called.
+    When logging to a :class:`pints.Logger`, a summary is shown with the mean
+    evaluation time, the worker utilisation, the total queue waiting and
+    serialisation times, the duration of the slowest task, and the number of
+    worker respawns.
+
+    Arguments:
+
+    ``n_workers``
+        The number of workers (processes) used to perform evaluations. This
+        is used to calculate the :meth:`utilisation()`.
+
+    *Extends:* :class:`Loggable`
+    """
+    def __init__(self, n_workers=1):
+        self._n_workers = int(n_workers)
+        self.reset()
+
+    def _add_call(self, wall_time):
+        """ Records a call to ``evaluate()`` that took ``wall_time``. """
+        self._n_calls += 1
+        self._wall_time += wall_time
+
+    def _add_respawn(self):
+        """ Records a worker respawn. """
+        self._n_respawns += 1
+
+    def _add_task(self, times, wait=0, serialisation=0):
+        """
+        Records a task in which positions were evaluated in the given
+        ``times``, after waiting in the queue for ``wait`` seconds and
+        spending ``serialisation`` seconds on (un)pickling.
+        """
+        self._evaluation_times.extend(times)
+        self._task_times.append(sum(times))
+        self._queue_wait_time += wait
+        self._serialisation_time += serialisation
+
+    def _add_serialisation(self, seconds):
+        """ Records time spent on (un)pickling in the evaluator. """
+        self._serialisation_time += seconds
+
+    def evaluation_times(self):
+        """
+        Returns an array containing the wall time taken by every evaluation.
+        """
+        return np.array(self._evaluation_times)
+
+    def _log_init(self, logger):
+        """ See :meth:`Loggable._log_init()`. """
+        logger.add_float('Mean eval.')
+        logger.add_float('Util.')
+        logger.add_float('Wait', file_only=True)
+        logger.add_float('Serialisation', file_only=True)
+        logger.add_float('Slowest task', file_only=True)
+        logger.add_counter('Respawns')
+
+    def _log_write(self, logger):
+        """ See :meth:`Loggable._log_write()`. """
+        logger.log(
+            self.mean_evaluation_time(),
+            self.utilisation(),
+            self._queue_wait_time,
+            self._serialisation_time,
+            max(self._task_times) if self._task_times else 0,
+            self._n_respawns,
+        )
+
+    def mean_evaluation_time(self):
+        """
+        Returns the mean wall time per evaluation, or ``0`` if no evaluations
+        were recorded.
+        """
+        if not self._evaluation_times:
+            return 0
+        return float(np.mean(self._evaluation_times))
+
+    def n_calls(self):
+        """ Returns the number of recorded calls to ``evaluate()``. """
+        return self._n_calls
+
+    def n_evaluations(self):
+        """ Returns the number of recorded evaluations. """
+        return len(self._evaluation_times)
+
+    def n_respawns(self):
+        """
+        Returns the number of workers that were replaced after reaching their
+        maximum number of tasks.
+        """
+        return self._n_respawns
+
+    def queue_wait_time(self):
+        """
+        Returns the total time tasks spent waiting between being submitted by
+        the evaluator and being started by a worker.
+        """
+        return self._queue_wait_time
+
+    def reset(self):
+        """ Clears all collected statistics. """
+        self._n_calls = 0
+        self._n_respawns = 0
+        self._wall_time = 0
+        self._evaluation_times = []
+        self._task_times = []
+        self._queue_wait_time = 0
+        self._serialisation_time = 0
+
+    def serialisation_time(self):
+        """
+        Returns the total time spent pickling and unpickling positions and
+        results, in the evaluator and workers combined.
+        """
+        return self._serialisation_time
+
+    def slowest_tasks(self, percentiles=(50, 90, 99, 100)):
+        """
+        Returns the given ``percentiles`` of the distribution of task
+        durations, where a task is a set of positions evaluated by a worker
+        in one go (see the ``chunk_size`` argument to
+        :class:`ParallelEvaluator`).
+        """
+        if not self._task_times:
+            return np.zeros(len(percentiles))
+        return np.percentile(self._task_times, percentiles)
+
+    def task_times(self):
+        """
+        Returns an array containing the duration of every task.
+        """
+        return np.array(self._task_times)
+
+    def utilisation(self):
+        """
+        Returns the fraction of the available worker time (wall time of all
+        calls to ``evaluate()`` times the number of workers) that was spent
+        performing evaluations.
+        """
+        if self._wall_time <= 0:
+            return 0
+        return sum(self._evaluation_times) / (
+            self._wall_time * self._n_workers)
+
+    def wall_time(self):
+        """
+        Returns the total wall time spent in calls to ``evaluate()``.
+        """
+        return self._wall_time
+
+
+class Future(object):
+    """
+    Represents the result of an asynchronous evaluation, started with
+    :meth:`Evaluator.submit()`.
+
+    Futures should not be created directly, but only by an :class:`Evaluator`.
+
+    Arguments:
+
+    ``evaluator``
+        The :class:`Evaluator` that created this future.
+    ``x``
+        The position being evaluated.
+
+    """
+    def __init__(self, evaluator, x):
+        self._evaluator = evaluator
+        self._x = x
+        self._done = False
+        self._result = None
+        self._exception = None
+
+    def done(self):
+        """
+        Returns ``True`` if this future's evaluation has finished (either by
+        returning a result or by raising an exception).
+        """
+        return self._done
+
+    def exception(self):
+        """
+        Waits for this future's evaluation to finish, and returns the
+        exception raised during evaluation, or ``None`` if no exception was
+        raised.
+        """
+        while not self._done:
+            self._evaluator._collect()
+        return self._exception
+
+    def position(self):
+        """ Returns the position being evaluated. """
+        return self._x
+
+    def result(self):
+        """
+        Waits for this future's evaluation to finish and returns the result.
+
+        If the evaluation raised an exception, this exception is raised.
+        """
+        while not self._done:
+            self._evaluator._collect()
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def _set_exception(self, exception):
+        """ Marks this future as done, and stores an exception. """
+        self._exception = exception
+        self._done = True
+
+    def _set_result(self, result):
+        """ Marks this future as done, and stores its result. """
+        self._result = result
+        self._done = True
 
 
 class ParallelEvaluator(Evaluator):
@@ -122,7 +935,9 @@ class ParallelEvaluator(Evaluator):
     Shares an interface with the :class:`SequentialEvaluator`, allowing
     parallelism to be switched on and off with minimal hassle. Parallelism
     takes a little time to be set up, so as a general rule of thumb it's only
-    useful for if the total run-time is at least ten seconds (anno 2015).
+    useful for if the total run-time is at least ten seconds (anno 2015). The
+    :class:`AutoParallelEvaluator` can be used to make this choice (and to
+    choose the number of workers) automatically.
 
     By default, the number of processes ("workers") used to evaluate the
     function is set equal to the number of CPU cores reported by python's
@@ -159,9 +974,90 @@ multiprocessing.html#all-platforms>`_ for details).
     ``args``
         An optional sequence of extra arguments to ``f``. If ``args`` is
         specified, ``f`` will be called as ``f(x, *args)``.
+    ``shared_memory``
+        Set to ``True`` to pass positions and results to and from the workers
+        via shared memory, instead of pickling them onto a queue. In this mode
+        only task indices are sent over the queues, which greatly reduces the
+        communication overhead for large numbers of cheap evaluations. Shared
+        memory transport requires all positions to be arrays (or sequences) of
+        floats with the same shape, and the function to return a single float.
+    ``chunk_size``
+        The number of positions sent to a worker in a single task. Sending
+        positions in contiguous blocks ("chunks") reduces the communication
+        overhead, which can be significant for cheap functions. Can be set to
+        an integer greater than ``0`` to use a fixed chunk size, to
+        ``'guided'`` to use chunks that decrease in size as fewer positions
+        remain (similar to OpenMP's "guided" schedule), or to ``'auto'`` to
+        choose a chunk size based on the time taken by previous evaluations.
+        The default ``chunk_size=1`` sends every position as a separate task.
+    ``timeout``
+        An optional maximum time (in seconds) for a single evaluation in
+        :meth:`evaluate()`. If an evaluation takes longer, the worker running
+        it is killed and replaced by a new worker, and ``timeout_value`` is
+        returned for the position instead. Any other positions in the same
+        chunk are sent to the workers again. Timeouts are not applied to
+        evaluations started with :meth:`submit()`.
+    ``timeout_value``
+        The value to return for evaluations that time out. If not set, this
+        is ``-inf`` if the function is a :class:`LogPDF`, ``(-inf, zeros)`` if
+        the function is a :class:`LogPDF`'s ``evaluateS1`` method, and
+        ``inf`` (or ``(inf, zeros)``) otherwise, so that a timed out position
+        is always rejected by optimisers and samplers.
+    ``speculative``
+        Set to ``True`` to enable speculative re-execution of "straggling"
+        tasks: once all positions in a call to :meth:`evaluate()` have either
+        finished or are being evaluated, and some workers are idle, the
+        remainder of the longest running task is sent to an idle worker. The
+        first result to arrive is used, after which any workers still
+        evaluating positions for the call are replaced.
+    ``stats``
+        Set to ``True`` to collect timing statistics for each call to
+        :meth:`evaluate()` (see :meth:`stats()`). In this mode, the evaluator
+        and workers pickle the positions and results themselves, so that the
+        time spent on serialisation can be measured.
+    ``max_threads_per_worker``
+        An optional maximum number of threads used by native thread pools
+        (for example those of BLAS libraries used by NumPy and SciPy) inside
+        each worker. Without a limit, each of the workers may start as many
+        threads as there are CPU cores, leading to heavy oversubscription.
+        Because NumPy (and the BLAS library it uses) is loaded before the
+        workers start evaluating, this requires the optional
+        ``threadpoolctl`` package (which can be installed with
+        ``pip install pints[threads]``), and a warning is shown if it is not
+        installed. Environment variables such as ``OMP_NUM_THREADS`` are also
+        set, which limits libraries loaded later on, and any processes started
+        by the function.
+    ``pin_workers``
+        Set to ``True`` to pin each worker process to a single CPU core,
+        using ``os.sched_setaffinity`` (where available). Workers are
+        assigned cores in the order listed by ``os.sched_getaffinity``.
+        Pinning is silently ignored on systems that don't support it.
+    ``error_policy``
+        The policy for exceptions raised by the function. With the default
+        ``error_policy='raise'``, an exception in any worker stops all
+        workers, and is raised by :meth:`evaluate()`. With
+        ``error_policy='sentinel'``, exceptions (other than
+        ``KeyboardInterrupt`` and ``SystemExit``) and non-finite results are
+        replaced by ``error_value``, and recorded in the :meth:`error_log()`,
+        while the workers are kept alive.
+    ``error_value``
+        The value to return for failed evaluations if
+        ``error_policy='sentinel'``. If not set, the same default as for
+        ``timeout_value`` is used.
+
+    The numbers of timed out evaluations and re-executed stragglers can be
+    obtained with :meth:`n_timeouts()` and :meth:`n_stragglers()`. These, and
+    a summary of any collected statistics, are shown in the logs of the
+    :class:`OptimisationController` and :class:`MCMCController`.
 
     The evaluator will keep it's subprocesses alive and running until it is
-    tidied up by garbage collection.
+    tidied up by garbage collection. The function to evaluate can be replaced
+    using :meth:`set_function()`, which sends the new function to the running
+    workers instead of starting new ones. This allows a single evaluator to be
+    used as a long-lived pool of workers, that can be shared between several
+    optimisations and/or MCMC runs (see
+    :meth:`OptimisationController.set_parallel()` and
+    :meth:`MCMCController.set_parallel()`).
 
     Note that while this class uses multiprocessing, it is not thread/process
     safe itself: It should not be used by more than a single thread/process at
@@ -173,7 +1069,17 @@ multiprocessing.html#all-platforms>`_ for details).
             self, function,
             n_workers=None,
             max_tasks_per_worker=500,
-            args=None):
+            args=None,
+            shared_memory=False,
+            chunk_size=1,
+            timeout=None,
+            timeout_value=None,
+            speculative=False,
+            stats=False,
+            max_threads_per_worker=None,
+            pin_workers=False,
+            error_policy='raise',
+            error_value=None):
         super(ParallelEvaluator, self).__init__(function, args)
 
         # Determine number of workers
@@ -208,6 +1114,103 @@ multiprocessing.html#all-platforms>`_ for details).
         # Flag set if an error is encountered
         self._error = multiprocessing.Event()
 
+        # Maximum time to wait for a result before checking if any workers
+        # died without notifying the evaluator
+        self._poll_interval = 0.1
+
+        # Maximum time to wait for an error message to arrive, once the error
+        # flag has been set
+        self._error_timeout = 5
+
+        # Shared memory transport: position and result buffers are created
+        # on first use, and grown if a larger set of positions is evaluated
+        self._shared_memory = bool(shared_memory)
+        self._shared_positions = None
+        self._shared_results = None
+        self._shared_shape = None
+
+        # Chunk size policy
+        if chunk_size in ('auto', 'guided'):
+            self._chunk_size = chunk_size
+        else:
+            try:
+                self._chunk_size = int(chunk_size)
+            except (TypeError, ValueError):
+                self._chunk_size = 0
+            if self._chunk_size < 1:
+                raise ValueError(
+                    'Chunk size must be an integer greater than 0, \'auto\','
+                    ' or \'guided\'.')
+
+        # Estimated time per evaluation (used for automatic chunk sizes), and
+        # target time per chunk
+        self._time_per_evaluation = None
+        self._time_per_chunk = 0.01
+
+        # Timeouts and speculative execution
+        self._timeout = None
+        if timeout is not None:
+            self._timeout = float(timeout)
+            if not self._timeout > 0:
+                raise ValueError(
+                    'Timeout must be greater than 0, or `None` to disable'
+                    ' timeouts.')
+            self._poll_interval = min(self._poll_interval, self._timeout / 4)
+        self._timeout_value = timeout_value
+        self._speculative = bool(speculative)
+        self._n_timeouts = 0
+        self._n_stragglers = 0
+
+        # Status of each worker, used to detect slow evaluations. Each worker
+        # is assigned a row in this shared array, where it stores its current
+        # task as (first, size, current, started, call): here first and size
+        # give the positions in the task, current is the index of the position
+        # being evaluated, started is the time (from ``time.time()``) at which
+        # this evaluation started (or 0 if the worker is idle), and call is
+        # the number of the call to evaluate() that the task is part of.
+        self._status = self._call = None
+        if self._timeout is not None or self._speculative:
+            self._status = multiprocessing.RawArray('d', 5 * self._n_workers)
+            self._call = multiprocessing.RawValue('i', 0)
+
+        # Optional statistics
+        self._stats = EvaluatorStats(self._n_workers) if stats else None
+
+        # Maximum number of native threads per worker
+        self._max_threads = None
+        if max_threads_per_worker is not None:
+            self._max_threads = int(max_threads_per_worker)
+            if self._max_threads < 1:
+                raise ValueError(
+                    'Maximum number of threads per worker must be an integer'
+                    ' greater than 0, or `None` to disable the limit.')
+            if _threadpoolctl() is None:
+                warnings.warn(
+                    'The optional package `threadpoolctl` is not installed,'
+                    ' so max_threads_per_worker will not limit the thread'
+                    ' pools of libraries already loaded by the workers (such'
+                    ' as NumPy\'s BLAS library).')
+
+        # CPU cores to pin workers to
+        self._cpus = None
+        if pin_workers and hasattr(os, 'sched_setaffinity'):
+            self._cpus = sorted(os.sched_getaffinity(0))
+
+        # Error policy
+        self._tolerant = _check_error_policy(error_policy)
+        self._error_value = error_value
+        self._error_log = []
+
+        # Version number of the current function. This is stored in shared
+        # memory, so that workers can check if they need to read a new
+        # function from their control queue before evaluating a task.
+        self._version = multiprocessing.RawValue('i', 0)
+
+        # Futures for asynchronous evaluations that have not yet finished,
+        # indexed by task id
+        self._futures = {}
+        self._next_id = 0
+
     def __del__(self):
         # Cancel everything
         try:
@@ -215,21 +1218,162 @@ multiprocessing.html#all-platforms>`_ for details).
         except Exception:
             pass
 
-    def _clean(self):
+    def _clean(self, pid=None):
         """
         Cleans up any dead workers & return the number of workers tidied up.
+
+        If a ``pid`` is given, the worker with that process id is known to be
+        exiting, and this method will wait for it to do so.
         """
         cleaned = 0
         for k in range(len(self._workers) - 1, -1, -1):
             w = self._workers[k]
-            if w.exitcode is not None:  # pragma: no cover
+            if w.exitcode is not None or (pid is not None and w.pid == pid):
                 w.join()
+                w.control.cancel_join_thread()
+                w.control.close()
                 cleaned += 1
                 del(self._workers[k], w)
-        if cleaned:     # pragma: no cover
+        if cleaned:
             gc.collect()
         return cleaned
 
+    def _collect(self):
+        """ See :meth:`Evaluator._collect()`. """
+        if not self._futures:
+            return
+
+        try:
+            while not self._error.is_set():
+                try:
+                    message = self._results.get(timeout=self._poll_interval)
+                except queue.Empty:     # pragma: no cover
+                    if self._clean():
+                        self._populate()
+                    continue
+
+                i, f = message[:2]
+                if i is None:
+                    # Replace exiting worker (unless halting on an error)
+                    if not self._error.is_set():
+                        self._respawn(f)
+                elif len(message) == 2:
+                    # Results tagged with a call number are left over from
+                    # a call to evaluate(), and are ignored
+                    future = self._futures.pop(i)
+                    if self._tolerant:
+                        _apply_error_policy(
+                            self._function, [future.position()], f,
+                            self._error_value, self._error_log)
+                    future._set_result(f[0])
+                    return
+
+        except (Exception, SystemExit, KeyboardInterrupt):  # pragma: no cover
+            # Cancel all pending evaluations, and let the exception bubble up
+            self._stop()
+            self._fail_futures(Exception('Evaluation was interrupted.'))
+            raise
+
+        # Error in worker process: all pending evaluations fail
+        errors = self._stop()
+        if errors:
+            pid, trace = errors[0]
+            e = Exception(
+                'Exception in subprocess:\n' + trace
+                + '\nException in subprocess')
+        else:   # pragma: no cover
+            e = Exception('Unknown exception in subprocess.')
+        self._fail_futures(e)
+
+    def _check_workers(self, positions, call, done, timed_out, speculated):
+        """
+        Checks the status of the workers during a call to :meth:`evaluate()`.
+
+        Workers whose current evaluation has exceeded the timeout are replaced,
+        the timed out positions are marked as ``done`` and added to the list
+        ``timed_out``, and the remainder of their tasks is sent to the workers
+        again. If speculative execution is enabled and there are idle workers,
+        the remainder of the oldest running task is re-submitted (at most once
+        per task, as recorded in the set ``speculated``).
+
+        Returns the number of positions that timed out.
+        """
+        now = time.time()
+        status = np.frombuffer(self._status, dtype=float).reshape((-1, 5))
+        running = []
+        timeouts = 0
+        for w in list(self._workers):
+            first, size, j, started, c = status[w.slot]
+            if started == 0 or c != call[0] or w.exitcode is not None:
+                continue
+            first, size, j = int(first), int(size), int(j)
+            end = first + size
+            if self._timeout is None or now - started < self._timeout:
+                running.append((started, first, end, j))
+                continue
+
+            # Kill the worker, and re-submit the rest of its task (results
+            # are only sent once a task is finished, so this includes the
+            # positions before j)
+            self._kill(w)
+            if not done[j]:
+                done[j] = True
+                timed_out.append(j)
+                timeouts += 1
+            for a, b in ((first, j), (j + 1, end)):
+                if not np.all(done[a:b]):
+                    self._put_task(positions, a, b - a, call)
+        if timeouts:
+            self._n_timeouts += timeouts
+            self._populate()
+
+        # Re-submit the oldest running task, if all remaining positions are
+        # being evaluated and there are idle workers
+        if self._speculative and 0 < len(running) < len(self._workers):
+            covered = np.array(done)
+            for started, first, end, j in running:
+                covered[first:end] = True
+            if np.all(covered):
+                for started, first, end, j in sorted(running):
+                    if first not in speculated:
+                        # Mark the original and the copy as speculated
+                        speculated.add(first)
+                        speculated.add(j)
+                        self._n_stragglers += 1
+                        self._put_task(positions, j, end - j, call)
+                        break
+
+        return timeouts
+
+    def _chunks(self, n):
+        """
+        Divides ``n`` positions into chunks, and returns a list of tuples
+        ``(start, size)``.
+        """
+        w = self._n_workers
+        if self._chunk_size == 'guided' or (
+                self._chunk_size == 'auto'
+                and self._time_per_evaluation is None):
+            # Decreasing chunk sizes, proportional to the number of positions
+            # not yet assigned to a chunk
+            chunks = []
+            i = 0
+            while i < n:
+                k = max(1, (n - i) // w)
+                chunks.append((i, k))
+                i += k
+            return chunks
+
+        if self._chunk_size == 'auto':
+            # Choose chunk size so that each chunk takes roughly
+            # _time_per_chunk seconds, but make sure every worker can get a
+            # chunk
+            k = self._time_per_chunk / max(self._time_per_evaluation, 1e-9)
+            k = int(max(1, min(k, np.ceil(n / w))))
+        else:
+            k = self._chunk_size
+        return [(i, min(k, n - i)) for i in range(0, n, k)]
+
     @staticmethod
     def cpu_count():
         """
@@ -244,7 +1388,12 @@ multiprocessing.html#all-platforms>`_ for details).
         """
         Populates (but usually repopulates) the worker pool.
         """
-        for k in range(self._n_workers - len(self._workers)):
+        used = set([w.slot for w in self._workers])
+        for slot in range(self._n_workers):
+            if slot in used:
+                continue
+            if self._status is not None:
+                self._status[5 * slot + 3] = 0
             w = _Worker(
                 self._function,
                 self._args,
@@ -253,6 +1402,18 @@ multiprocessing.html#all-platforms>`_ for details).
                 self._max_tasks,
                 self._errors,
                 self._error,
+                self._shared_positions,
+                self._shared_results,
+                self._shared_shape,
+                multiprocessing.Queue(),
+                self._version,
+                self._status,
+                slot,
+                self._call,
+                self._max_threads,
+                None if self._cpus is None
+                else self._cpus[slot % len(self._cpus)],
+                self._tolerant,
             )
             self._workers.append(w)
             w.start()
@@ -261,6 +1422,16 @@ multiprocessing.html#all-platforms>`_ for details).
         """
         Evaluate all tasks in parallel, in batches of size self._max_tasks.
         """
+        # Finish any asynchronous evaluations first
+        self._wait()
+
+        # Write positions to shared memory
+        n = len(positions)
+        if self._shared_memory:
+            if n == 0:
+                return []
+            self._write_shared(positions)
+
         # Ensure task and result queues are empty
         # For some reason these lines block when running on windows
         # if not (self._tasks.empty() and self._results.empty()):
@@ -271,32 +1442,76 @@ multiprocessing.html#all-platforms>`_ for details).
         # Ensure worker pool is populated
         self._populate()
 
+        # Tasks are tagged with the call number if the workers' status is
+        # tracked, so that results from earlier calls can be ignored. When
+        # collecting statistics, tasks without a call number are tagged with
+        # None, followed by the time at which they were submitted.
+        tracked = self._status is not None
+        call = ()
+        if tracked:
+            self._call.value += 1
+            call = (self._call.value, )
+        elif self._stats is not None:
+            call = (None, )
+
         # Start
+        timer = timeit.default_timer()
+        timed_out = []
         try:
 
             # Enqueue all tasks (non-blocking)
-            for k, x in enumerate(positions):
-                self._tasks.put((k, x))
+            for i, k in self._chunks(n):
+                self._put_task(positions, i, k, call)
 
-            # Collect results (blocking)
-            n = len(positions)
+            # Collect results (blocking). Workers signal that they are about
+            # to exit (or have encountered an error) by putting a tuple
+            # (None, pid) on the results queue, so that we can wake up and
+            # respond immediately.
             m = 0
             results = [0] * n
+            done = np.zeros(n, dtype=bool)
+            speculated = set()
+            next_check = timeit.default_timer() + self._poll_interval
             while m < n and not self._error.is_set():
-                time.sleep(0.001)   # This is really necessary
-                # Retrieve all results
                 try:
-                    while True:
-                        i, f = self._results.get(block=False)
-                        results[i] = f
-                        m += 1
-                except queue.Empty:
-                    pass
-
-                # Clean dead workers
-                if self._clean():  # pragma: no cover
-                    # Repolate
-                    self._populate()
+                    message = self._results.get(timeout=self._poll_interval)
+                except queue.Empty:     # pragma: no cover
+                    # No results for a while: check for workers that died
+                    # without notice
+                    if self._clean():
+                        self._populate()
+                else:
+                    i, f = message[:2]
+                    if i is None:
+                        # Replace exiting worker (unless halting on an error)
+                        if not self._error.is_set():
+                            self._respawn(f)
+                    elif message[2:3] == call:
+                        if self._stats is not None:
+                            f = self._read_stats(message)
+
+                        # Store new results (positions can be evaluated
+                        # twice if speculative execution is used). In shared
+                        # memory mode, workers send a list of results only if
+                        # some evaluations failed.
+                        k = len(f) if isinstance(f, list) else f
+                        new = np.flatnonzero(~done[i:i + k])
+                        if isinstance(f, list):
+                            for j in new:
+                                results[i + j] = f[j]
+                        done[i + new] = True
+                        m += len(new)
+
+                # Check for slow evaluations
+                if tracked and m < n and timeit.default_timer() > next_check:
+                    m += self._check_workers(
+                        positions, call, done, timed_out, speculated)
+                    next_check = timeit.default_timer() + self._poll_interval
+
+            # Replace any workers still evaluating positions for this call
+            if tracked:
+                self._call.value += 1
+                self._kill_workers(call[0])
 
         except (IOError, EOFError):     # pragma: no cover
             # IOErrors can originate from the queues as a result of issues in
@@ -330,14 +1545,280 @@ multiprocessing.html#all-platforms>`_ for details).
                 raise Exception(
                     'Unknown exception in subprocess.')  # pragma: no cover
 
+        # Update estimate of time per evaluation (including overhead)
+        timer = timeit.default_timer() - timer
+        if n:
+            self._time_per_evaluation = (
+                timer * min(n, self._n_workers) / n)
+        if self._stats is not None:
+            self._stats._add_call(timer)
+
+        # Read results from shared memory, except for failed evaluations
+        if self._shared_memory:
+            buffer = np.frombuffer(self._shared_results, dtype=float, count=n)
+            results = [
+                r if isinstance(r, _EvaluationError) else float(f)
+                for r, f in zip(results, buffer)]
+
+        # Set value for timed out and failed evaluations
+        for j in timed_out:
+            results[j] = self._timeout_result()
+        if self._tolerant:
+            _apply_error_policy(
+                self._function, positions, results, self._error_value,
+                self._error_log)
+
         # Return results
         return results
 
+    def error_log(self):
+        """
+        Returns a list of tuples ``(x, error)`` for every evaluation that
+        failed while using ``error_policy='sentinel'``, where ``x`` is the
+        position and ``error`` is a string containing either the traceback of
+        the exception raised, or a description of the non-finite result.
+        """
+        return list(self._error_log)
+
+    def _fail_futures(self, exception):
+        """ Marks all pending futures as failed with the given exception. """
+        for future in self._futures.values():
+            future._set_exception(exception)
+        self._futures = {}
+
+    def submit(self, x):
+        """
+        Submits a single position ``x`` for evaluation by one of the worker
+        processes, and returns a :class:`Future` without waiting for the
+        evaluation to finish.
+
+        Submitted positions are always sent to the workers over a queue, even
+        if shared memory transport is enabled for :meth:`evaluate()`.
+
+        If a worker raises an exception, all pending evaluations are
+        cancelled and their futures will raise an exception.
+
+        The ``timeout`` set for this evaluator does not apply to submitted
+        positions: their evaluation is never interrupted, so that waiting for
+        the result of a future blocks until the evaluation has finished.
+
+        See :meth:`Evaluator.submit()`.
+        """
+        # Ensure worker pool is populated
+        self._clean()
+        self._populate()
+
+        # Create future and submit task
+        future = Future(self, x)
+        i = self._next_id
+        self._next_id += 1
+        self._futures[i] = future
+        self._tasks.put((i, [x]))
+        return future
+
+    def _wait(self):
+        """ Waits for all asynchronous evaluations to finish. """
+        while self._futures:
+            self._collect()
+
+    def _write_shared(self, positions):
+        """
+        Copies the given ``positions`` into the shared position buffer,
+        (re)allocating the shared buffers if required.
+        """
+        try:
+            xs = np.asarray(positions, dtype=float)
+        except ValueError:
+            raise ValueError(
+                'When using shared memory, all positions must be sequences'
+                ' of floats with the same shape.')
+        n = xs.shape[0]
+        shape = xs.shape[1:]
+        size = int(np.prod(shape))
+
+        # Check if the current buffers can be reused
+        if (self._shared_positions is None or shape != self._shared_shape
+                or n > len(self._shared_results)):
+
+            # Workers only see the buffers they were created with, so any
+            # running workers need to be replaced
+            if self._workers:
+                self._stop()
+
+            # Allocate some extra space, so that small increases in the
+            # number of positions don't trigger a new allocation
+            capacity = n
+            if self._shared_results is not None:
+                capacity = max(n, 2 * len(self._shared_results))
+            self._shared_positions = multiprocessing.RawArray(
+                'd', capacity * size)
+            self._shared_results = multiprocessing.RawArray('d', capacity)
+            self._shared_shape = shape
+
+        # Copy positions into shared memory
+        buf = np.frombuffer(self._shared_positions, dtype=float)
+        buf[:n * size] = xs.reshape((n * size, ))
+
+    def _kill(self, worker):
+        """ Terminates and removes a single worker. """
+        worker.terminate()
+        worker.join()
+        worker.control.cancel_join_thread()
+        worker.control.close()
+        self._workers.remove(worker)
+
+    def _kill_workers(self, call):
+        """
+        Terminates and removes any workers that are evaluating a task from the
+        given ``call`` to :meth:`evaluate()`.
+        """
+        status = np.frombuffer(self._status, dtype=float).reshape((-1, 5))
+        for w in list(self._workers):
+            if status[w.slot, 3] != 0 and status[w.slot, 4] == call:
+                self._kill(w)
+
+    def _log_init(self, logger):
+        """ See :meth:`Loggable._log_init()`. """
+        if self._timeout is not None:
+            logger.add_counter('Timeouts')
+        if self._speculative:
+            logger.add_counter('Stragglers')
+        if self._tolerant:
+            logger.add_counter('Errors')
+        if self._stats is not None:
+            self._stats._log_init(logger)
+
+    def _log_write(self, logger):
+        """ See :meth:`Loggable._log_write()`. """
+        if self._timeout is not None:
+            logger.log(self._n_timeouts)
+        if self._speculative:
+            logger.log(self._n_stragglers)
+        if self._tolerant:
+            logger.log(len(self._error_log))
+        if self._stats is not None:
+            self._stats._log_write(logger)
+
+    def n_stragglers(self):
+        """
+        Returns the number of tasks that were re-submitted by speculative
+        execution.
+        """
+        return self._n_stragglers
+
+    def n_timeouts(self):
+        """
+        Returns the number of evaluations that have timed out.
+        """
+        return self._n_timeouts
+
+    def n_workers(self):
+        """
+        Returns the number of worker processes used by this evaluator.
+        """
+        return self._n_workers
+
+    def _put_task(self, positions, i, k, call):
+        """
+        Adds a task to evaluate positions ``i`` to ``i + k`` to the queue.
+        """
+        if self._shared_memory:
+            # Workers read the positions from shared memory
+            task = k
+        else:
+            task = list(positions[i:i + k])
+
+        if self._stats is None:
+            self._tasks.put((i, task) + call)
+        else:
+            # Pickle positions here, so that serialisation can be timed
+            if not self._shared_memory:
+                t = timeit.default_timer()
+                task = pickle.dumps(task, pickle.HIGHEST_PROTOCOL)
+                self._stats._add_serialisation(timeit.default_timer() - t)
+            self._tasks.put((i, task) + call + (time.time(), ))
+
+    def _read_stats(self, message):
+        """
+        Stores the statistics sent along with a result ``message``, and
+        returns the (unpickled) results.
+        """
+        f, (wait, times, serialisation) = message[1], message[3]
+        if not self._shared_memory:
+            t = timeit.default_timer()
+            f = pickle.loads(f)
+            serialisation += timeit.default_timer() - t
+        self._stats._add_task(times, wait, serialisation)
+        return f
+
+    def _respawn(self, pid):
+        """
+        Replaces a worker that is exiting after reaching its maximum number of
+        tasks.
+        """
+        self._clean(pid)
+        self._populate()
+        if self._stats is not None:
+            self._stats._add_respawn()
+
+    def set_function(self, function, args=None):
+        """
+        Replaces the function evaluated by this evaluator, and the optional
+        sequence of extra arguments ``args``.
+
+        Any running workers are kept alive: the new function is pickled once,
+        and then sent to each worker. If the function can't be pickled, the
+        running workers are stopped instead, so that new workers can be
+        created (which does not require pickling on systems that support
+        ``fork``).
+        """
+        # Evaluate any submitted positions with the old function
+        self._wait()
+
+        super(ParallelEvaluator, self).set_function(function, args)
+        self._version.value += 1
+        if self._workers:
+            try:
+                message = pickle.dumps(
+                    (self._version.value, self._function, self._args),
+                    pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                self._stop()
+            else:
+                for w in self._workers:
+                    w.control.put(message)
+
+    def stats(self):
+        """
+        Returns an :class:`EvaluatorStats` object with statistics about the
+        calls to :meth:`evaluate()` made so far, or ``None`` if this evaluator
+        was created with ``stats=False``.
+        """
+        return self._stats
+
+    def _timeout_result(self):
+        """ Returns the value to use for an evaluation that timed out. """
+        if self._timeout_value is not None:
+            return self._timeout_value
+        return _rejected_value(self._function)
+
     def _stop(self):
         """
-        Forcibly halts the workers
+        Forcibly halts the workers, and returns a list of any errors that were
+        reported.
         """
-        time.sleep(0.1)
+        # Collect errors. Workers set the error flag *after* adding an error
+        # to the queue, but the queue is written to by a background thread, so
+        # the error may not be readable yet. Wait for it before terminating
+        # the workers.
+        errors = []
+        if self._error.is_set():
+            try:
+                errors.append(self._errors.get(timeout=self._error_timeout))
+                while True:
+                    errors.append(self._errors.get(block=False))
+            except (queue.Empty, IOError, EOFError):
+                pass
 
         # Terminate workers
         for w in self._workers:
@@ -346,31 +1827,20 @@ multiprocessing.html#all-platforms>`_ for details).
         for w in self._workers:
             if w.is_alive():
                 w.join()
+            w.control.cancel_join_thread()
+            w.control.close()
         self._workers = []
 
-        # Clear queues
-        def clear(q):
-            items = []
-            try:
-                while True:
-                    items.append(q.get(timeout=0.1))
-            except (queue.Empty, IOError, EOFError):
-                pass
-            return items
-
-        clear(self._tasks)
-        clear(self._results)
-        errors = clear(self._errors)
-
-        # Create new queues & error event
+        # Discard old queues, without waiting for any unread items to be
+        # flushed, and create new queues & error event
+        for q in (self._tasks, self._results, self._errors):
+            q.cancel_join_thread()
+            q.close()
         self._tasks = multiprocessing.Queue()
         self._results = multiprocessing.Queue()
         self._errors = multiprocessing.Queue()
         self._error = multiprocessing.Event()
 
-        # Free memory
-        gc.collect()
-
         # Return errors
         return errors
 
@@ -389,20 +1859,430 @@ class SequentialEvaluator(Evaluator):
     ``args``
         An optional tuple containing extra arguments to ``f``. If ``args`` is
         specified, ``f`` will be called as ``f(x, *args)``.
+    ``stats``
+        Set to ``True`` to collect timing statistics for each call to
+        :meth:`evaluate()` (see :meth:`stats()`).
+    ``error_policy``
+        The policy for exceptions raised by the function. With the default
+        ``error_policy='raise'``, exceptions are raised by :meth:`evaluate()`.
+        With ``error_policy='sentinel'``, exceptions (other than
+        ``KeyboardInterrupt`` and ``SystemExit``) and non-finite results are
+        replaced by ``error_value``, and recorded in the :meth:`error_log()`
+        (see :class:`ParallelEvaluator`).
+    ``error_value``
+        The value to return for failed evaluations if
+        ``error_policy='sentinel'``. If not set, ``-inf`` is used for a
+        :class:`LogPDF` and ``inf`` for other functions (see
+        :class:`ParallelEvaluator`).
 
     Returns a list containing the calculated function evaluations.
 
     *Extends:* :class:`Evaluator`
     """
-    def __init__(self, function, args=None):
+    def __init__(self, function, args=None, stats=False, error_policy='raise',
+                 error_value=None):
         super(SequentialEvaluator, self).__init__(function, args)
+        self._stats = EvaluatorStats() if stats else None
+        self._tolerant = _check_error_policy(error_policy)
+        self._error_value = error_value
+        self._error_log = []
+
+    def error_log(self):
+        """
+        Returns a list of tuples ``(x, error)`` for every evaluation that
+        failed while using ``error_policy='sentinel'`` (see
+        :meth:`ParallelEvaluator.error_log()`).
+        """
+        return list(self._error_log)
 
     def _evaluate(self, positions):
         scores = [0] * len(positions)
+        if not (self._tolerant or self._stats):
+            for k, x in enumerate(positions):
+                scores[k] = self._function(x, *self._args)
+            return scores
+
+        # Evaluate one by one, timing every evaluation (each of which counts
+        # as a single task) and/or catching errors
+        timer = timeit.default_timer()
         for k, x in enumerate(positions):
-            scores[k] = self._function(x, *self._args)
+            scores[k] = self._evaluate_one(x)
+        if self._stats is not None:
+            self._stats._add_call(timeit.default_timer() - timer)
+        if self._tolerant:
+            _apply_error_policy(
+                self._function, positions, scores, self._error_value,
+                self._error_log)
         return scores
 
+    def _evaluate_one(self, x):
+        """
+        Evaluates a single position, storing its evaluation time if
+        statistics are collected. If errors are tolerated, exceptions are
+        returned as :class:`_EvaluationError` objects.
+        """
+        t = timeit.default_timer()
+        try:
+            y = self._function(x, *self._args)
+        except Exception:
+            if not self._tolerant:
+                raise
+            y = _EvaluationError(traceback.format_exc())
+        if self._stats is not None:
+            self._stats._add_task([timeit.default_timer() - t])
+        return y
+
+    def _log_init(self, logger):
+        """ See :meth:`Loggable._log_init()`. """
+        if self._tolerant:
+            logger.add_counter('Errors')
+        if self._stats is not None:
+            self._stats._log_init(logger)
+
+    def _log_write(self, logger):
+        """ See :meth:`Loggable._log_write()`. """
+        if self._tolerant:
+            logger.log(len(self._error_log))
+        if self._stats is not None:
+            self._stats._log_write(logger)
+
+    def stats(self):
+        """
+        Returns an :class:`EvaluatorStats` object with statistics about the
+        calls to :meth:`evaluate()` made so far, or ``None`` if this evaluator
+        was created with ``stats=False``.
+        """
+        return self._stats
+
+
+class ThreadedEvaluator(Evaluator):
+    """
+    Evaluates a single-valued function object for any set of input values
+    given, using a pool of threads.
+
+    Because of Python's global interpreter lock (GIL), only one thread can
+    execute Python code at any time, so this evaluator is only useful for
+    functions that spend most of their time in code that releases the GIL,
+    for example in NumPy routines or in compiled ODE solvers such as
+    ``scipy.integrate.odeint``. Unlike the :class:`ParallelEvaluator`, no new
+    processes need to be started, and the function and positions do not need
+    to be copied (pickled) for each worker.
+
+    The worker threads are started on the first call to :meth:`evaluate()`,
+    and are kept alive until the evaluator is tidied up by garbage
+    collection.
+
+    If the function raises an exception, the remaining evaluations are
+    cancelled and a new exception is raised, containing the original
+    exception's traceback.
+
+    Arguments:
+
+    ``function``
+        The function to evaluate. Must be thread-safe.
+    ``n_workers``
+        The number of threads to use. If left at the default value
+        ``n_workers=None`` the number of threads will equal the number of CPU
+        cores in the machine this is run on.
+    ``args``
+        An optional sequence of extra arguments to ``f``. If ``args`` is
+        specified, ``f`` will be called as ``f(x, *args)``.
+
+    *Extends:* :class:`Evaluator`
+    """
+    def __init__(self, function, n_workers=None, args=None):
+        super(ThreadedEvaluator, self).__init__(function, args)
+
+        # Determine number of workers
+        if n_workers is None:
+            self._n_workers = ParallelEvaluator.cpu_count()
+        else:
+            self._n_workers = int(n_workers)
+            if self._n_workers < 1:
+                raise ValueError(
+                    'Number of workers must be an integer greater than 0 or'
+                    ' `None` to use the default value.')
+
+        # Worker threads, and the queue they read tasks from
+        self._threads = []
+        self._tasks = queue.Queue()
+
+        # Futures for asynchronous evaluations that have not yet finished,
+        # indexed by task id, and the queue their results are stored in
+        self._futures = {}
+        self._next_id = 0
+        self._async_results = queue.Queue()
+
+    def __del__(self):
+        # Tell threads to stop
+        try:
+            for t in self._threads:
+                self._tasks.put(None)
+        except Exception:   # pragma: no cover
+            pass
+
+    def _collect(self):
+        """ See :meth:`Evaluator._collect()`. """
+        if not self._futures:
+            return
+        i, f, trace = self._async_results.get()
+        if trace is None:
+            self._futures.pop(i)._set_result(f)
+        else:
+            self._futures.pop(i)._set_exception(Exception(
+                'Exception in thread:\n' + trace + '\nException in thread'))
+
+    def _evaluate(self, positions):
+        self._start()
+
+        # Results and errors are returned via a queue and event specific to
+        # this call, so that nothing is shared with any earlier calls that
+        # were interrupted.
+        results = queue.Queue()
+        error = threading.Event()
+        try:
+            # Enqueue all tasks
+            n = len(positions)
+            for k, x in enumerate(positions):
+                self._tasks.put(
+                    (k, x, self._function, self._args, results, error))
+
+            # Collect results
+            fs = [0] * n
+            for m in range(n):
+                k, f, trace = results.get()
+                if trace is not None:
+                    raise Exception(
+                        'Exception in thread:\n' + trace
+                        + '\nException in thread')
+                fs[k] = f
+
+        except (Exception, SystemExit, KeyboardInterrupt):
+            # Skip any remaining tasks
+            error.set()
+            raise
+
+        return fs
+
+    def n_workers(self):
+        """
+        Returns the number of worker threads used by this evaluator.
+        """
+        return self._n_workers
+
+    def _start(self):
+        """ Starts the worker threads, if not already running. """
+        if not self._threads:
+            for k in range(self._n_workers):
+                t = threading.Thread(
+                    target=_thread_worker, args=(self._tasks, ))
+                t.daemon = True
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, x):
+        """
+        Submits a single position ``x`` for evaluation by one of the worker
+        threads, and returns a :class:`Future` without waiting for the
+        evaluation to finish.
+
+        See :meth:`Evaluator.submit()`.
+        """
+        self._start()
+        future = Future(self, x)
+        i = self._next_id
+        self._next_id += 1
+        self._futures[i] = future
+
+        # Each task gets its own error event, so that an error in one task
+        # does not cause other submitted tasks to be skipped
+        self._tasks.put((
+            i, x, self._function, self._args, self._async_results,
+            threading.Event()))
+        return future
+
+
+def _thread_worker(tasks):
+    """
+    Worker function for use with :class:`ThreadedEvaluator`.
+
+    Reads tasks from a ``queue.Queue``, stored as tuples
+    ``(i, x, function, args, results, error)``, where ``i`` is a task id,
+    ``x`` is the position to evaluate, ``function`` and ``args`` specify the
+    function to call as ``function(x, *args)``, ``results`` is a queue to
+    store the result in, and ``error`` is an event that is set if an error
+    has occurred.
+
+    Results are stored as tuples ``(i, f, trace)``, where ``f`` is the
+    function's result and ``trace`` is ``None``. If an exception occurs, the
+    ``error`` event is set, and a tuple ``(i, None, trace)`` is stored, where
+    ``trace`` is a formatted traceback. If the ``error`` flag is already set
+    when a task is read, the task is skipped.
+
+    Keeps running until it reads ``None`` as a task.
+    """
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        i, x, function, args, results, error = task
+        if error.is_set():
+            continue
+        try:
+            results.put((i, function(x, *args), None))
+        except (Exception, KeyboardInterrupt, SystemExit):
+            error.set()
+            results.put((i, None, traceback.format_exc()))
+
+
+def _apply_error_policy(function, positions, results, value, log):
+    """
+    Replaces any failed evaluations (stored as :class:`_EvaluationError`
+    objects) and invalid results (see :meth:`_is_valid()`) for the given
+    ``positions`` in the list ``results`` by a sentinel ``value`` (or a
+    default value for ``function`` if ``value`` is ``None``), and appends a
+    tuple ``(x, error)`` to the list ``log`` for each replaced result.
+    """
+    rejected = _rejected_value(function)
+    for j, y in enumerate(results):
+        if isinstance(y, _EvaluationError):
+            error = y.trace
+        elif not _is_valid(y, rejected):
+            error = 'Non-finite result: ' + str(y)
+        else:
+            continue
+        log.append((positions[j], error))
+        results[j] = _rejected_value(function) if value is None else value
+
+
+def _check_error_policy(policy):
+    """
+    Checks an error policy, and returns ``True`` if errors should be
+    tolerated.
+    """
+    if policy not in ('raise', 'sentinel'):
+        raise ValueError(
+            'Error policy must be either \'raise\' or \'sentinel\'.')
+    return policy == 'sentinel'
+
+
+class _EvaluationError(object):
+    """
+    Stores the traceback of an exception raised by an evaluation, so that it
+    can be sent back to the evaluator when errors are tolerated.
+    """
+    def __init__(self, trace):
+        self.trace = trace
+
+
+def _is_valid(y, rejected):
+    """
+    Checks that a result ``y`` contains no NaNs, and no infinite values other
+    than the value returned by :meth:`_rejected_value()` (for example
+    ``-inf`` for a log-pdf). For results ``(fx, dfx)``, the gradient is only
+    checked if ``fx`` is finite. For results ``(fx, log_likelihood,
+    log_prior)`` from a log-posterior's components, only ``fx`` is checked.
+    Non-numerical results are assumed to be valid.
+    """
+    try:
+        if isinstance(rejected, tuple) and len(rejected) == 3:
+            return _is_valid(y[0], rejected[0])
+        if isinstance(rejected, tuple):
+            fx, dfx = y
+            if fx == rejected[0]:
+                return True
+            return bool(np.isfinite(fx) and np.all(np.isfinite(dfx)))
+        y = np.asarray(y, dtype=float)
+        return bool(np.all(np.isfinite(y) | (y == rejected)))
+    except (TypeError, ValueError):
+        return True
+
+
+def _overrides_evaluate_batch(function):
+    """
+    Returns ``True`` if ``function`` is a :class:`LogPDF` or
+    :class:`ErrorMeasure` that provides its own ``evaluate_batch()`` method,
+    instead of the default method that calls the function once per point.
+
+    A method inherited from a class that is further up the hierarchy than
+    the class defining ``__call__`` is not counted, as it might not agree
+    with the overridden ``__call__``.
+    """
+    if not isinstance(function, (pints.LogPDF, pints.ErrorMeasure)):
+        return False
+
+    def owner(name):
+        for cls in type(function).__mro__:
+            if name in cls.__dict__:
+                return cls
+
+    batch = owner('evaluate_batch')
+    if batch in (pints.LogPDF, pints.ErrorMeasure):
+        return False
+    return issubclass(batch, owner('__call__'))
+
+
+def _rejected_value(function):
+    """
+    Returns a value that will be rejected by any optimiser or sampler using
+    the given ``function``.
+    """
+    # Wrappers (e.g. around a log-posterior's components) can define their own
+    rejected = getattr(function, '_rejected_value', None)
+    if rejected is not None:
+        return rejected()
+
+    # Log-pdfs are maximised, error measures (and anything else) minimised
+    owner = getattr(function, '__self__', None)
+    if getattr(function, '__name__', None) == 'evaluateS1' and isinstance(
+            owner, (pints.LogPDF, pints.ErrorMeasure)):
+        if isinstance(owner, pints.LogPDF):
+            return float('-inf'), np.zeros(owner.n_parameters())
+        return float('inf'), np.zeros(owner.n_parameters())
+    if isinstance(function, pints.LogPDF):
+        return float('-inf')
+    return float('inf')
+
+
+# Environment variables used to set the size of native thread pools
+_THREAD_VARIABLES = (
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS',
+)
+
+
+def _limit_threads(n):
+    """
+    Limits the number of threads used by native thread pools (e.g. OpenMP and
+    BLAS) in the current process to ``n``.
+
+    Environment variables are set for libraries that have not been loaded yet
+    (or for child processes), and ``threadpoolctl`` is used to limit the
+    thread pools of libraries already loaded, if it is installed. Returns the
+    ``threadpoolctl`` limiter object, or ``None`` if it is not available.
+    """
+    for var in _THREAD_VARIABLES:
+        os.environ[var] = str(n)
+    threadpoolctl = _threadpoolctl()
+    if threadpoolctl is None:
+        return None
+    return threadpoolctl.threadpool_limits(limits=n)
+
+
+def _threadpoolctl():
+    """
+    Returns the optional ``threadpoolctl`` module, or ``None`` if it is not
+    installed.
+    """
+    try:
+        import threadpoolctl
+    except ImportError:
+        return None
+    return threadpoolctl
+
 
 #
 # Note: For Windows multiprocessing to work, the _Worker can never be a nested
@@ -415,7 +2295,10 @@ class _Worker(multiprocessing.Process):
     Evaluates a single-valued function for every point in a ``tasks`` queue
     and places the results on a ``results`` queue.
 
-    Keeps running until it's given the string "stop" as a task.
+    Keeps running until it has performed ``max_tasks`` evaluations, or until
+    an error occurs. In both cases, a tuple ``(None, pid)`` is placed on the
+    ``results`` queue just before exiting, where ``pid`` is the worker's
+    process id.
 
     Arguments:
 
@@ -426,25 +2309,90 @@ class _Worker(multiprocessing.Process):
         objective function.
     ``tasks``
         The queue to read tasks from. Tasks are stored as tuples
-        ``(i, p)`` where ``i`` is a task id and ``p`` is the
-        position to evaluate.
+        ``(i, xs)`` where ``i`` is the index of the first position in the
+        task (or a task id), and ``xs`` is a list of positions to evaluate.
     ``results``
         The queue to store results in. Results are stored as
-        tuples ``(i, p, r)`` where ``i`` is the task id, ``p`` is
-        the position evaluated (which can be updated by the
-        refinement method!) and ``r`` is the result at ``p``.
+        tuples ``(i, fs)`` where ``i`` is the index of the first position in
+        the task, and ``fs`` is a list of results.
     ``max_tasks``
-        The maximum number of tasks to perform before dying.
+        The maximum number of evaluations to perform before dying. If a task
+        contains several positions, all of them are evaluated before checking
+        this number.
     ``errors``
         A queue to store exceptions on
     ``error``
         This flag will be set by the worker whenever it encounters an
         error.
+    ``shared_positions``
+        An optional ``multiprocessing.RawArray`` containing positions to
+        evaluate. If set, tasks can also be stored as tuples ``(i, n)``, where
+        ``n`` is an integer, in which case the positions for the task are read
+        from rows ``i`` to ``i + n`` of this array.
+    ``shared_results``
+        An optional ``multiprocessing.RawArray`` to write results into. Must
+        be set whenever ``shared_positions`` is set. Results are written to
+        entries ``i`` to ``i + n``, after which ``(i, n)`` is stored in the
+        results queue.
+    ``shared_shape``
+        The shape of a single position in ``shared_positions``.
+    ``control``
+        An optional queue, used to send this worker a new function (see
+        ``version``). The queue can be accessed via the worker's ``control``
+        attribute.
+    ``version``
+        An optional ``multiprocessing.RawValue`` containing the version number
+        of the current function, where the given ``function`` and ``args``
+        have the version number stored at construction. Before evaluating a
+        task, the worker compares its version to this number, and reads new
+        functions from ``control`` until the versions match. New functions are
+        sent as pickled tuples ``(version, function, args)``.
+    ``status``
+        An optional ``multiprocessing.RawArray``, in which the worker reports
+        the task it is working on. Tasks to report on are given as tuples
+        ``(i, xs, call)`` or ``(i, n, call)``, where ``call`` is a number that
+        is included in the result, so that the result is stored as
+        ``(i, fs, call)`` or ``(i, n, call)``. For each such task, the worker
+        writes ``(i, size, j, started, call)`` to entries ``5 * slot`` to
+        ``5 * slot + 5``, where ``j`` is the index of the position being
+        evaluated and ``started`` is the time (from ``time.time()``) at which
+        its evaluation started, or 0 if the task is finished.
+
+        Tasks can also be given as ``(i, xs, call, submitted)``, where
+        ``call`` may be ``None`` and ``submitted`` is the time at which the
+        task was added to the queue. In this case ``xs`` can be a pickled
+        list, and results are stored as ``(i, fs, call, stats)``, where
+        ``fs`` is a pickled list of results (or ``n`` in shared memory
+        mode), and ``stats`` is a tuple ``(wait, times, serialisation)``
+        containing the time spent in the queue, a list of evaluation times,
+        and the time spent (un)pickling.
+    ``slot``
+        The worker's row in ``status``. Can be accessed via the worker's
+        ``slot`` attribute.
+    ``call``
+        A ``multiprocessing.RawValue`` with the current call number. Tasks
+        with a different call number are skipped. Must be set whenever
+        ``status`` is set.
+    ``max_threads``
+        An optional maximum number of threads for native thread pools (see
+        :class:`ParallelEvaluator`), set when the worker starts.
+    ``cpu``
+        An optional CPU core to pin this worker to.
+    ``tolerant``
+        If set to ``True``, exceptions raised by the function (except
+        ``KeyboardInterrupt`` and ``SystemExit``) do not stop the worker.
+        Instead, the result for the failed position is stored as an
+        ``_EvaluationError`` containing the traceback. In shared memory mode,
+        the results for a task with failed positions are sent as a list
+        ``(i, fs)``, instead of ``(i, n)``.
 
     *Extends:* ``multiprocessing.Process``
     """
     def __init__(
-            self, function, args, tasks, results, max_tasks, errors, error):
+            self, function, args, tasks, results, max_tasks, errors, error,
+            shared_positions=None, shared_results=None, shared_shape=None,
+            control=None, version=None, status=None, slot=None, call=None,
+            max_threads=None, cpu=None, tolerant=False):
         super(_Worker, self).__init__()
         self.daemon = True
         self._function = function
@@ -454,6 +2402,18 @@ class _Worker(multiprocessing.Process):
         self._max_tasks = max_tasks
         self._errors = errors
         self._error = error
+        self._shared_positions = shared_positions
+        self._shared_results = shared_results
+        self._shared_shape = shared_shape
+        self.control = control
+        self._function_version = version
+        self._current_version = None if version is None else version.value
+        self._status = status
+        self.slot = slot
+        self._call = call
+        self._max_threads = max_threads
+        self._cpu = cpu
+        self._tolerant = tolerant
 
     def run(self):
         # Worker processes should never write to stdout or stderr.
@@ -462,16 +2422,114 @@ class _Worker(multiprocessing.Process):
         sys.stdout = open(os.devnull, 'w')
         sys.stderr = open(os.devnull, 'w')
         try:
-            for k in range(self._max_tasks):
-                i, x = self._tasks.get()
-                f = self._function(x, *self._args)
-                self._results.put((i, f))
+            # Limit native thread pools, and pin to a CPU core
+            if self._max_threads is not None:
+                self._thread_limits = _limit_threads(self._max_threads)
+            if self._cpu is not None:
+                os.sched_setaffinity(0, [self._cpu])
+
+            # Create views on shared memory
+            if self._shared_positions is not None:
+                xs = np.frombuffer(self._shared_positions, dtype=float)
+                xs = xs.reshape((-1, ) + tuple(self._shared_shape))
+                fs = np.frombuffer(self._shared_results, dtype=float)
+
+            # Create view on status array
+            if self._status is not None:
+                status = np.frombuffer(self._status, dtype=float)
+                status = status[5 * self.slot:5 * self.slot + 5]
+
+            evaluations = 0
+            while evaluations < self._max_tasks:
+                message = self._tasks.get()
+                i, task = message[:2]
+
+                # Install new function, if changed
+                if self._function_version is not None:
+                    while self._current_version < self._function_version.value:
+                        update = pickle.loads(self.control.get())
+                        self._current_version = update[0]
+                        self._function, self._args = update[1:]
+
+                # Read submission time, and unpickle positions if the
+                # evaluator collects statistics
+                timed = len(message) > 3
+                if timed:
+                    wait = time.time() - message[3]
+                    serialisation = 0
+                    if isinstance(task, bytes):
+                        t = timeit.default_timer()
+                        task = pickle.loads(task)
+                        serialisation = timeit.default_timer() - t
+                shared = not isinstance(task, list)
+                size = task if shared else len(task)
+
+                # Report status, and skip tasks from earlier calls
+                call = message[2] if len(message) > 2 else None
+                tracked = call is not None
+                if tracked:
+                    status[:] = (i, size, i, time.time(), call)
+                    if call != self._call.value:
+                        status[3] = 0
+                        continue
+
+                if not (shared or tracked or timed or self._tolerant):
+                    f = [self._function(x, *self._args) for x in task]
+                else:
+                    # Evaluate positions one by one, reporting status and
+                    # measuring evaluation times if required. In shared
+                    # memory mode, results are written to shared memory.
+                    f = task if shared else []
+                    times = []
+                    failed = {}
+                    for j in range(i, i + size):
+                        if tracked:
+                            status[3] = time.time()
+                            status[2] = j
+                        t = timeit.default_timer()
+                        x = xs[j].copy() if shared else task[j - i]
+                        try:
+                            y = self._function(x, *self._args)
+                        except Exception:
+                            if not self._tolerant:
+                                raise
+                            y = failed[j] = _EvaluationError(
+                                traceback.format_exc())
+                        times.append(timeit.default_timer() - t)
+                        if not shared:
+                            f.append(y)
+                        elif j not in failed:
+                            fs[j] = y
+                    if tracked:
+                        status[3] = 0
+
+                    # In shared memory mode, failures are sent back in a
+                    # list of results
+                    if shared and failed:
+                        f = [failed.get(j, fs[j]) for j in range(i, i + size)]
+
+                if timed:
+                    if not shared:
+                        t = timeit.default_timer()
+                        f = pickle.dumps(f, pickle.HIGHEST_PROTOCOL)
+                        serialisation += timeit.default_timer() - t
+                    self._results.put(
+                        (i, f, call, (wait, times, serialisation)))
+                else:
+                    self._results.put((i, f) + message[2:])
+                evaluations += size
 
                 # Check for errors in other workers
                 if self._error.is_set():
                     return
 
+            # Let the evaluator know this worker is exiting
+            self._results.put((None, self.pid))
+
         except (Exception, KeyboardInterrupt, SystemExit):
             self._errors.put((self.pid, traceback.format_exc()))
             self._error.set()
 
+            # Wake up the evaluator
+            self._results.put((None, self.pid))
+
@@ -12,6 +12,8 @@ import pints
 import numpy as np
 import scipy.special
 
+from ._core import _batch_sum_of_squares
+
 
 class AR1LogLikelihood(pints.ProblemLogLikelihood):
     """
@@ -61,11 +63,44 @@ class AR1LogLikelihood(pints.ProblemLogLikelihood):
         rho = np.asarray(parameters[0::2])
         sigma = np.asarray(parameters[1::2])
         sigma = np.asarray(sigma) * np.sqrt(1 - rho**2)
-        error = self._values - self._problem.evaluate(x[:-2 * self._no])
+        error = self._values - self._evaluate_problem(x[:-2 * self._no])
         autocorr_error = error[1:] - rho * error[:-1]
         return np.sum(- self._logn - self._nt * np.log(sigma)
                       - np.sum(autocorr_error**2, axis=0) / (2 * sigma**2))
 
+    def evaluateS1(self, x):
+        """ See :meth:`LogPDF.evaluateS1()`. """
+        m = 2 * self._no
+        parameters = np.asarray(x[-m:])
+        rho = parameters[0::2]
+        sigma = parameters[1::2]
+        s = sigma * np.sqrt(1 - rho**2)
+
+        # Evaluate, and get residuals
+        y, dy = self._evaluate_problemS1(x[:-m])
+        dy = dy.reshape(self._nt + 1, self._no, self._n_parameters - m)
+        r = self._values - y
+        e = r[1:] - rho * r[:-1]
+        e2 = np.sum(e**2, axis=0)
+
+        # Calculate log-likelihood
+        L = np.sum(- self._logn - self._nt * np.log(s) - e2 / (2 * s**2))
+
+        # Derivative wrt the residuals, and from there the model parameters
+        de = -e / s**2
+        dr = np.zeros(r.shape)
+        dr[1:] += de
+        dr[:-1] -= rho * de
+        dL = -np.sum((dr.T * dy.T).T, axis=(0, 1))
+
+        # Derivatives wrt rho and sigma
+        ds = -self._nt / s + e2 / s**3
+        drho = np.sum(-de * r[:-1], axis=0) - ds * rho * s / (1 - rho**2)
+        dsigma = ds * s / sigma
+        dnoise = np.vstack((drho, dsigma)).T.reshape(m)
+
+        return L, np.concatenate((dL, dnoise))
+
 
 class ARMA11LogLikelihood(pints.ProblemLogLikelihood):
     """
@@ -126,12 +161,53 @@ class ARMA11LogLikelihood(pints.ProblemLogLikelihood):
             sigma *
             np.sqrt((1.0 - rho**2) / (1.0 + 2.0 * phi * rho + phi**2))
         )
-        error = self._values - self._problem.evaluate(x[:-m])
+        error = self._values - self._evaluate_problem(x[:-m])
         v = error[1:] - rho * error[:-1]
         autocorr_error = v[1:] - phi * v[:-1]
         return np.sum(- self._logn - self._nt * np.log(sigma)
                       - np.sum(autocorr_error**2, axis=0) / (2 * sigma**2))
 
+    def evaluateS1(self, x):
+        """ See :meth:`LogPDF.evaluateS1()`. """
+        m = 3 * self._no
+        parameters = np.asarray(x[-m:])
+        rho = parameters[0::3]
+        phi = parameters[1::3]
+        sigma = parameters[2::3]
+        q = 1.0 + 2.0 * phi * rho + phi**2
+        s = sigma * np.sqrt((1.0 - rho**2) / q)
+
+        # Evaluate, and get residuals
+        y, dy = self._evaluate_problemS1(x[:-m])
+        dy = dy.reshape(self._nt + 2, self._no, self._n_parameters - m)
+        r = self._values - y
+        v = r[1:] - rho * r[:-1]
+        a = v[1:] - phi * v[:-1]
+        a2 = np.sum(a**2, axis=0)
+
+        # Calculate log-likelihood
+        L = np.sum(- self._logn - self._nt * np.log(s) - a2 / (2 * s**2))
+
+        # Derivative wrt the residuals, and from there the model parameters
+        da = -a / s**2
+        dv = np.zeros(v.shape)
+        dv[1:] += da
+        dv[:-1] -= phi * da
+        dr = np.zeros(r.shape)
+        dr[1:] += dv
+        dr[:-1] -= rho * dv
+        dL = -np.sum((dr.T * dy.T).T, axis=(0, 1))
+
+        # Derivatives wrt rho, phi, and sigma
+        ds = (-self._nt / s + a2 / s**3) * s
+        drho = (np.sum(-dv * r[:-1], axis=0)
+                - ds * (rho / (1 - rho**2) + phi / q))
+        dphi = np.sum(-da * v[:-1], axis=0) - ds * (rho + phi) / q
+        dsigma = ds / sigma
+        dnoise = np.vstack((drho, dphi, dsigma)).T.reshape(m)
+
+        return L, np.concatenate((dL, dnoise))
+
 
 class GaussianIntegratedUniformLogLikelihood(pints.ProblemLogLikelihood):
     r"""
@@ -249,7 +325,7 @@ class GaussianIntegratedUniformLogLikelihood(pints.ProblemLogLikelihood):
         self._two_power = 2**(1 / 2 - n / 2)
 
     def __call__(self, x):
-        error = self._values - self._problem.evaluate(x)
+        error = self._values - self._evaluate_problem(x)
         sse = np.sum(error**2, axis=0)
 
         # Calculate
@@ -273,6 +349,42 @@ class GaussianIntegratedUniformLogLikelihood(pints.ProblemLogLikelihood):
             log_temp
         )
 
+    def evaluateS1(self, x):
+        """ See :meth:`LogPDF.evaluateS1()`. """
+        # Evaluate, and get residuals
+        y, dy = self._evaluate_problemS1(x)
+        dy = dy.reshape(self._nt, self._no, self._n_parameters)
+        r = self._values - y
+        sse = pints.vector(np.sum(r**2, axis=0))
+
+        # Calculate log-likelihood, and the derivative wrt the sse, using
+        #  d/dx Gamma(h, x) = -x^(h - 1) exp(-x) / Gamma(h)
+        # for the regularised upper incomplete gamma function
+        h = self._n_minus_1_over_2
+        log_temp = np.zeros(self._no)
+        dsse = np.zeros(self._no)
+        for i, a in enumerate(self._a2):
+            xb = sse[i] / (2 * self._b2[i])
+            q = scipy.special.gammaincc(h, xb)
+            dq = -np.exp((h - 1) * np.log(xb) - xb - self._log_gamma) / (
+                2 * self._b2[i])
+            if a != 0:
+                xa = sse[i] / (2 * a)
+                q -= scipy.special.gammaincc(h, xa)
+                dq += np.exp((h - 1) * np.log(xa) - xa - self._log_gamma) / (
+                    2 * a)
+            log_temp[i] = np.log(q)
+            dsse[i] = dq / q
+        L = np.sum(
+            self._const_general - h * np.log(sse) + self._log_gamma + log_temp)
+        dsse -= h / sse
+
+        # Derivative wrt the model parameters
+        dr = 2 * r * dsse
+        dL = -np.sum((dr.T * dy.T).T, axis=(0, 1))
+
+        return L, dL
+
 
 class CauchyLogLikelihood(pints.ProblemLogLikelihood):
     """
@@ -321,7 +433,7 @@ class CauchyLogLikelihood(pints.ProblemLogLikelihood):
 
         # problem parameters
         problem_parameters = x[:-m]
-        error = self._values - self._problem.evaluate(problem_parameters)
+        error = self._values - self._evaluate_problem(problem_parameters)
 
         # Distribution parameters
         sigma = np.asarray(x[-m:])
@@ -333,6 +445,32 @@ class CauchyLogLikelihood(pints.ProblemLogLikelihood):
             - np.sum(np.log(1 + (error / sigma)**2), axis=0)
         )
 
+    def evaluateS1(self, x):
+        """ See :meth:`LogPDF.evaluateS1()`. """
+        n = self._n
+        m = self._no
+        sigma = np.asarray(x[-m:])
+
+        # Evaluate, and get residuals
+        y, dy = self._evaluate_problemS1(x[:-m])
+        dy = dy.reshape(self._nt, self._no, self._n_parameters - m)
+        r = self._values - y
+        r2 = r**2
+
+        # Calculate log-likelihood
+        L = np.sum(
+            - self._n_log_pi
+            - n * np.log(sigma)
+            - np.sum(np.log(1 + r2 / sigma**2), axis=0)
+        )
+
+        # Derivatives wrt the model parameters and sigma
+        w = 1 / (sigma**2 + r2)
+        dL = np.sum((2 * r * w).T * dy.T, axis=(1, 2))
+        dsigma = -n / sigma + 2 / sigma * np.sum(r2 * w, axis=0)
+
+        return L, np.concatenate((dL, dsigma))
+
 
 class GaussianKnownSigmaLogLikelihood(pints.ProblemLogLikelihood):
     """
@@ -386,13 +524,29 @@ class GaussianKnownSigmaLogLikelihood(pints.ProblemLogLikelihood):
         self._isigma2 = sigma**-2
 
     def __call__(self, x):
-        error = self._values - self._problem.evaluate(x)
+        error = self._values - self._evaluate_problem(x)
         return np.sum(self._offset + self._multip * np.sum(error**2, axis=0))
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = np.asarray(xs, dtype=float)
+        return self.evaluate_outputs(xs, self._problem.evaluate_batch(xs))
+
+    def evaluate_outputs(self, xs, ys):
+        """
+        Evaluates this log-likelihood for ``n`` points ``xs``, using the
+        precomputed simulation results ``ys`` (for example as returned by
+        :meth:`MultiOutputProblem.evaluate_batch()` with shape
+        ``(n, n_times, n_outputs)``), and returns the results as a NumPy array
+        of shape ``(n, )``.
+        """
+        sse = _batch_sum_of_squares(self._values, ys)
+        return np.sum(self._offset + self._multip * sse, axis=1)
+
     def evaluateS1(self, x):
         """ See :meth:`LogPDF.evaluateS1()`. """
         # Evaluate, and get residuals
-        y, dy = self._problem.evaluateS1(x)
+        y, dy = self._evaluate_problemS1(x)
 
         # Reshape dy, in case we're working with a single-output problem
         dy = dy.reshape(self._nt, self._no, self._np)
@@ -471,16 +625,37 @@ class GaussianLogLikelihood(pints.ProblemLogLikelihood):
 
     def __call__(self, x):
         sigma = np.asarray(x[-self._no:])
-        error = self._values - self._problem.evaluate(x[:-self._no])
+        error = self._values - self._evaluate_problem(x[:-self._no])
         return np.sum(- self._logn - self._nt * np.log(sigma)
                       - np.sum(error**2, axis=0) / (2 * sigma**2))
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = np.asarray(xs, dtype=float).reshape((-1, self._n_parameters))
+        return self.evaluate_outputs(
+            xs, self._problem.evaluate_batch(xs[:, :-self._no]))
+
+    def evaluate_outputs(self, xs, ys):
+        """
+        Evaluates this log-likelihood for ``n`` points ``xs``, using the
+        precomputed simulation results ``ys`` for the model parameters in
+        ``xs`` (for example as returned by
+        :meth:`MultiOutputProblem.evaluate_batch()` with shape
+        ``(n, n_times, n_outputs)``), and returns the results as a NumPy array
+        of shape ``(n, )``.
+        """
+        xs = np.asarray(xs, dtype=float).reshape((-1, self._n_parameters))
+        sigma = xs[:, -self._no:]
+        sse = _batch_sum_of_squares(self._values, ys)
+        return np.sum(- self._logn - self._nt * np.log(sigma)
+                      - sse / (2 * sigma**2), axis=1)
+
     def evaluateS1(self, x):
         """ See :meth:`LogPDF.evaluateS1()`. """
         sigma = np.asarray(x[-self._no:])
 
         # Evaluate, and get residuals
-        y, dy = self._problem.evaluateS1(x[:-self._no])
+        y, dy = self._evaluate_problemS1(x[:-self._no])
 
         # Reshape dy, in case we're working with a single-output problem
         dy = dy.reshape(self._nt, self._no, self._n_parameters - self._no)
@@ -488,15 +663,17 @@ class GaussianLogLikelihood(pints.ProblemLogLikelihood):
         # Note: Must be (data - simulation), sign now matters!
         r = self._values - y
 
-        # Calculate log-likelihood
-        L = self.__call__(x)
+        # Calculate log-likelihood, reusing the simulation from above
+        r2 = np.sum(r**2, axis=0)
+        L = np.sum(- self._logn - self._nt * np.log(sigma)
+                   - r2 / (2 * sigma**2))
 
         # Calculate derivatives in the model parameters
         dL = np.sum(
             (sigma**(-2.0) * np.sum((r.T * dy.T).T, axis=0).T).T, axis=0)
 
         # Calculate derivative wrt sigma
-        dsigma = -self._nt / sigma + sigma**(-3.0) * np.sum(r**2, axis=0)
+        dsigma = -self._nt / sigma + sigma**(-3.0) * r2
         dL = np.concatenate((dL, np.array(list(dsigma))))
 
         # Return
@@ -553,6 +730,10 @@ class ScaledLogLikelihood(pints.ProblemLogLikelihood):
     def __call__(self, x):
         return self._f * self._log_likelihood(x)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        return self._f * np.asarray(self._log_likelihood.evaluate_batch(xs))
+
     def evaluateS1(self, x):
         """
         See :meth:`LogPDF.evaluateS1()`.
@@ -563,6 +744,14 @@ class ScaledLogLikelihood(pints.ProblemLogLikelihood):
         a, b = self._log_likelihood.evaluateS1(x)
         return self._f * a, self._f * np.asarray(b)
 
+    def model_cache_size(self):
+        """ See :meth:`ProblemLogLikelihood.model_cache_size()`. """
+        return self._log_likelihood.model_cache_size()
+
+    def set_model_cache_size(self, n=1):
+        """ See :meth:`ProblemLogLikelihood.set_model_cache_size()`. """
+        self._log_likelihood.set_model_cache_size(n)
+
 
 class StudentTLogLikelihood(pints.ProblemLogLikelihood):
     """
@@ -615,7 +804,7 @@ class StudentTLogLikelihood(pints.ProblemLogLikelihood):
 
         # problem parameters
         problem_parameters = x[:-m]
-        error = self._values - self._problem.evaluate(problem_parameters)
+        error = self._values - self._evaluate_problem(problem_parameters)
 
         # Distribution parameters
         parameters = x[-m:]
@@ -630,6 +819,46 @@ class StudentTLogLikelihood(pints.ProblemLogLikelihood):
             - 0.5 * (1 + nu) * np.sum(np.log(nu + (error / sigma)**2), axis=0)
         )
 
+    def evaluateS1(self, x):
+        """ See :meth:`LogPDF.evaluateS1()`. """
+        n = self._n
+        m = 2 * self._no
+        parameters = np.asarray(x[-m:])
+        nu = parameters[0::2]
+        sigma = parameters[1::2]
+
+        # Evaluate, and get residuals
+        y, dy = self._evaluate_problemS1(x[:-m])
+        dy = dy.reshape(self._nt, self._no, self._n_parameters - m)
+        r = self._values - y
+        r2 = r**2
+
+        # Calculate log-likelihood
+        log_terms = np.sum(np.log(nu + r2 / sigma**2), axis=0)
+        L = np.sum(
+            + 0.5 * n * nu * np.log(nu)
+            - n * np.log(sigma)
+            - n * np.log(scipy.special.beta(0.5 * nu, 0.5))
+            - 0.5 * (1 + nu) * log_terms
+        )
+
+        # Derivatives wrt the model parameters
+        w = 1 / (nu * sigma**2 + r2)
+        dL = np.sum(((1 + nu) * r * w).T * dy.T, axis=(1, 2))
+
+        # Derivatives wrt nu and sigma
+        dnu = (
+            0.5 * n * (np.log(nu) + 1)
+            - 0.5 * n * (scipy.special.digamma(0.5 * nu)
+                         - scipy.special.digamma(0.5 * nu + 0.5))
+            - 0.5 * log_terms
+            - 0.5 * (1 + nu) * sigma**2 * np.sum(w, axis=0)
+        )
+        dsigma = -n / sigma + (1 + nu) / sigma * np.sum(r2 * w, axis=0)
+        dnoise = np.vstack((dnu, dsigma)).T.reshape(m)
+
+        return L, np.concatenate((dL, dnoise))
+
 
 class UnknownNoiseLogLikelihood(GaussianLogLikelihood):
     """
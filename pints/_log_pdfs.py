@@ -9,8 +9,12 @@
 from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
 
+import collections
+import threading
 import numpy as np
 
+from ._util import _array_key
+
 
 class LogPDF(object):
     """
@@ -25,6 +29,21 @@ class LogPDF(object):
     def __call__(self, x):
         raise NotImplementedError
 
+    def evaluate_batch(self, xs):
+        """
+        Evaluates this LogPDF for every point in ``xs``, and returns the
+        results as a NumPy array of shape ``(n, )``.
+
+        The argument ``xs`` should be a sequence of ``n`` points, for example
+        a NumPy array of shape ``(n, n_parameters)``.
+
+        The default implementation evaluates this LogPDF once for every point.
+        LogPDFs that can evaluate several points at once (for example using
+        NumPy broadcasting) can override it to provide a faster
+        implementation, which will be used by :class:`pints.BatchEvaluator`.
+        """
+        return np.array([self(x) for x in xs], dtype=float)
+
     def evaluateS1(self, x):
         """
         Evaluates this LogPDF, and returns the result plus the partial
@@ -40,6 +59,24 @@ class LogPDF(object):
         """
         raise NotImplementedError
 
+    def evaluateS1_batch(self, xs):
+        """
+        Evaluates this LogPDF and its partial derivatives for every point in
+        ``xs``, and returns a tuple ``(L, L')`` where ``L`` is a NumPy array of
+        shape ``(n, )`` and ``L'`` has shape ``(n, n_parameters)``.
+
+        The default implementation calls :meth:`evaluateS1()` once for every
+        point, and so is only available if that method is implemented. LogPDFs
+        that can evaluate several points at once can override it to provide a
+        faster implementation.
+        """
+        xs = np.asarray(xs, dtype=float).reshape((-1, self.n_parameters()))
+        values = np.zeros(len(xs))
+        derivatives = np.zeros(xs.shape)
+        for i, x in enumerate(xs):
+            values[i], derivatives[i] = self.evaluateS1(x)
+        return values, derivatives
+
     def n_parameters(self):
         """
         Returns the dimension of the space this :class:`LogPDF` is defined
@@ -79,6 +116,33 @@ class LogPrior(LogPDF):
         """
         raise NotImplementedError
 
+    def convert_from_unit_cube(self, u):
+        """
+        Converts points ``u`` drawn uniformly from the unit cube ``[0, 1]^d``
+        into points distributed according to this prior, and returns them as
+        a numpy array of shape ``(n, d)``.
+
+        The argument ``u`` should be a sequence of ``n`` points, for example a
+        numpy array with shape ``(n, d)``. For priors that are a product of
+        independent 1-dimensional distributions, each coordinate is converted
+        using the inverse of its cumulative distribution function.
+
+        Note: This method is optional, in the sense that only a subset of
+        inference methods require it.
+        """
+        raise NotImplementedError
+
+    def convert_to_unit_cube(self, x):
+        """
+        Converts points ``x`` in parameter space into points in the unit cube,
+        performing the inverse of :meth:`convert_from_unit_cube()`, and returns
+        them as a numpy array of shape ``(n, d)``.
+
+        Note: This method is optional, in the sense that only a subset of
+        inference methods require it.
+        """
+        raise NotImplementedError
+
 
 class ProblemLogLikelihood(LogPDF):
     """
@@ -91,6 +155,14 @@ class ProblemLogLikelihood(LogPDF):
     ``problem``
         The time-series problem this log-likelihood is defined for.
 
+    Many log-likelihoods add parameters (for example a noise level ``sigma``)
+    that don't affect the problem's simulated output. To avoid re-running
+    simulations when only these parameters change, log-likelihoods can keep a
+    small cache of recent simulation results, keyed on the exact values of
+    the model parameters. This cache is disabled by default, and can be
+    enabled with :meth:`set_model_cache_size()` if the problem's model is
+    deterministic.
+
     *Extends:* :class:`LogPDF`
     """
     def __init__(self, problem):
@@ -101,10 +173,116 @@ class ProblemLogLikelihood(LogPDF):
         self._times = problem.times()
         self._n_parameters = problem.n_parameters()
 
+        # Recent simulation results, ordered from least to most recently used
+        self._model_cache = collections.OrderedDict()
+        self._model_cache_lock = threading.Lock()
+        self._model_cache_size = 0
+
+    def __getstate__(self):
+        # Don't send cached simulation results to other processes
+        state = self.__dict__.copy()
+        if '_model_cache' in state:
+            state['_model_cache'] = collections.OrderedDict()
+            del state['_model_cache_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if '_model_cache' in state:
+            self._model_cache_lock = threading.Lock()
+
+    def _evaluate_problem(self, parameters):
+        """
+        Returns the result of ``self._problem.evaluate(parameters)``, using a
+        cached result if the same ``parameters`` were used recently.
+        """
+        if self._model_cache_size < 1:
+            return self._problem.evaluate(parameters)
+
+        # Results from evaluateS1() can also be used
+        key = _array_key(parameters)
+        y = self._model_cache_get(key)
+        if y is None:
+            y = self._model_cache_get(b'S1' + key)
+            if y is not None:
+                return y[0]
+            y = np.asarray(self._problem.evaluate(parameters))
+            y.setflags(write=False)
+            self._model_cache_set(key, y)
+        return y
+
+    def _evaluate_problemS1(self, parameters):
+        """
+        Returns the result of ``self._problem.evaluateS1(parameters)``, using
+        a cached result if the same ``parameters`` were used recently.
+        """
+        if self._model_cache_size < 1:
+            return self._problem.evaluateS1(parameters)
+
+        key = b'S1' + _array_key(parameters)
+        y = self._model_cache_get(key)
+        if y is None:
+            y, dy = self._problem.evaluateS1(parameters)
+            y, dy = np.asarray(y), np.asarray(dy)
+            y.setflags(write=False)
+            dy.setflags(write=False)
+            y = (y, dy)
+            self._model_cache_set(key, y)
+        return y
+
+    def _model_cache_get(self, key):
+        """
+        Returns the cached simulation result for ``key``, or ``None`` if not
+        found.
+        """
+        with self._model_cache_lock:
+            y = self._model_cache.pop(key, None)
+            if y is not None:
+                self._model_cache[key] = y
+        return y
+
+    def _model_cache_set(self, key, y):
+        """ Stores a simulation result, discarding old ones if needed. """
+        with self._model_cache_lock:
+            if self._model_cache_size < 1:
+                return
+            while len(self._model_cache) >= self._model_cache_size:
+                self._model_cache.popitem(last=False)
+            self._model_cache[key] = y
+
+    def model_cache_size(self):
+        """
+        Returns the maximum number of simulation results kept in memory (see
+        :meth:`set_model_cache_size()`).
+        """
+        return self._model_cache_size
+
     def n_parameters(self):
         """ See :meth:`LogPDF.n_parameters()`. """
         return self._n_parameters
 
+    def set_model_cache_size(self, n=1):
+        """
+        Sets the maximum number of recent simulation results to keep in
+        memory, so that evaluating this log-likelihood at points that differ
+        only in parameters that don't affect the model (e.g. noise parameters)
+        does not require new simulations.
+
+        Caching is disabled by default (``n=0``). A size of 1 avoids new
+        simulations when successive evaluations use the same model
+        parameters. Caching should only be enabled for deterministic models.
+
+        The cache can safely be used by several threads at once (for example
+        by a :class:`ThreadedEvaluator`).
+        """
+        n = int(n)
+        if n < 0:
+            raise ValueError('Model cache size cannot be negative.')
+        with self._model_cache_lock:
+            self._model_cache_size = n
+            while len(self._model_cache) > n:
+                self._model_cache.popitem(last=False)
+
 
 class LogPosterior(LogPDF):
     """
@@ -156,6 +334,46 @@ class LogPosterior(LogPDF):
             return self._minf
         return log_prior + self._log_likelihood(x)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        return self.evaluate_components_batch(xs)[0]
+
+    def evaluate_components(self, x):
+        """
+        Evaluates this log-posterior, and returns a tuple
+        ``(log_posterior, log_likelihood, log_prior)``.
+
+        As with ordinary evaluation, the log-likelihood is only evaluated if
+        the log-prior is not ``-inf``. If it is, the returned log-likelihood
+        is ``nan``.
+        """
+        log_prior = self._log_prior(x)
+        if log_prior == self._minf:
+            return self._minf, float('nan'), self._minf
+        log_likelihood = self._log_likelihood(x)
+        return log_prior + log_likelihood, log_likelihood, log_prior
+
+    def evaluate_components_batch(self, xs):
+        """
+        Evaluates this log-posterior for every point in ``xs`` (see
+        :meth:`LogPDF.evaluate_batch()`), and returns a tuple
+        ``(log_posteriors, log_likelihoods, log_priors)`` of NumPy arrays with
+        shape ``(n, )``.
+
+        The log-likelihood is only evaluated at points where the log-prior is
+        not ``-inf``, and is returned as ``nan`` everywhere else.
+        """
+        xs = np.asarray(xs)
+        log_priors = np.array(self._log_prior.evaluate_batch(xs), dtype=float)
+        log_likelihoods = np.empty(log_priors.shape)
+        log_likelihoods.fill(float('nan'))
+        values = np.array(log_priors)
+        ok = log_priors != self._minf
+        if np.any(ok):
+            log_likelihoods[ok] = self._log_likelihood.evaluate_batch(xs[ok])
+            values[ok] += log_likelihoods[ok]
+        return values, log_likelihoods, log_priors
+
     def evaluateS1(self, x):
         """
         Evaluates this LogPDF, and returns the result plus the partial
@@ -164,14 +382,27 @@ class LogPosterior(LogPDF):
         The returned data has the shape ``(L, L')`` where ``L`` is a scalar
         value and ``L'`` is a sequence of length ``n_parameters``.
 
+        As with ordinary evaluation, the log-likelihood is only evaluated if
+        the log-prior is not ``-inf``. If it is, the returned derivatives are
+        those of the log-prior.
+
         *This method only works if the underlying :class:`LogPDF` and
         :class:`LogPrior` implement the optional method
         :meth:`LogPDF.evaluateS1()`!*
         """
-        #TODO: Is there an optimisation to be made here?
+        return self._evaluateS1_components(x)[:2]
+
+    def _evaluateS1_components(self, x):
+        """
+        Returns a tuple ``(L, L', log_likelihood, log_prior)``, where ``L``
+        and ``L'`` are as returned by :meth:`evaluateS1()`, and the
+        log-likelihood is ``nan`` if it wasn't evaluated.
+        """
         a, da = self._log_prior.evaluateS1(x)
+        if a == self._minf:
+            return self._minf, np.asarray(da), float('nan'), self._minf
         b, db = self._log_likelihood.evaluateS1(x)
-        return a + b, da + db
+        return a + b, da + db, b, a
 
     def log_likelihood(self):
         """ Returns the :class:`LogLikelihood` used by this posterior. """
@@ -242,6 +473,13 @@ class SumOfIndependentLogPDFs(LogPDF):
             total += e(x)
         return total
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        total = np.zeros(len(xs))
+        for e in self._log_likelihoods:
+            total += e.evaluate_batch(xs)
+        return total
+
     def evaluateS1(self, x):
         """
         See :meth:`LogPDF.evaluateS1()`.
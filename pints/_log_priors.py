@@ -11,6 +11,7 @@ from __future__ import print_function, unicode_literals
 import pints
 import numpy as np
 import scipy
+import scipy.linalg
 import scipy.special
 import scipy.stats
 
@@ -58,6 +59,28 @@ class BetaLogPrior(pints.LogPrior):
                                        x[0]) + scipy.special.xlog1py(
                 self._b - 1.0, -x[0]) - self._log_beta
 
+    def convert_from_unit_cube(self, u):
+        """ See :meth:`LogPrior.convert_from_unit_cube()`. """
+        x = scipy.stats.beta.ppf(_batch_1d(u), self._a, self._b)
+        return x.reshape((-1, 1))
+
+    def convert_to_unit_cube(self, x):
+        """ See :meth:`LogPrior.convert_to_unit_cube()`. """
+        u = scipy.stats.beta.cdf(_batch_1d(x), self._a, self._b)
+        return u.reshape((-1, 1))
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = _batch_1d(xs)
+        output = np.empty(len(x))
+        out = (x < 0.0) | (x > 1.0)
+        output[out] = -np.inf
+        x = x[~out]
+        output[~out] = scipy.special.xlogy(
+            self._a - 1.0, x) + scipy.special.xlog1py(
+            self._b - 1.0, -x) - self._log_beta
+        return output
+
     def evaluateS1(self, x):
         """ See :meth:`LogPDF.evaluateS1()`. """
         value = self(x)
@@ -76,6 +99,21 @@ class BetaLogPrior(pints.LogPrior):
             return value, np.asarray([np.divide(self._a - 1., _x) - np.divide(
                 self._b - 1., 1. - _x)])
 
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        x = _batch_1d(xs)
+        values = self.evaluate_batch(x)
+
+        # Account for pathological edges
+        x = np.where(x == 0.0, np.nextafter(0.0, 1.0), x)
+        x = np.where(x == 1.0, np.nextafter(1.0, 0.0), x)
+
+        dx = np.zeros(len(x))
+        ok = ~((x < 0.0) | (x > 1.0))
+        dx[ok] = np.divide(self._a - 1., x[ok]) - np.divide(
+            self._b - 1., 1. - x[ok])
+        return values, dx.reshape((-1, 1))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._a / (self._a + self._b)
@@ -126,11 +164,41 @@ class CauchyLogPrior(pints.LogPrior):
         # Cache constants
         self._pi_sig = np.pi * self._scale
         self._pi_on_sig = np.pi / self._scale
+        self._sig_sq = self._scale * self._scale
 
     def __call__(self, x):
         _x_sq = (x[0] - self._location) * (x[0] - self._location)
         return -np.log(self._pi_sig + self._pi_on_sig * _x_sq)
 
+    def convert_from_unit_cube(self, u):
+        """ See :meth:`LogPrior.convert_from_unit_cube()`. """
+        x = scipy.stats.cauchy.ppf(
+            _batch_1d(u), self._location, self._scale)
+        return x.reshape((-1, 1))
+
+    def convert_to_unit_cube(self, x):
+        """ See :meth:`LogPrior.convert_to_unit_cube()`. """
+        u = scipy.stats.cauchy.cdf(
+            _batch_1d(x), self._location, self._scale)
+        return u.reshape((-1, 1))
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = _batch_1d(xs) - self._location
+        return -np.log(self._pi_sig + self._pi_on_sig * (x * x))
+
+    def evaluateS1(self, x):
+        """ See :meth:`LogPDF.evaluateS1()`. """
+        _x = x[0] - self._location
+        return self(x), np.asarray([-2 * _x / (self._sig_sq + _x * _x)])
+
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        x = _batch_1d(xs)
+        offset = x - self._location
+        dx = -2 * offset / (self._sig_sq + offset * offset)
+        return self.evaluate_batch(x), dx.reshape((-1, 1))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return np.nan
@@ -184,6 +252,56 @@ class ComposedLogPrior(pints.LogPrior):
             output += prior(x[lo:hi])
         return output
 
+    def convert_from_unit_cube(self, u):
+        """
+        See :meth:`LogPrior.convert_from_unit_cube()`.
+
+        *This method only works if the underlying :class:`LogPrior` classes all
+        implement the optional method
+        :meth:`LogPrior.convert_from_unit_cube().`.*
+        """
+        u = np.asarray(u, dtype=float).reshape((-1, self._n_parameters))
+        output = np.zeros(u.shape)
+        lo = hi = 0
+        for prior in self._priors:
+            lo = hi
+            hi += prior.n_parameters()
+            output[:, lo:hi] = prior.convert_from_unit_cube(u[:, lo:hi])
+        return output
+
+    def convert_to_unit_cube(self, x):
+        """
+        See :meth:`LogPrior.convert_to_unit_cube()`.
+
+        *This method only works if the underlying :class:`LogPrior` classes all
+        implement the optional method
+        :meth:`LogPrior.convert_to_unit_cube().`.*
+        """
+        x = np.asarray(x, dtype=float).reshape((-1, self._n_parameters))
+        output = np.zeros(x.shape)
+        lo = hi = 0
+        for prior in self._priors:
+            lo = hi
+            hi += prior.n_parameters()
+            output[:, lo:hi] = prior.convert_to_unit_cube(x[:, lo:hi])
+        return output
+
+    def evaluate_batch(self, xs):
+        """
+        See :meth:`LogPDF.evaluate_batch()`.
+
+        Each sub-prior evaluates its own block of parameters for all points at
+        once, using its :meth:`evaluate_batch()` method.
+        """
+        xs = np.asarray(xs, dtype=float).reshape((-1, self._n_parameters))
+        output = np.zeros(len(xs))
+        lo = hi = 0
+        for prior in self._priors:
+            lo = hi
+            hi += prior.n_parameters()
+            output += prior.evaluate_batch(xs[:, lo:hi])
+        return output
+
     def evaluateS1(self, x):
         """
         See :meth:`LogPDF.evaluateS1()`.
@@ -202,6 +320,25 @@ class ComposedLogPrior(pints.LogPrior):
             doutput[lo:hi] = np.asarray(dp)
         return output, doutput
 
+    def evaluateS1_batch(self, xs):
+        """
+        See :meth:`LogPDF.evaluateS1_batch()`.
+
+        *This method only works if the underlying :class:`LogPrior` classes all
+        implement the optional method :class:`LogPDF.evaluateS1().`.*
+        """
+        xs = np.asarray(xs, dtype=float).reshape((-1, self._n_parameters))
+        output = np.zeros(len(xs))
+        doutput = np.zeros(xs.shape)
+        lo = hi = 0
+        for prior in self._priors:
+            lo = hi
+            hi += prior.n_parameters()
+            p, dp = prior.evaluateS1_batch(xs[:, lo:hi])
+            output += p
+            doutput[:, lo:hi] = dp
+        return output, doutput
+
     def n_parameters(self):
         """ See :meth:`LogPrior.n_parameters()`. """
         return self._n_parameters
@@ -258,6 +395,21 @@ class ExponentialLogPrior(pints.LogPrior):
         else:
             return self._log_scale - self._rate * x[0]
 
+    def convert_from_unit_cube(self, u):
+        """ See :meth:`LogPrior.convert_from_unit_cube()`. """
+        x = scipy.stats.expon.ppf(_batch_1d(u), scale=1. / self._rate)
+        return x.reshape((-1, 1))
+
+    def convert_to_unit_cube(self, x):
+        """ See :meth:`LogPrior.convert_to_unit_cube()`. """
+        u = scipy.stats.expon.cdf(_batch_1d(x), scale=1. / self._rate)
+        return u.reshape((-1, 1))
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = _batch_1d(xs)
+        return np.where(x < 0.0, -np.inf, self._log_scale - self._rate * x)
+
     def evaluateS1(self, x):
         """ See :meth:`LogPDF.evaluateS1()`. """
         value = self(x)
@@ -267,6 +419,12 @@ class ExponentialLogPrior(pints.LogPrior):
         else:
             return value, np.asarray([-self._rate])
 
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        x = _batch_1d(xs)
+        dx = np.where(x < 0.0, 0., -self._rate)
+        return self.evaluate_batch(x), dx.reshape((-1, 1))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return 1 / self._rate
@@ -324,6 +482,27 @@ class GammaLogPrior(pints.LogPrior):
             return self._constant + scipy.special.xlogy(self._a - 1.,
                                                         x[0]) - self._b * x[0]
 
+    def convert_from_unit_cube(self, u):
+        """ See :meth:`LogPrior.convert_from_unit_cube()`. """
+        x = scipy.stats.gamma.ppf(_batch_1d(u), self._a, scale=1. / self._b)
+        return x.reshape((-1, 1))
+
+    def convert_to_unit_cube(self, x):
+        """ See :meth:`LogPrior.convert_to_unit_cube()`. """
+        u = scipy.stats.gamma.cdf(_batch_1d(x), self._a, scale=1. / self._b)
+        return u.reshape((-1, 1))
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = _batch_1d(xs)
+        output = np.empty(len(x))
+        out = x < 0.0
+        output[out] = -np.inf
+        x = x[~out]
+        output[~out] = self._constant + scipy.special.xlogy(
+            self._a - 1., x) - self._b * x
+        return output
+
     def evaluateS1(self, x):
         """ See :meth:`LogPDF.evaluateS1()`. """
         value = self(x)
@@ -340,6 +519,19 @@ class GammaLogPrior(pints.LogPrior):
             # Use np.divide here to better handle possible v small denominators
             return value, np.asarray([np.divide(self._a - 1., _x) - self._b])
 
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        x = _batch_1d(xs)
+        values = self.evaluate_batch(x)
+
+        # Account for pathological edge
+        x = np.where(x == 0.0, np.nextafter(0.0, 1.0), x)
+
+        dx = np.zeros(len(x))
+        ok = ~(x < 0.0)
+        dx[ok] = np.divide(self._a - 1., x[ok]) - self._b
+        return values, dx.reshape((-1, 1))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._a / self._b
@@ -388,10 +580,31 @@ class GaussianLogPrior(pints.LogPrior):
     def __call__(self, x):
         return self._offset - self._factor * (x[0] - self._mean)**2
 
+    def convert_from_unit_cube(self, u):
+        """ See :meth:`LogPrior.convert_from_unit_cube()`. """
+        x = scipy.stats.norm.ppf(_batch_1d(u), self._mean, self._sd)
+        return x.reshape((-1, 1))
+
+    def convert_to_unit_cube(self, x):
+        """ See :meth:`LogPrior.convert_to_unit_cube()`. """
+        u = scipy.stats.norm.cdf(_batch_1d(x), self._mean, self._sd)
+        return u.reshape((-1, 1))
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        return self._offset - self._factor * (_batch_1d(xs) - self._mean)**2
+
     def evaluateS1(self, x):
         """ See :meth:`LogPDF.evaluateS1()`. """
         return self(x), self._factor2 * (self._mean - np.asarray(x))
 
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        x = _batch_1d(xs)
+        return (
+            self.evaluate_batch(x),
+            (self._factor2 * (self._mean - x)).reshape((-1, 1)))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._mean
@@ -452,6 +665,43 @@ class HalfCauchyLogPrior(pints.LogPrior):
         else:
             return -np.inf
 
+    def convert_from_unit_cube(self, u):
+        """ See :meth:`LogPrior.convert_from_unit_cube()`. """
+        # Map u onto the part of the Cauchy cdf where x >= 0
+        c0 = scipy.stats.cauchy.cdf(0, self._location, self._scale)
+        return scipy.stats.cauchy.ppf(
+            c0 + _batch_1d(u) * (1 - c0), self._location, self._scale
+        ).reshape((-1, 1))
+
+    def convert_to_unit_cube(self, x):
+        """ See :meth:`LogPrior.convert_to_unit_cube()`. """
+        c0 = scipy.stats.cauchy.cdf(0, self._location, self._scale)
+        c = scipy.stats.cauchy.cdf(_batch_1d(x), self._location, self._scale)
+        return np.maximum(0, (c - c0) / (1 - c0)).reshape((-1, 1))
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = _batch_1d(xs)
+        return np.where(
+            x > 0, self._norm_factor + self._cauchy.evaluate_batch(x), -np.inf)
+
+    def evaluateS1(self, x):
+        """ See :meth:`LogPDF.evaluateS1()`. """
+        if x[0] > 0:
+            value, dx = self._cauchy.evaluateS1(x)
+            return self._norm_factor + value, dx
+        else:
+            return -np.inf, np.asarray([0.])
+
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        x = _batch_1d(xs)
+        values, dx = self._cauchy.evaluateS1_batch(x)
+        inside = x > 0
+        values = np.where(inside, self._norm_factor + values, -np.inf)
+        dx[~inside] = 0
+        return values, dx
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return np.nan
@@ -512,6 +762,26 @@ class InverseGammaLogPrior(pints.LogPrior):
         else:
             return self._k - self._ap1 * np.log(_x) - np.divide(self._b, _x)
 
+    def convert_from_unit_cube(self, u):
+        """ See :meth:`LogPrior.convert_from_unit_cube()`. """
+        x = scipy.stats.invgamma.ppf(_batch_1d(u), self._a, scale=self._b)
+        return x.reshape((-1, 1))
+
+    def convert_to_unit_cube(self, x):
+        """ See :meth:`LogPrior.convert_to_unit_cube()`. """
+        u = scipy.stats.invgamma.cdf(_batch_1d(x), self._a, scale=self._b)
+        return u.reshape((-1, 1))
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = _batch_1d(xs)
+        output = np.empty(len(x))
+        out = x <= 0.0
+        output[out] = -np.inf
+        x = x[~out]
+        output[~out] = self._k - self._ap1 * np.log(x) - np.divide(self._b, x)
+        return output
+
     def evaluateS1(self, x):
         """ See :meth:`LogPDF.evaluateS1()`. """
         val = self(x)
@@ -524,6 +794,15 @@ class InverseGammaLogPrior(pints.LogPrior):
             return val, np.asarray(
                 [np.divide(self._b - self._ap1 * _x, _x * _x)])
 
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        x = _batch_1d(xs)
+        dx = np.zeros(len(x))
+        ok = ~(x < 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dx[ok] = np.divide(self._b - self._ap1 * x[ok], x[ok] * x[ok])
+        return self.evaluate_batch(x), dx.reshape((-1, 1))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._b / (self._a - 1.) if self._a > 1 else np.nan
@@ -588,6 +867,29 @@ class LogNormalLogPrior(pints.LogPrior):
             _shift = _lx - self._log_mean
             return self._offset - _lx - self._1on2sigsq * _shift * _shift
 
+    def convert_from_unit_cube(self, u):
+        """ See :meth:`LogPrior.convert_from_unit_cube()`. """
+        x = scipy.stats.lognorm.ppf(
+            _batch_1d(u), self._scale, scale=np.exp(self._log_mean))
+        return x.reshape((-1, 1))
+
+    def convert_to_unit_cube(self, x):
+        """ See :meth:`LogPrior.convert_to_unit_cube()`. """
+        u = scipy.stats.lognorm.cdf(
+            _batch_1d(x), self._scale, scale=np.exp(self._log_mean))
+        return u.reshape((-1, 1))
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = _batch_1d(xs)
+        output = np.empty(len(x))
+        out = x <= 0.0
+        output[out] = -np.inf
+        lx = np.log(x[~out])
+        shift = lx - self._log_mean
+        output[~out] = self._offset - lx - self._1on2sigsq * shift * shift
+        return output
+
     def evaluateS1(self, x):
         """ See :meth:`LogPDF.evaluateS1()`. """
         if x[0] < 0.0:
@@ -598,6 +900,16 @@ class LogNormalLogPrior(pints.LogPrior):
             return self(x), np.asarray(
                 [self._m1onsigsq * np.divide(self._sigsqmmu + _lx, _x)])
 
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        x = _batch_1d(xs)
+        dx = np.zeros(len(x))
+        ok = ~(x < 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dx[ok] = self._m1onsigsq * np.divide(
+                self._sigsqmmu + np.log(x[ok]), x[ok])
+        return self.evaluate_batch(x), dx.reshape((-1, 1))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return np.exp(self._log_mean + 0.5 * self._scale * self._scale)
@@ -650,10 +962,53 @@ class MultivariateGaussianLogPrior(pints.LogPrior):
         self._cov = cov
         self._n_parameters = mean.shape[0]
 
+        # Factorise the covariance matrix once, as cov = L L', and use the
+        # lower-triangular factor L for evaluation, derivatives, and sampling
+        try:
+            self._chol = np.linalg.cholesky(cov)
+        except np.linalg.LinAlgError:
+            raise ValueError('Given covariance must be positive definite.')
+
+        # Normalising constant: -d/2 log(2 pi) - 1/2 log(|cov|)
+        self._offset = -0.5 * self._n_parameters * np.log(2 * np.pi) \
+            - np.sum(np.log(np.diag(self._chol)))
+
     def __call__(self, x):
-        return np.log(
-            scipy.stats.multivariate_normal.pdf(
-                x, mean=self._mean, cov=self._cov))
+        return self.evaluate_batch([x])[0]
+
+    def convert_from_unit_cube(self, u):
+        """
+        See :meth:`LogPrior.convert_from_unit_cube()`.
+
+        Each coordinate of ``u`` is converted to an independent standard
+        normal variable ``z``, after which ``x = mean + L z``, where ``L`` is
+        the lower-triangular Cholesky factor of the covariance matrix.
+        """
+        u = np.asarray(u, dtype=float).reshape((-1, self._n_parameters))
+        return self._mean + scipy.stats.norm.ppf(u).dot(self._chol.T)
+
+    def convert_to_unit_cube(self, x):
+        """ See :meth:`LogPrior.convert_to_unit_cube()`. """
+        return scipy.stats.norm.cdf(self._whiten(x).T)
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        z = self._whiten(xs)
+        return self._offset - 0.5 * np.sum(z * z, axis=0)
+
+    def evaluateS1(self, x):
+        """ See :meth:`LogPDF.evaluateS1()`. """
+        values, derivatives = self.evaluateS1_batch([x])
+        return values[0], derivatives[0]
+
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        # With z = L^-1 (x - mean), the derivative is -cov^-1 (x - mean), which
+        # equals -L'^-1 z
+        z = self._whiten(xs)
+        dz = scipy.linalg.solve_triangular(
+            self._chol, z, lower=True, trans='T', check_finite=False)
+        return self._offset - 0.5 * np.sum(z * z, axis=0), -dz.T
 
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
@@ -665,9 +1020,22 @@ class MultivariateGaussianLogPrior(pints.LogPrior):
 
     def sample(self, n=1):
         """ See :meth:`LogPrior.call()`. """
-        # Note: size=n returns shape (n, d)
-        return np.random.multivariate_normal(
-            self._mean, self._cov, size=n)
+        # If z ~ N(0, I) then mean + L z ~ N(mean, L L')
+        z = np.random.normal(size=(n, self._n_parameters))
+        return self._mean + z.dot(self._chol.T)
+
+    def _whiten(self, xs):
+        """
+        Returns ``L^-1 (x - mean)`` for every point ``x`` in ``xs``, as an
+        array of shape ``(n_parameters, n)``.
+        """
+        xs = np.asarray(xs, dtype=float)
+        if xs.ndim > 2 or xs.shape[-1:] != (self._n_parameters, ):
+            raise ValueError(
+                'Input must have length ' + str(self._n_parameters) + '.')
+        return scipy.linalg.solve_triangular(
+            self._chol, (xs - self._mean).reshape(
+                (-1, self._n_parameters)).T, lower=True, check_finite=False)
 
 
 class NormalLogPrior(GaussianLogPrior):
@@ -746,12 +1114,38 @@ class StudentTLogPrior(pints.LogPrior):
         return self._samp_const + self._first * (self._log_df - np.log(
             self._df + self._1_sig_sq * (x[0] - self._location) ** 2))
 
+    def convert_from_unit_cube(self, u):
+        """ See :meth:`LogPrior.convert_from_unit_cube()`. """
+        x = scipy.stats.t.ppf(
+            _batch_1d(u), self._df, self._location, self._scale)
+        return x.reshape((-1, 1))
+
+    def convert_to_unit_cube(self, x):
+        """ See :meth:`LogPrior.convert_to_unit_cube()`. """
+        u = scipy.stats.t.cdf(
+            _batch_1d(x), self._df, self._location, self._scale)
+        return u.reshape((-1, 1))
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        x = _batch_1d(xs)
+        return self._samp_const + self._first * (self._log_df - np.log(
+            self._df + self._1_sig_sq * (x - self._location) ** 2))
+
     def evaluateS1(self, x):
         """ See :meth:`LogPDF.evaluateS1()`. """
         offset = x[0] - self._location
         return self(x), np.asarray([offset * self._deriv_const / (
             self._df + offset * offset * self._1_sig_sq)])
 
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        x = _batch_1d(xs)
+        offset = x - self._location
+        dx = offset * self._deriv_const / (
+            self._df + offset * offset * self._1_sig_sq)
+        return self.evaluate_batch(x), dx.reshape((-1, 1))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         return self._location if self._df > 1. else np.nan
@@ -823,6 +1217,41 @@ class UniformLogPrior(pints.LogPrior):
     def __call__(self, x):
         return self._value if self._boundaries.check(x) else -np.inf
 
+    def convert_from_unit_cube(self, u):
+        """
+        See :meth:`LogPrior.convert_from_unit_cube()`.
+
+        *This method is only available for priors defined on
+        :class:`RectangularBoundaries`.*
+        """
+        if not isinstance(self._boundaries, pints.RectangularBoundaries):
+            raise NotImplementedError
+        u = np.asarray(u, dtype=float).reshape((-1, self._n_parameters))
+        return self._boundaries.lower() + u * self._boundaries.range()
+
+    def convert_to_unit_cube(self, x):
+        """
+        See :meth:`LogPrior.convert_to_unit_cube()`.
+
+        *This method is only available for priors defined on
+        :class:`RectangularBoundaries`.*
+        """
+        if not isinstance(self._boundaries, pints.RectangularBoundaries):
+            raise NotImplementedError
+        x = np.asarray(x, dtype=float).reshape((-1, self._n_parameters))
+        return (x - self._boundaries.lower()) / self._boundaries.range()
+
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = np.asarray(xs, dtype=float).reshape((-1, self._n_parameters))
+        if isinstance(self._boundaries, pints.RectangularBoundaries):
+            inside = np.all((xs >= self._boundaries.lower())
+                            & (xs < self._boundaries.upper()), axis=1)
+        else:
+            inside = np.array(
+                [self._boundaries.check(x) for x in xs], dtype=bool)
+        return np.where(inside, self._value, -np.inf)
+
     def evaluateS1(self, x):
         """ See :meth:`LogPrior.evaluateS1()`. """
         # Ignoring points on the boundaries (i.e. on the surface of the
@@ -830,6 +1259,11 @@ class UniformLogPrior(pints.LogPrior):
         # much...
         return self(x), np.zeros(self._n_parameters)
 
+    def evaluateS1_batch(self, xs):
+        """ See :meth:`LogPDF.evaluateS1_batch()`. """
+        values = self.evaluate_batch(xs)
+        return values, np.zeros((len(values), self._n_parameters))
+
     def mean(self):
         """ See :meth:`LogPrior.mean()`. """
         if isinstance(self._boundaries, pints.RectangularBoundaries):
@@ -844,3 +1278,11 @@ class UniformLogPrior(pints.LogPrior):
     def sample(self, n=1):
         """ See :meth:`LogPrior.sample()`. """
         return self._boundaries.sample(n)
+
+
+def _batch_1d(xs):
+    """
+    Returns a batch of points ``xs`` for a 1-dimensional prior (e.g. an array
+    of shape ``(n, 1)``) as a 1d array of floats.
+    """
+    return np.asarray(xs, dtype=float).reshape((-1, ))
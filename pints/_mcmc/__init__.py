@@ -367,6 +367,9 @@ class MCMCController(object):
         # Parallelisation
         self._parallel = False
         self._n_workers = 1
+        self._threads = False
+        self._evaluator = None
+        self._auto_parallel = False
         self.set_parallel()
 
         #
@@ -431,11 +434,36 @@ class MCMCController(object):
         if self._needs_sensitivities:
             f = f.evaluateS1
 
+        # Writing evaluations of a log-posterior to disk? Then evaluate the
+        # log-likelihood and log-prior along with the log-posterior
+        components = bool(self._evaluation_files) and isinstance(
+            self._log_pdf, pints.LogPosterior)
+        batch = not self._needs_sensitivities and \
+            pints._evaluation._overrides_evaluate_batch(self._log_pdf)
+        if components:
+            rejected = pints._evaluation._rejected_value(f)
+            f = _LogPosteriorComponents(
+                self._log_pdf, self._needs_sensitivities)
+
         # Create evaluator object
-        if self._parallel:
+        if self._evaluator is not None:
+            # Re-use existing workers
+            n_workers = self._n_workers
+            evaluator = self._evaluator
+            evaluator.set_function(f)
+        elif self._parallel:
             # Use at most n_workers workers
             n_workers = min(self._n_workers, self._chains)
-            evaluator = pints.ParallelEvaluator(f, n_workers=n_workers)
+            if self._auto_parallel:
+                evaluator = pints.AutoParallelEvaluator(
+                    f, max_workers=n_workers)
+            elif self._threads:
+                evaluator = pints.ThreadedEvaluator(f, n_workers=n_workers)
+            else:
+                evaluator = pints.ParallelEvaluator(f, n_workers=n_workers)
+        elif batch:
+            # Evaluate all points from a single ask() in one call
+            evaluator = pints.BatchEvaluator(f)
         else:
             evaluator = pints.SequentialEvaluator(f)
 
@@ -458,18 +486,12 @@ class MCMCController(object):
         # Write evaluations to disk
         eval_loggers = []
         if self._evaluation_files:
-            # Bayesian inference on a log-posterior? Then separate out the
-            # prior so we can calculate the loglikelihood
-            prior = None
-            if isinstance(self._log_pdf, pints.LogPosterior):
-                prior = self._log_pdf.log_prior()
-
             # Set up loggers
             for filename in self._evaluation_files:
                 cl = pints.Logger()
                 cl.set_stream(None)
                 cl.set_filename(filename, True)
-                if prior:
+                if components:
                     # Logposterior in first column, to be consistent with the
                     # non-bayesian case
                     cl.add_float('logposterior')
@@ -481,6 +503,7 @@ class MCMCController(object):
 
             # Store last accepted logpdf, per chain
             current_logpdf = np.zeros(self._chains)
+            current_likelihood = np.zeros(self._chains)
             current_prior = np.zeros(self._chains)
 
         # Set up progress reporting
@@ -492,9 +515,13 @@ class MCMCController(object):
             if self._log_to_screen:
                 print('Using ' + str(self._samplers[0].name()))
                 print('Generating ' + str(self._chains) + ' chains.')
-                if self._parallel:
+                if self._auto_parallel:
+                    print('Choosing number of worker processes automatically'
+                          ' (up to ' + str(n_workers) + ').')
+                elif self._parallel:
                     print('Running in parallel with ' + str(n_workers) +
-                          ' worker processess.')
+                          (' worker threads.' if self._threads
+                           else ' worker processess.'))
                 else:
                     print('Running in sequential mode.')
                 if self._chain_files:
@@ -519,6 +546,7 @@ class MCMCController(object):
             logger.add_counter('Eval.', max_value=max_eval_guess)
             for sampler in self._samplers:
                 sampler._log_init(logger)
+            evaluator._log_init(logger)
             logger.add_time('Time m:s')
 
         # Create chains
@@ -546,6 +574,9 @@ class MCMCController(object):
 
             # Calculate logpdfs
             fxs = evaluator.evaluate(xs)
+            if components:
+                fxs, log_likelihoods, log_priors = _split_components(
+                    fxs, rejected)
 
             # Update evaluation count
             evaluations += len(fxs)
@@ -582,12 +613,14 @@ class MCMCController(object):
             if self._evaluation_files:
                 for k, eval_logger in enumerate(eval_loggers):
                     if np.all(xs[k] == samples[k]):
-                        current_logpdf[k] = fxs[k]
-                        if prior is not None:
-                            current_prior[k] = prior(xs[k])
+                        current_logpdf[k] = fxs[k][0] \
+                            if self._needs_sensitivities else fxs[k]
+                        if components:
+                            current_likelihood[k] = log_likelihoods[k]
+                            current_prior[k] = log_priors[k]
                     eval_logger.log(current_logpdf[k])
-                    if prior is not None:
-                        eval_logger.log(current_logpdf[k] - current_prior[k])
+                    if components:
+                        eval_logger.log(current_likelihood[k])
                         eval_logger.log(current_prior[k])
 
             # Show progress
@@ -596,6 +629,7 @@ class MCMCController(object):
                 logger.log(iteration, evaluations)
                 for sampler in self._samplers:
                     sampler._log_write(logger)
+                evaluator._log_write(logger)
                 logger.log(timer.time())
 
                 # Choose next logging point
@@ -626,6 +660,7 @@ class MCMCController(object):
             logger.log(iteration, evaluations)
             for sampler in self._samplers:
                 sampler._log_write(logger)
+            evaluator._log_write(logger)
             logger.log(timer.time())
             if self._log_to_screen:
                 print(halt_message)
@@ -787,7 +822,7 @@ class MCMCController(object):
                     'Maximum number of iterations cannot be negative.')
         self._max_iterations = iterations
 
-    def set_parallel(self, parallel=False):
+    def set_parallel(self, parallel=False, threads=False):
         """
         Enables/disables parallel evaluation.
 
@@ -796,17 +831,110 @@ class MCMCController(object):
         can be set explicitly by setting ``parallel`` to an integer greater
         than 0.
         Parallelisation can be disabled by setting ``parallel`` to ``0`` or
-        ``False``.
-        """
-        if parallel is True:
+        ``False``. Positions are then evaluated one at a time using a
+        :class:`pints.SequentialEvaluator`, unless the function provides its
+        own ``evaluate_batch()`` method, in which case all positions from a
+        single iteration are evaluated at once using a
+        :class:`pints.BatchEvaluator`.
+
+        If ``parallel='auto'``, a :class:`pints.AutoParallelEvaluator` is used
+        to choose between sequential and parallel evaluation (and the number
+        of worker processes, up to the detected cpu core count) based on the
+        measured time per evaluation and communication overhead. This choice
+        is updated if the time per evaluation changes during the run. In this
+        mode, ``threads`` is ignored.
+
+        If ``threads=True``, worker threads will be used instead of worker
+        processes (see :class:`pints.ThreadedEvaluator`). This can be faster
+        for functions that spend most of their time in code that releases
+        Python's global interpreter lock.
+
+        Finally, ``parallel`` can be set to a :class:`pints.Evaluator`, such
+        as a :class:`pints.ParallelEvaluator`,
+        :class:`pints.ThreadedEvaluator` or
+        :class:`pints.DistributedEvaluator`, in which case its workers will be
+        used to run the method (and ``threads`` is ignored). The evaluator's
+        function will be replaced using
+        :meth:`pints.Evaluator.set_function()`, so that a single pool of
+        workers can be kept running and re-used for several runs. Evaluators
+        can be wrapped in a :class:`pints.CachingEvaluator` to avoid repeated
+        evaluations of the same position.
+        """
+        self._evaluator = None
+        self._auto_parallel = False
+        if isinstance(parallel, pints.Evaluator):
+            evaluator = parallel
+            if isinstance(evaluator, pints.CachingEvaluator):
+                evaluator = evaluator.evaluator()
+            self._parallel = True
+            try:
+                self._n_workers = parallel.n_workers()
+            except AttributeError:
+                self._n_workers = 1
+            self._evaluator = parallel
+            threads = isinstance(evaluator, pints.ThreadedEvaluator)
+        elif parallel is True or parallel == 'auto':
             self._parallel = True
             self._n_workers = pints.ParallelEvaluator.cpu_count()
+            self._auto_parallel = parallel == 'auto'
         elif parallel >= 1:
             self._parallel = True
             self._n_workers = int(parallel)
         else:
             self._parallel = False
             self._n_workers = 1
+        self._threads = bool(threads)
+
+
+class _LogPosteriorComponents(object):
+    """
+    Wraps a :class:`LogPosterior`, so that each evaluation returns a tuple
+    ``(fx, log_likelihood, log_prior)``, where ``fx`` is the log-posterior or,
+    if ``sensitivities=True``, the log-posterior and its derivatives.
+    """
+    def __init__(self, log_posterior, sensitivities):
+        self._log_posterior = log_posterior
+        self._sensitivities = sensitivities
+
+    def __call__(self, x):
+        if self._sensitivities:
+            fx, dfx, log_likelihood, log_prior = \
+                self._log_posterior._evaluateS1_components(x)
+            return (fx, dfx), log_likelihood, log_prior
+        return self._log_posterior.evaluate_components(x)
+
+    def evaluate_batch(self, xs):
+        return list(zip(*self._log_posterior.evaluate_components_batch(xs)))
+
+    def _rejected_value(self):
+        """
+        Returns the result used for rejected evaluations, with a ``nan``
+        log-likelihood and log-prior.
+        """
+        f = self._log_posterior
+        if self._sensitivities:
+            f = f.evaluateS1
+        return pints._evaluation._rejected_value(f), np.nan, np.nan
+
+
+def _split_components(results, rejected):
+    """
+    Splits the results of evaluating a :class:`_LogPosteriorComponents` into
+    lists of values to pass to a sampler, log-likelihoods, and log-priors.
+
+    Results that were replaced by an evaluator's error policy are replaced by
+    the value ``rejected``, with a ``nan`` log-likelihood and log-prior.
+    """
+    fxs, log_likelihoods, log_priors = [], [], []
+    for result in results:
+        if isinstance(result, tuple) and len(result) == 3:
+            fx, log_likelihood, log_prior = result
+        else:
+            fx, log_likelihood, log_prior = rejected, np.nan, np.nan
+        fxs.append(fx)
+        log_likelihoods.append(log_likelihood)
+        log_priors.append(log_prior)
+    return fxs, log_likelihoods, log_priors
 
 
 class MCMCSampling(MCMCController):
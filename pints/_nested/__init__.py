@@ -9,6 +9,7 @@
 from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
 import pints
+import numpy as np
 
 
 class NestedSampler(pints.TunableMethod):
@@ -46,6 +47,19 @@ class NestedSampler(pints.TunableMethod):
                 'Given log_likelihood and log_prior must have same number of'
                 ' parameters.')
 
+        # Check if the prior can convert points from the unit cube, so that
+        # samplers can search in the unit cube instead of parameter space
+        try:
+            self._log_prior.convert_from_unit_cube(
+                0.5 * np.ones((1, self._n_parameters)))
+            self._unit_cube = True
+        except NotImplementedError:
+            self._unit_cube = False
+
+        # Points drawn but not evaluated in the last call to _reject_sample(),
+        # stored as a tuple (key, us, xs)
+        self._unused = None
+
         # Logging
         self._log_to_screen = True
         self._log_filename = None
@@ -79,3 +93,55 @@ class NestedSampler(pints.TunableMethod):
         Enables or disables logging to screen.
         """
         self._log_to_screen = True if enabled else False
+
+    def _from_search_space(self, u):
+        """
+        Converts points ``u`` from the space the sampler searches in (the unit
+        cube if the prior supports it, or the parameter space if not) to
+        parameter space.
+        """
+        if self._unit_cube:
+            return self._log_prior.convert_from_unit_cube(u)
+        return u
+
+    def _reject_sample(self, draw, threshold, key='prior'):
+        """
+        Draws points in the search space with ``draw(n)``, until a point ``u``
+        is found for which ``log_likelihood(x) >= threshold``, where ``x`` is
+        ``u`` converted to parameter space. Returns a tuple
+        ``(u, x, log_likelihood)``.
+
+        To vectorise drawing and converting points, the points are drawn in
+        batches of increasing size. Only points that are evaluated are
+        counted as evaluations. Points that were drawn but not evaluated are
+        kept, and used first in the next call with the same ``key``, which
+        should identify the distribution that ``draw`` samples from.
+        """
+        us = xs = ()
+        if self._unused is not None and self._unused[0] == key:
+            us, xs = self._unused[1:]
+        self._unused = None
+
+        n = 1
+        while True:
+            for k, (u, x) in enumerate(zip(us, xs)):
+                log_likelihood = self._log_likelihood(x)
+                self._n_evals += 1
+                if not log_likelihood < threshold:
+                    self._unused = (key, us[k + 1:], xs[k + 1:])
+                    return u, x, log_likelihood
+            us = draw(n)
+            if self._unit_cube:
+                # Discard points outside the unit cube
+                us = us[np.all((us >= 0) & (us < 1), axis=1)]
+            xs = self._from_search_space(us)
+            n = min(2 * n, 1000)
+
+    def _sample_search_space(self, n):
+        """
+        Returns ``n`` points sampled from the prior, in the space the sampler
+        searches in.
+        """
+        if self._unit_cube:
+            return np.random.uniform(0, 1, size=(n, self._n_parameters))
+        return self._log_prior.sample(n)
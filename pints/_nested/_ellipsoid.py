@@ -13,6 +13,7 @@ import pints
 import numpy as np
 import numpy.linalg as la
 from scipy.misc import logsumexp
+from .._util import _array_key
 
 
 class NestedEllipsoidSampler(pints.NestedSampler):
@@ -160,9 +161,12 @@ class NestedEllipsoidSampler(pints.NestedSampler):
         # Problem dimension
         d = self._n_parameters
 
-        # Generate initial random points by sampling from the prior
+        # Generate initial random points by sampling from the prior. The
+        # ellipsoids are fitted to the points in the search space, which is
+        # the unit cube if the prior can convert points from it.
         m_active = np.zeros((self._active_points, d + 1))
-        m_initial = self._log_prior.sample(self._active_points)
+        u_active = self._sample_search_space(self._active_points)
+        m_initial = self._from_search_space(u_active)
         for i in range(0, self._active_points):
             # Evaluate log likelihood
             m_active[i, d] = self._log_likelihood(m_initial[i, :])
@@ -206,25 +210,26 @@ class NestedEllipsoidSampler(pints.NestedSampler):
             m_inactive[i, :] = m_active[a_min_index, :]
 
             if (i + 1) % self._rejection_samples == 0:
-                A, centroid = self._minimum_volume_ellipsoid(m_active[:, :d])
+                A, centroid = self._minimum_volume_ellipsoid(u_active)
 
             if i > self._rejection_samples:
                 if ((i + 1 - self._rejection_samples)
                         % self._ellipsoid_update_gap == 0):
-                    A, centroid = self._minimum_volume_ellipsoid(
-                        m_active[:, :d])
+                    A, centroid = self._minimum_volume_ellipsoid(u_active)
 
             if i < self._rejection_samples:
                 # Start off with rejection sampling, while this is still very
                 # efficient.
-                m_active[a_min_index, :] = self._reject_sample_prior(
+                u, x, log_likelihood = self._reject_sample_prior(
                     a_running_log_likelihood)
             else:
                 # After a number of samples, switch to ellipsoid sampling.
-                m_active[a_min_index, :] = \
-                    self._reject_ellipsoid_sample_faster(
-                        a_running_log_likelihood, m_active[:, :d],
-                        self._enlargement_factor, A, centroid)
+                u, x, log_likelihood = self._reject_ellipsoid_sample_faster(
+                    a_running_log_likelihood, u_active,
+                    self._enlargement_factor, A, centroid)
+            u_active[a_min_index] = u
+            m_active[a_min_index, :d] = x
+            m_active[a_min_index, d] = log_likelihood
 
             # Show progress
             if logging:
@@ -369,17 +374,12 @@ class NestedEllipsoidSampler(pints.NestedSampler):
     def _reject_sample_prior(self, threshold):
         """
         Independently samples params from the prior until
-        ``log_likelihood(params) > threshold``.
-        """
-        # Note: threshold can be -inf, so that while loop is never run.
-        proposed = self._log_prior.sample()[0]
-        log_likelihood = self._log_likelihood(proposed)
-        self._n_evals += 1
-        while log_likelihood < threshold:
-            proposed = self._log_prior.sample()[0]
-            log_likelihood = self._log_likelihood(proposed)
-            self._n_evals += 1
-        return np.concatenate((proposed, np.array([log_likelihood])))
+        ``log_likelihood(params) > threshold``, and returns a tuple
+        ``(u, params, log_likelihood)`` where ``u`` is the point in the search
+        space.
+        """
+        # Note: threshold can be -inf, so that the first sample is accepted.
+        return self._reject_sample(self._sample_search_space, threshold)
 
     def _reject_ellipsoid_sample_faster(
             self, threshold, m_samples_previous, enlargement_factor, A,
@@ -387,25 +387,22 @@ class NestedEllipsoidSampler(pints.NestedSampler):
         """
         Independently samples params from the prior until
         ``logLikelihood(params) > threshold``. Accepts ``A`` as input (which is
-        only updated every ``N`` steps).
+        only updated every ``N`` steps). Returns a tuple
+        ``(u, params, log_likelihood)``.
         """
         return self._reject_draw_from_ellipsoid(
             la.inv((1 / enlargement_factor) * A), centroid, threshold)
 
     def _reject_draw_from_ellipsoid(self, A, centroid, threshold):
         """
-        Draws a random point from within ellipsoid and accepts it if
-        log-likelihood exceeds threshold.
+        Draws random points from within ellipsoid until one is found with a
+        log-likelihood that exceeds threshold, and returns a tuple
+        ``(u, params, log_likelihood)``.
         """
-        # Note: threshold can be -inf, so that while loop is never run.
-        proposed = self._draw_from_ellipsoid(A, centroid, 1)[0]
-        log_likelihood = self._log_likelihood(proposed)
-        self._n_evals += 1
-        while log_likelihood < threshold:
-            proposed = self._draw_from_ellipsoid(A, centroid, 1)[0]
-            log_likelihood = self._log_likelihood(proposed)
-            self._n_evals += 1
-        return np.concatenate((proposed, np.array([log_likelihood])))
+        # Note: threshold can be -inf, so that the first sample is accepted.
+        return self._reject_sample(
+            lambda n: self._draw_from_ellipsoid(A, centroid, n), threshold,
+            (_array_key(A), _array_key(centroid)))
 
     def _draw_from_ellipsoid(self, covmat, cent, npts):
         """
@@ -437,22 +434,14 @@ class NestedEllipsoidSampler(pints.NestedSampler):
         # calculate scaling for each point to be within the unit hypersphere
         # with radii rs
         fac = (rs**(1 / ndims)) / np.sqrt(fac)
-        pnts = np.zeros((npts, ndims))
 
         # scale points to the ellipsoid using the eigen_values and rotate with
         # the eigen_vectors and add centroid
         d = np.sqrt(np.diag(e))
-        d.shape = (ndims, 1)
-
-        for i in range(0, npts):
-            # scale points to a uniform distribution within unit hypersphere
-            pnts[i, :] = fac[i] * pt[i, :]
-            pnts[i, :] = np.dot(
-                np.multiply(pnts[i, :], np.transpose(d)),
-                np.transpose(v)
-            ) + cent
 
-        return pnts
+        # scale points to a uniform distribution within unit hypersphere
+        pnts = fac.reshape((npts, 1)) * pt
+        return np.dot(pnts * d, np.transpose(v)) + cent
 
 
 # TODO: THIS METHOD IS NEVER USED
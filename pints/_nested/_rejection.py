@@ -117,7 +117,8 @@ class NestedRejectionSampler(pints.NestedSampler):
 
         # Generate initial random points by sampling from the prior
         m_active = np.zeros((self._active_points, d + 1))
-        m_initial = self._log_prior.sample(self._active_points)
+        m_initial = self._from_search_space(
+            self._sample_search_space(self._active_points))
         for i in range(0, self._active_points):
             # Calculate likelihood
             m_active[i, d] = self._log_likelihood(m_initial[i, :])
@@ -161,14 +162,10 @@ class NestedRejectionSampler(pints.NestedSampler):
 
             # Independently samples params from the prior until
             # log_likelihood(params) > threshold.
-            # Note a_running_log_likelihood can be -inf, so while is never run
-            proposed = self._log_prior.sample()[0]
-            log_likelihood = self._log_likelihood(proposed)
-            self._n_evals += 1
-            while log_likelihood < a_running_log_likelihood:
-                proposed = self._log_prior.sample()[0]
-                log_likelihood = self._log_likelihood(proposed)
-                self._n_evals += 1
+            # Note a_running_log_likelihood can be -inf, so that the first
+            # sample is always accepted
+            u, proposed, log_likelihood = self._reject_sample(
+                self._sample_search_space, a_running_log_likelihood)
             m_active[a_min_index, :] = np.concatenate(
                 (proposed, np.array([log_likelihood])))
 
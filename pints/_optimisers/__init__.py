@@ -331,6 +331,9 @@ class OptimisationController(object):
         # Parallelisation
         self._parallel = False
         self._n_workers = 1
+        self._threads = False
+        self._evaluator = None
+        self._auto_parallel = False
         self.set_parallel()
 
         #
@@ -401,7 +404,12 @@ class OptimisationController(object):
         unchanged_iterations = 0
 
         # Create evaluator object
-        if self._parallel:
+        if self._evaluator is not None:
+            # Re-use existing workers
+            n_workers = self._n_workers
+            evaluator = self._evaluator
+            evaluator.set_function(self._function)
+        elif self._parallel:
             # Get number of workers
             n_workers = self._n_workers
 
@@ -409,8 +417,18 @@ class OptimisationController(object):
             # particles!
             if isinstance(self._optimiser, PopulationBasedOptimiser):
                 n_workers = min(n_workers, self._optimiser.population_size())
-            evaluator = pints.ParallelEvaluator(
-                self._function, n_workers=n_workers)
+            if self._auto_parallel:
+                evaluator = pints.AutoParallelEvaluator(
+                    self._function, max_workers=n_workers)
+            elif self._threads:
+                evaluator = pints.ThreadedEvaluator(
+                    self._function, n_workers=n_workers)
+            else:
+                evaluator = pints.ParallelEvaluator(
+                    self._function, n_workers=n_workers)
+        elif pints._evaluation._overrides_evaluate_batch(self._function):
+            # Evaluate all points from a single ask() in one call
+            evaluator = pints.BatchEvaluator(self._function)
         else:
             evaluator = pints.SequentialEvaluator(self._function)
 
@@ -437,9 +455,13 @@ class OptimisationController(object):
                 print('Using ' + str(self._optimiser.name()))
 
                 # Show parallelisation
-                if self._parallel:
+                if self._auto_parallel:
+                    print('Choosing number of worker processes automatically'
+                          ' (up to ' + str(n_workers) + ').')
+                elif self._parallel:
                     print('Running in parallel with ' + str(n_workers) +
-                          ' worker processes.')
+                          (' worker threads.' if self._threads
+                           else ' worker processes.'))
                 else:
                     print('Running in sequential mode.')
 
@@ -464,6 +486,7 @@ class OptimisationController(object):
             logger.add_counter('Eval.', max_value=max_eval_guess)
             logger.add_float('Best')
             self._optimiser._log_init(logger)
+            evaluator._log_init(logger)
             logger.add_time('Time m:s')
 
         # Start searching
@@ -505,6 +528,7 @@ class OptimisationController(object):
                     # Log state
                     logger.log(iteration, evaluations, fbest_user)
                     self._optimiser._log_write(logger)
+                    evaluator._log_write(logger)
                     logger.log(timer.time())
 
                     # Choose next logging point
@@ -565,6 +589,7 @@ class OptimisationController(object):
         if logging:
             logger.log(iteration, evaluations, fbest_user)
             self._optimiser._log_write(logger)
+            evaluator._log_write(logger)
             logger.log(timer.time())
             if self._log_to_screen:
                 print(halt_message)
@@ -652,7 +677,7 @@ class OptimisationController(object):
         self._max_unchanged_iterations = iterations
         self._min_significant_change = threshold
 
-    def set_parallel(self, parallel=False):
+    def set_parallel(self, parallel=False, threads=False):
         """
         Enables/disables parallel evaluation.
 
@@ -661,17 +686,59 @@ class OptimisationController(object):
         can be set explicitly by setting ``parallel`` to an integer greater
         than 0.
         Parallelisation can be disabled by setting ``parallel`` to ``0`` or
-        ``False``.
+        ``False``. Positions are then evaluated one at a time using a
+        :class:`pints.SequentialEvaluator`, unless the function provides its
+        own ``evaluate_batch()`` method, in which case all positions from a
+        single iteration are evaluated at once using a
+        :class:`pints.BatchEvaluator`.
+
+        If ``parallel='auto'``, a :class:`pints.AutoParallelEvaluator` is used
+        to choose between sequential and parallel evaluation (and the number
+        of worker processes, up to the detected cpu core count) based on the
+        measured time per evaluation and communication overhead. This choice
+        is updated if the time per evaluation changes during the run. In this
+        mode, ``threads`` is ignored.
+
+        If ``threads=True``, worker threads will be used instead of worker
+        processes (see :class:`pints.ThreadedEvaluator`). This can be faster
+        for functions that spend most of their time in code that releases
+        Python's global interpreter lock.
+
+        Finally, ``parallel`` can be set to a :class:`pints.Evaluator`, such
+        as a :class:`pints.ParallelEvaluator`,
+        :class:`pints.ThreadedEvaluator` or
+        :class:`pints.DistributedEvaluator`, in which case its workers will be
+        used to run the method (and ``threads`` is ignored). The evaluator's
+        function will be replaced using
+        :meth:`pints.Evaluator.set_function()`, so that a single pool of
+        workers can be kept running and re-used for several runs. Evaluators
+        can be wrapped in a :class:`pints.CachingEvaluator` to avoid repeated
+        evaluations of the same position.
         """
-        if parallel is True:
+        self._evaluator = None
+        self._auto_parallel = False
+        if isinstance(parallel, pints.Evaluator):
+            evaluator = parallel
+            if isinstance(evaluator, pints.CachingEvaluator):
+                evaluator = evaluator.evaluator()
+            self._parallel = True
+            try:
+                self._n_workers = parallel.n_workers()
+            except AttributeError:
+                self._n_workers = 1
+            self._evaluator = parallel
+            threads = isinstance(evaluator, pints.ThreadedEvaluator)
+        elif parallel is True or parallel == 'auto':
             self._parallel = True
             self._n_workers = pints.ParallelEvaluator.cpu_count()
+            self._auto_parallel = parallel == 'auto'
         elif parallel >= 1:
             self._parallel = True
             self._n_workers = int(parallel)
         else:
             self._parallel = False
             self._n_workers = 1
+        self._threads = bool(threads)
 
     def set_threshold(self, threshold):
         """
@@ -830,7 +897,11 @@ def curve_fit(f, x, y, p0, boundaries=None, threshold=None, max_iter=None,
         If set to ``True``, the evaluations will happen in parallel using a
         number of worker processes equal to the detected cpu core count. The
         number of workers can be set explicitly by setting ``parallel`` to an
-        integer greater than 0.
+        integer greater than 0. To re-use the workers of an existing
+        :class:`pints.ParallelEvaluator` or :class:`pints.ThreadedEvaluator`,
+        for example over several calls, set ``parallel`` to that evaluator.
+        Set ``parallel='auto'`` to choose between sequential and parallel
+        evaluation automatically (see :class:`pints.AutoParallelEvaluator`).
     ``method``
         The :class:`pints.Optimiser` to use. If no method is specified,
         ``pints.CMAES`` is used.
@@ -940,7 +1011,11 @@ def fmin(f, x0, args=None, boundaries=None, threshold=None, max_iter=None,
         If set to ``True``, the evaluations will happen in parallel using a
         number of worker processes equal to the detected cpu core count. The
         number of workers can be set explicitly by setting ``parallel`` to an
-        integer greater than 0.
+        integer greater than 0. To re-use the workers of an existing
+        :class:`pints.ParallelEvaluator` or :class:`pints.ThreadedEvaluator`,
+        for example over several calls, set ``parallel`` to that evaluator.
+        Set ``parallel='auto'`` to choose between sequential and parallel
+        evaluation automatically (see :class:`pints.AutoParallelEvaluator`).
     ``method``
         The :class:`pints.Optimiser` to use. If no method is specified,
         ``pints.CMAES`` is used.
@@ -8,9 +8,13 @@
 #
 from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
+import atexit
+import os
 import pints
 import numpy as np
+import tempfile
 import timeit
+import weakref
 
 
 def strfloat(x):
@@ -107,3 +111,135 @@ def matrix2d(x):
         raise ValueError('Unable to convert to 2d matrix.')
     x.setflags(write=False)
     return x
+
+
+def shared_array(x, directory=None):
+    """
+    Copies ``x`` into a memory-mapped file and returns a read-only numpy
+    array of floats backed by that file.
+
+    Unlike ordinary arrays, the returned array (and any contiguous slice of
+    it) is pickled as a reference to the file, so that copies sent to other
+    processes (for example to the workers of a :class:`ParallelEvaluator`)
+    attach to the same data without copying it.
+
+    The file is created in ``directory``, or, if no directory is given, in
+    ``/dev/shm`` (so that the data is held in shared memory) where available
+    and in the system's temporary directory otherwise. It is deleted when the
+    array is no longer in use in the process that created it, or when this
+    process exits.
+    """
+    x = np.asarray(x, dtype=float)
+    if directory is None:
+        directory = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    handle, path = tempfile.mkstemp(prefix='pints-', dir=directory)
+    os.close(handle)
+
+    # Write data, then reopen read-only
+    if x.size:
+        y = np.memmap(path, dtype=float, mode='w+', shape=x.shape)
+        y[...] = x
+        y.flush()
+        del(y)
+    y = _attach_shared_array(path, x.shape, 0)
+
+    # Remove file when no longer used by this process
+    remove = _RemoveFile(path)
+    if y.base is not None and hasattr(weakref, 'finalize'):
+        weakref.finalize(y.base, remove)
+    else:   # pragma: no cover
+        atexit.register(remove)
+    return y
+
+
+def _array_key(x):
+    """
+    Returns a hashable key that identifies the shape and exact values of the
+    array of floats ``x``.
+    """
+    x = np.asarray(x, dtype=float)
+    return str(x.shape).encode('ascii') + b':' + x.tobytes()
+
+
+def _attach_shared_array(path, shape, offset, dtype=float):
+    """
+    Returns a read-only :class:`_SharedArray` of the given ``shape`` and
+    ``dtype``, backed by the file at ``path`` starting at byte ``offset``.
+    """
+    if np.prod(shape) == 0:
+        # Empty files can't be memory-mapped
+        x = np.zeros(shape, dtype=dtype)
+        x.setflags(write=False)
+        return x
+    return _SharedArray(
+        path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+def _memmap_view(x):
+    """
+    Returns a read-only :class:`_SharedArray` view on the memory-mapped array
+    ``x``, or ``None`` if ``x`` is not a memory-mapped array of 64-bit floats
+    (in native byte order) that can be shared with other processes.
+    """
+    if not isinstance(x, np.memmap) or x._mmap is None:
+        return None
+    if x.mode == 'c' or x.dtype != np.dtype(float):
+        return None
+    x = x.view(_SharedArray)
+    x.setflags(write=False)
+    return x
+
+
+class _RemoveFile(object):
+    """
+    Callable that deletes a file, but only if called from the process that
+    created it.
+    """
+    def __init__(self, path):
+        self._path = path
+        self._pid = os.getpid()
+
+    def __call__(self):
+        if os.getpid() == self._pid:
+            try:
+                os.remove(self._path)
+            except OSError:     # pragma: no cover
+                pass
+
+
+class _SharedArray(np.memmap):
+    """
+    Read-only memory-mapped array that is pickled as a reference to its file,
+    instead of as a copy of its data. Created by :meth:`shared_array()` and
+    :meth:`pints.io.load_array()`.
+    """
+    def __array_wrap__(self, arr, context=None, *args):
+        # Results of calculations are returned as ordinary arrays or scalars
+        arr = np.ndarray.__array_wrap__(self, arr, context, *args)
+        if arr is self:
+            return arr
+        if arr.shape == ():
+            return arr[()]
+        return arr.view(np.ndarray)
+
+    def __getitem__(self, index):
+        x = super(_SharedArray, self).__getitem__(index)
+        if isinstance(x, _SharedArray) and x._mmap is None:
+            return x.view(np.ndarray)
+        return x
+
+    def __reduce__(self):
+        root = self
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+        if (self._mmap is None or self.mode == 'c'
+                or not self.flags.c_contiguous
+                or not isinstance(root, np.memmap) or root._mmap is None):
+            # Not a view on a shared memory map: pickle as an ordinary array
+            return np.array(self).__reduce__()
+
+        # Find offset of this (view on the) array in the file
+        offset = root.offset + self.ctypes.data - root.ctypes.data
+        return (
+            _attach_shared_array,
+            (self.filename, self.shape, offset, self.dtype.str))
@@ -10,6 +10,62 @@ from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
 
 
+def load_array(filename, dtype=None, shape=None, offset=0):
+    """
+    Opens the NumPy ``.npy`` file or raw binary file at ``filename`` and
+    returns its contents as a read-only, memory-mapped numpy array, without
+    reading them into memory.
+
+    For ``.npy`` files, the data type and shape are read from the file's
+    header. For raw binary files, the data type can be set with ``dtype``
+    (64-bit floats by default), the ``shape`` of the array can be given (by
+    default a 1d array containing all data in the file is returned), and an
+    ``offset`` can be set to skip a header of that many bytes.
+
+    Arrays of 64-bit floats (in the machine's native byte order) loaded this
+    way can be passed to a :class:`pints.SingleOutputProblem` or
+    :class:`pints.MultiOutputProblem`, which will use them without copying.
+    Arrays of any other type are copied and converted to 64-bit floats.
+    Like arrays created with :meth:`pints.shared_array()`, arrays loaded this
+    way are pickled as a reference to the file.
+    """
+    import numpy as np
+    import os
+    import pints._util
+
+    filename = os.path.abspath(filename)
+    if os.path.splitext(filename)[1].lower() == '.npy':
+        if dtype is not None or shape is not None or offset:
+            raise ValueError(
+                'The arguments `dtype`, `shape`, and `offset` can not be used'
+                ' with .npy files.')
+        with open(filename, 'rb') as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+        if fortran and len(shape) > 1:
+            raise ValueError('Arrays in Fortran order are not supported.')
+        if dtype.hasobject:
+            raise ValueError('Arrays of Python objects are not supported.')
+    else:
+        dtype = np.dtype(float if dtype is None else dtype)
+        offset = int(offset)
+        if offset < 0:
+            raise ValueError('Offset cannot be negative.')
+        size = os.path.getsize(filename) - offset
+        if shape is None:
+            shape = (max(0, size) // dtype.itemsize, )
+        shape = tuple(int(n) for n in np.atleast_1d(shape))
+        if int(np.prod(shape)) * dtype.itemsize > size:
+            raise ValueError(
+                'File is too small for an array of shape ' + str(shape) + '.')
+
+    return pints._util._attach_shared_array(filename, shape, offset, dtype)
+
+
 def load_samples(filename, n=None):
     """
     Loads samples from the given ``filename`` and returns a 2d numpy array
@@ -226,3 +226,34 @@ class CircularBoundaries(pints.Boundaries):
         """ See :meth:`pints.Boundaries.n_parameters()`. """
         return self._n_parameters
 
+
+class CountingModel(pints.ForwardModelS1):
+    """
+    Wraps around a :class:`pints.ForwardModel` (or
+    :class:`pints.ForwardModelS1`), and counts the number of calls to its
+    ``simulate`` and ``simulateS1`` methods.
+    """
+    def __init__(self, model):
+        super(CountingModel, self).__init__()
+        self._model = model
+        self.n_simulate = 0
+        self.n_simulateS1 = 0
+
+    def n_outputs(self):
+        return self._model.n_outputs()
+
+    def n_parameters(self):
+        return self._model.n_parameters()
+
+    def reset(self):
+        """ Resets the counts to zero. """
+        self.n_simulate = self.n_simulateS1 = 0
+
+    def simulate(self, parameters, times):
+        self.n_simulate += 1
+        return self._model.simulate(parameters, times)
+
+    def simulateS1(self, parameters, times):
+        self.n_simulateS1 += 1
+        return self._model.simulateS1(parameters, times)
+
@@ -13,6 +13,14 @@ import pints.toy
 import unittest
 import numpy as np
 
+from shared import CountingModel
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
 
 class MiniProblem(pints.SingleOutputProblem):
     def __init__(self):
@@ -25,6 +33,9 @@ class MiniProblem(pints.SingleOutputProblem):
     def evaluate(self, parameters):
         return np.array(parameters)
 
+    def evaluate_batch(self, parameters):
+        return np.array(parameters, dtype=float)
+
     def times(self):
         return self._t
 
@@ -274,6 +285,35 @@ class TestErrorMeasures(unittest.TestCase):
         self.assertEqual(dy.shape, (3, ))
         self.assertTrue(np.all(dy == [-1, -2, -3]))
 
+    def test_evaluate_batch(self):
+        """ Tests batch evaluation of error measures. """
+
+        xs = [[1, 2, 3], [4, 5, 6], [0, 0, 1]]
+
+        # Default implementation
+        p = MiniProblem()
+        e = pints.RootMeanSquaredError(p)
+        ys = e.evaluate_batch(xs)
+        self.assertEqual(ys.shape, (3, ))
+        self.assertEqual(list(ys), [e(x) for x in xs])
+
+        # Vectorised implementations
+        for e in (pints.SumOfSquaresError(p), pints.MeanSquaredError(p)):
+            ys = e.evaluate_batch(xs)
+            self.assertEqual(ys.shape, (3, ))
+            self.assertTrue(np.allclose(ys, [e(x) for x in xs]))
+
+        # Probability based error
+        e = pints.ProbabilityBasedError(MiniLogPDF())
+        self.assertEqual(list(e.evaluate_batch(xs)), [e(x) for x in xs])
+
+        # Sum of errors
+        e1 = pints.SumOfSquaresError(p)
+        e2 = pints.MeanSquaredError(p)
+        e = pints.SumOfErrors([e1, e2], [1, 2])
+        self.assertTrue(np.allclose(
+            e.evaluate_batch(xs), [e(x) for x in xs]))
+
     def test_root_mean_squared_error(self):
         """ Tests :class:`pints.RootMeanSquaredError`. """
 
@@ -551,6 +591,60 @@ class TestErrorMeasures(unittest.TestCase):
         y2, dy2 = e2.evaluateS1(x)
         self.assertTrue(np.all(dy == dy1 + 2 * dy2))
 
+    def test_evaluateS1_simulations(self):
+        # Test that evaluateS1 runs a single simulation, and uses it for both
+        # the value and the gradient
+
+        model = CountingModel(pints.toy.ConstantModel(2))
+        times = np.linspace(0, 10, 20)
+        problem = pints.MultiOutputProblem(
+            model, times, np.random.normal(size=(20, 2)))
+        mse = pints.MeanSquaredError(problem)
+        errors = [
+            mse,
+            pints.SumOfSquaresError(problem, [1, 2]),
+            pints.ProbabilityBasedError(
+                pints.GaussianKnownSigmaLogLikelihood(problem, 1)),
+            pints.SumOfErrors([mse, mse], [1, 2]),
+        ]
+        x = [1, 2]
+        for error in errors:
+            model.reset()
+            e, de = error.evaluateS1(x)
+            n = 2 if isinstance(error, pints.SumOfErrors) else 1
+            self.assertEqual(model.n_simulate, 0)
+            self.assertEqual(model.n_simulateS1, n)
+            self.assertAlmostEqual(e, error(x))
+
+    def test_evaluate_outputs(self):
+        # Tests vectorised evaluation from stacks of model outputs
+
+        model = pints.toy.FitzhughNagumoModel()
+        times = np.linspace(0, 10, 30)
+        values = model.simulate([0.1, 0.5, 3], times)
+        values += np.random.normal(0, 0.1, values.shape)
+        multi = pints.MultiOutputProblem(model, times, values)
+        model = pints.toy.LogisticModel()
+        times = np.linspace(0, 100, 30)
+        values = model.simulate([0.1, 50], times)
+        single = pints.SingleOutputProblem(
+            model, times, values + np.random.normal(0, 1, values.shape))
+
+        xs_multi = [[0.1, 0.5, 3], [0.12, 0.4, 3], [0.1, 0.5, 2.5]]
+        xs_single = [[0.1, 50], [0.12, 45], [0.09, 52]]
+        for p, xs in ((single, xs_single), (multi, xs_multi)):
+            ys = p.evaluate_batch(xs)
+            for e in (pints.SumOfSquaresError(p),
+                      pints.SumOfSquaresError(p, [2] * p.n_outputs()),
+                      pints.MeanSquaredError(p),
+                      pints.MeanSquaredError(p, [3] * p.n_outputs())):
+                f = [e(x) for x in xs]
+                self.assertTrue(np.allclose(e.evaluate_outputs(ys), f))
+                self.assertTrue(np.allclose(e.evaluate_batch(xs), f))
+                self.assertEqual(e.evaluate_outputs(ys[:0]).shape, (0, ))
+                self.assertRaisesRegex(
+                    ValueError, 'shape', e.evaluate_outputs, ys[:, 1:])
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
@@ -7,10 +7,16 @@
 #  For licensing information, see the LICENSE file distributed with the PINTS
 #  software package.
 #
+import os
 import pints
+import pints.toy
+import time
 import unittest
+import warnings
 import numpy as np
 
+from shared import StreamCapture, TemporaryDirectory
+
 # Consistent unit testing in Python 2 and 3
 try:
     unittest.TestCase.assertRaisesRegex
@@ -28,6 +34,170 @@ class TestEvaluators(unittest.TestCase):
     def __init__(self, name):
         super(TestEvaluators, self).__init__(name)
 
+    def test_caching(self):
+        # Test caching evaluator
+
+        # Count evaluations
+        counts = []
+
+        def g(x):
+            counts.append(x)
+            return f(x)
+
+        e = pints.CachingEvaluator(pints.SequentialEvaluator(g), max_size=3)
+        self.assertEqual(e.max_size(), 3)
+        self.assertEqual(e.n_workers(), 1)
+        self.assertEqual(e.evaluate([1, 2, 1]), [1, 4, 1])
+        self.assertEqual(len(counts), 2)
+        self.assertEqual(e.hits(), 1)
+        self.assertEqual(e.misses(), 2)
+        self.assertEqual(e.size(), 2)
+        self.assertEqual(e.evaluate([2, 1]), [4, 1])
+        self.assertEqual(len(counts), 2)
+        self.assertEqual(e.hits(), 3)
+
+        # Keys depend on exact values, not type
+        self.assertEqual(e.evaluate([np.array(2.0)]), [4])
+        self.assertEqual(e.evaluate([2 + 1e-15]), [f(2 + 1e-15)])
+        self.assertEqual(len(counts), 3)
+
+        # Least recently used results are removed
+        self.assertEqual(e.size(), 3)
+        self.assertEqual(e.evaluate([4]), [16])
+        self.assertEqual(e.size(), 3)
+        e.evaluate([1])
+        self.assertEqual(len(counts), 5)
+        e.evaluate([4, 2 + 1e-15])
+        self.assertEqual(len(counts), 5)
+
+        # Submitting positions
+        future = e.submit(4)
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), 16)
+        future = e.submit(5)
+        self.assertEqual(future.result(), 25)
+        self.assertEqual(e.evaluate([5]), [25])
+        self.assertEqual(len(counts), 6)
+
+        # Clearing
+        e.clear()
+        self.assertEqual(e.size(), 0)
+        self.assertEqual(e.hits(), 0)
+        self.assertEqual(e.misses(), 0)
+
+        # Changing the function clears the cache, unless it's the same
+        e.evaluate([1, 2])
+        e.set_function(g)
+        self.assertEqual(e.size(), 2)
+        e.set_function(f_args, (1, 2))
+        self.assertEqual(e.size(), 0)
+        self.assertEqual(e.evaluate([1, 2]), [4, 5])
+
+        # Parallel evaluation with multi-dimensional positions
+        e = pints.CachingEvaluator(pints.ParallelEvaluator(
+            f_sum, n_workers=2, args=(1, )))
+        self.assertEqual(e.n_workers(), 2)
+        xs = np.random.normal(0, 1, size=(10, 3))
+        ys = [f_sum(x, 1) for x in xs]
+        self.assertEqual(e.evaluate(xs), ys)
+        self.assertEqual(e.evaluate(xs[::-1]), ys[::-1])
+        self.assertEqual(e.hits(), 10)
+        self.assertEqual(e.misses(), 10)
+        futures = [e.submit(x) for x in np.concatenate((xs[:2], -xs[:2]))]
+        self.assertEqual(len(list(e.as_completed(futures))), 4)
+        self.assertEqual(e.size(), 12)
+
+        # Results spilled to disk
+        with TemporaryDirectory() as d:
+            path = d.path('cache')
+            e = pints.CachingEvaluator(
+                pints.SequentialEvaluator(g), max_size=2, filename=path)
+            del counts[:]
+            self.assertEqual(e.evaluate([1, 2, 3, 4]), [1, 4, 9, 16])
+            self.assertEqual(e.size(), 2)
+            self.assertEqual(e.evaluate([1, 2, 3, 4]), [1, 4, 9, 16])
+            self.assertEqual(len(counts), 4)
+            self.assertEqual(e.hits(), 4)
+            e.close()
+            self.assertEqual(e.evaluate([4, 5, 6, 1]), [16, 25, 36, 1])
+            self.assertEqual(len(counts), 7)
+
+        # Invalid arguments
+        self.assertRaisesRegex(
+            ValueError, 'extend', pints.CachingEvaluator, f)
+        self.assertRaisesRegex(
+            ValueError, 'size', pints.CachingEvaluator,
+            pints.SequentialEvaluator(f), 0)
+
+    def test_error_policy(self):
+
+        # Exceptions and non-finite results are replaced by a sentinel
+        xs = list(range(8))
+        expected = [0, 1, 2, np.inf, np.inf, np.inf, np.inf, 7]
+        evaluators = [
+            pints.SequentialEvaluator(fail_on_three, error_policy='sentinel'),
+            pints.ParallelEvaluator(
+                fail_on_three, n_workers=2, error_policy='sentinel'),
+            pints.ParallelEvaluator(
+                fail_on_three, n_workers=2, error_policy='sentinel',
+                shared_memory=True, chunk_size=3),
+            pints.ParallelEvaluator(
+                fail_on_three, n_workers=2, error_policy='sentinel',
+                stats=True),
+        ]
+        for e in evaluators:
+            pids = sorted([w.pid for w in getattr(e, '_workers', [])])
+            self.assertEqual(e.evaluate(xs), expected)
+            log = e.error_log()
+            self.assertEqual([x for x, error in log], [3, 4, 6])
+            self.assertIn('ValueError: Bad position', log[0][1])
+            self.assertEqual(log[1][1], 'Non-finite result: nan')
+            self.assertEqual(log[2][1], 'Non-finite result: -inf')
+
+            # Workers are kept alive
+            if pids:
+                self.assertEqual(
+                    pids, sorted([w.pid for w in e._workers]))
+
+            # Asynchronous evaluations also use the sentinel
+            self.assertEqual(e.submit(3).result(), np.inf)
+            self.assertEqual(len(e.error_log()), 4)
+
+        # Custom sentinel
+        e = pints.SequentialEvaluator(
+            fail_on_three, error_policy='sentinel', error_value=-1)
+        self.assertEqual(e.evaluate([2, 3]), [2, -1])
+
+        # Log-pdfs: -inf is a valid result, +inf and nan are not
+        p = pints.toy.GaussianLogPDF([0, 0], [1, 1])
+        e = pints.SequentialEvaluator(p, error_policy='sentinel')
+        self.assertEqual(
+            e.evaluate([[0, 0], [0, np.nan]]), [p([0, 0]), -np.inf])
+        self.assertEqual(len(e.error_log()), 1)
+        e = pints.SequentialEvaluator(p.evaluateS1, error_policy='sentinel')
+        e.evaluate([[0, 0], [0, np.nan]])
+        self.assertEqual(len(e.error_log()), 1)
+
+        # Errors are shown in the controller log
+        r = pints.toy.RosenbrockError()
+        opt = pints.OptimisationController(r, [1.1, 1.1], method=pints.XNES)
+        opt.set_max_iterations(3)
+        opt.set_parallel(pints.ParallelEvaluator(
+            r, n_workers=2, error_policy='sentinel'))
+        with StreamCapture() as c:
+            opt.run()
+        self.assertIn('Errors', c.text())
+
+        # Default policy is to raise
+        e = pints.SequentialEvaluator(fail_on_three)
+        self.assertRaisesRegex(ValueError, 'Bad position', e.evaluate, [3])
+        self.assertRaisesRegex(
+            ValueError, 'Error policy', pints.SequentialEvaluator, f,
+            error_policy='ignore')
+        self.assertRaisesRegex(
+            ValueError, 'Error policy', pints.ParallelEvaluator, f,
+            error_policy='ignore')
+
     def test_function(self):
 
         # Create test data
@@ -38,6 +208,10 @@ class TestEvaluators(unittest.TestCase):
         self.assertTrue(np.all(ys == pints.evaluate(f, xs, parallel=True)))
         self.assertTrue(np.all(ys == pints.evaluate(f, xs, parallel=1)))
         self.assertTrue(np.all(ys == pints.evaluate(f, xs, parallel=False)))
+        self.assertTrue(np.all(
+            ys == pints.evaluate(f, xs, parallel=True, threads=True)))
+        self.assertTrue(np.all(
+            ys == pints.evaluate(f, xs, parallel=2, threads=True)))
 
     def test_sequential(self):
 
@@ -62,6 +236,154 @@ class TestEvaluators(unittest.TestCase):
         # Args must be a sequence
         self.assertRaises(ValueError, pints.SequentialEvaluator, f_args, 1)
 
+    def test_async(self):
+        # Test submitting positions and collecting futures
+
+        xs = np.random.normal(0, 10, 20)
+        evaluators = [
+            pints.SequentialEvaluator(f),
+            pints.ParallelEvaluator(f, n_workers=2, max_tasks_per_worker=7),
+            pints.ParallelEvaluator(f, n_workers=2, shared_memory=True),
+            pints.ThreadedEvaluator(f, n_workers=3),
+        ]
+        for e in evaluators:
+            futures = [e.submit(x) for x in xs]
+            done = list(e.as_completed(futures))
+            self.assertEqual(len(done), len(xs))
+            self.assertEqual(set(done), set(futures))
+            for future in futures:
+                self.assertTrue(future.done())
+                self.assertEqual(future.result(), f(future.position()))
+                self.assertIsNone(future.exception())
+
+            # Results can be awaited directly
+            future = e.submit(3)
+            self.assertEqual(future.result(), 9)
+
+            # Synchronous evaluation can be mixed with futures
+            futures = [e.submit(x) for x in xs]
+            self.assertEqual(e.evaluate(xs), [f(x) for x in xs])
+            self.assertEqual(
+                [future.result() for future in futures], [f(x) for x in xs])
+
+        # Errors are stored in the futures
+        for e in (pints.SequentialEvaluator(ioerror_on_five),
+                  pints.ThreadedEvaluator(ioerror_on_five)):
+            futures = [e.submit(x) for x in range(10)]
+            for future in e.as_completed(futures):
+                if future.position() == 5:
+                    self.assertIsNotNone(future.exception())
+                    self.assertRaises(Exception, future.result)
+                else:
+                    self.assertEqual(future.result(), future.position())
+
+        # In parallel, all pending evaluations fail after an error
+        e = pints.ParallelEvaluator(ioerror_on_five, n_workers=2)
+        futures = [e.submit(x) for x in range(10)]
+        self.assertRaisesRegex(
+            Exception, 'in subprocess', futures[5].result)
+        self.assertTrue(all([future.done() for future in futures]))
+
+        # Evaluator can be used again afterwards
+        self.assertEqual(e.submit(3).result(), 3)
+        self.assertEqual(e.evaluate([1, 2]), [1, 2])
+
+    def test_auto_parallel(self):
+
+        # Cheap functions are evaluated sequentially
+        xs = list(range(6))
+        e = pints.AutoParallelEvaluator(f, max_workers=3)
+        self.assertEqual(e.n_workers(), 3)
+        self.assertIsNone(e.current_n_workers())
+        for i in range(3):
+            self.assertEqual(e.evaluate(xs), [f(x) for x in xs])
+        self.assertEqual(e.current_n_workers(), 1)
+        self.assertIsNone(e._parallel)
+        self.assertEqual(e.evaluate([]), [])
+
+        # Expensive functions are evaluated in parallel, using the smallest
+        # number of workers that gives the shortest run time
+        e = pints.AutoParallelEvaluator(sleep_above_ten, max_workers=4)
+        xs = list(range(11, 17))
+        for i in range(3):
+            self.assertEqual(e.evaluate(xs), xs)
+        self.assertEqual(e.current_n_workers(), 3)
+        self.assertEqual(e._parallel.n_workers(), 3)
+
+        # Choice is updated when the cost per evaluation drifts
+        for i in range(3):
+            self.assertEqual(e.evaluate(list(range(6))), list(range(6)))
+        self.assertEqual(e.current_n_workers(), 1)
+        self.assertIsNone(e._parallel)
+        self.assertEqual(e.evaluate(xs), xs)
+        self.assertEqual(e.current_n_workers(), 3)
+
+        # Changing the function triggers a new choice
+        e.set_function(f_args, (1, 2))
+        self.assertIsNone(e.current_n_workers())
+        self.assertEqual(e.evaluate([1, 2]), [4, 5])
+        self.assertEqual(e.evaluate([1, 2, 3]), [4, 5, 6])
+        self.assertEqual(e.current_n_workers(), 1)
+
+        # A choice is made if calls have different numbers of positions
+        e = pints.AutoParallelEvaluator(f, max_workers=4)
+        self.assertEqual(e.evaluate([1, 2]), [1, 4])
+        self.assertIsNone(e.current_n_workers())
+        xs = list(range(40))
+        self.assertEqual(e.evaluate(xs), [f(x) for x in xs])
+        self.assertEqual(e.current_n_workers(), 1)
+        self.assertIsNone(e._parallel)
+
+        # Logging
+        logger = pints.Logger()
+        logger.set_stream(None)
+        e._log_init(logger)
+        e._log_write(logger)
+
+        # Invalid arguments
+        self.assertRaisesRegex(
+            ValueError, 'greater than 0', pints.AutoParallelEvaluator, f,
+            max_workers=0)
+        self.assertRaisesRegex(
+            ValueError, 'Drift', pints.AutoParallelEvaluator, f, drift=1)
+
+    def test_batch(self):
+
+        # Create test data
+        r = pints.toy.ParabolicError([1, 2])
+        xs = np.random.normal(0, 10, (100, 2))
+        ys = [r(x) for x in xs]
+
+        # Test batch evaluator
+        e = pints.BatchEvaluator(r)
+        self.assertTrue(np.allclose(ys, e.evaluate(xs)))
+        self.assertEqual(e.evaluate([]), [])
+
+        # Test with default (non-vectorised) implementation
+        e = pints.BatchEvaluator(pints.ProbabilityBasedError(
+            pints.toy.GaussianLogPDF([1, 2], [3, 4])))
+        self.assertEqual(len(e.evaluate(xs)), 100)
+
+        # Function must have a batch method
+        self.assertRaisesRegex(
+            ValueError, 'evaluate_batch', pints.BatchEvaluator, f)
+
+        # Controllers only use batch evaluation by default for functions
+        # that provide their own evaluate_batch()
+        class ShiftedError(pints.toy.ParabolicError):
+            def __call__(self, x):
+                return super(ShiftedError, self).__call__(x) + 1
+
+        class FlatLogPDF(pints.LogPDF):
+            def __call__(self, x):
+                return 0
+
+        overrides = pints._evaluation._overrides_evaluate_batch
+        self.assertTrue(overrides(r))
+        self.assertFalse(overrides(ShiftedError([1, 2])))
+        self.assertFalse(overrides(FlatLogPDF()))
+        self.assertFalse(overrides(f))
+
     def test_parallel(self):
 
         # Create test data
@@ -91,6 +413,13 @@ class TestEvaluators(unittest.TestCase):
         # max tasks must be >0
         self.assertRaises(ValueError, pints.ParallelEvaluator, f, 1, 0)
 
+        # Workers are replaced after max_tasks_per_worker evaluations
+        xs = np.random.normal(0, 10, 25)
+        ys = [f(x) for x in xs]
+        e = pints.ParallelEvaluator(f, n_workers=2, max_tasks_per_worker=3)
+        self.assertTrue(np.all(ys == e.evaluate(xs)))
+        self.assertTrue(np.all(ys == e.evaluate(xs)))
+
         # Exceptions in called method should trigger halt, cause new exception
         e = pints.ParallelEvaluator(ioerror_on_five, n_workers=2)
         self.assertRaisesRegex(
@@ -103,6 +432,354 @@ class TestEvaluators(unittest.TestCase):
             Exception, 'Exception in subprocess', e.evaluate, [1, 2, 4])
         e.evaluate([1, 2])
 
+    def test_parallel_shared_memory(self):
+
+        # Scalar positions
+        xs = np.random.normal(0, 10, 100)
+        ys = [f(x) for x in xs]
+        e = pints.ParallelEvaluator(f, n_workers=2, shared_memory=True)
+        self.assertTrue(np.all(ys == e.evaluate(xs)))
+
+        # Empty list of positions
+        self.assertEqual(e.evaluate([]), [])
+
+        # Vector positions, with args
+        xs = np.random.normal(0, 10, (20, 3))
+        ys = [f_sum(x, 2) for x in xs]
+        e = pints.ParallelEvaluator(
+            f_sum, n_workers=2, args=[2], shared_memory=True)
+        self.assertTrue(np.all(ys == e.evaluate(xs)))
+
+        # Evaluate a larger set of positions: buffers are reallocated
+        xs = np.random.normal(0, 10, (50, 3))
+        ys = [f_sum(x, 2) for x in xs]
+        self.assertTrue(np.all(ys == e.evaluate(xs)))
+
+        # Evaluate a smaller set: buffers are reused
+        self.assertTrue(np.all(ys[:5] == e.evaluate(xs[:5])))
+
+        # Change of shape: buffers are reallocated
+        xs = np.random.normal(0, 10, (10, 2))
+        ys = [f_sum(x, 2) for x in xs]
+        self.assertTrue(np.all(ys == e.evaluate(xs)))
+
+        # Positions must have the same shape
+        self.assertRaisesRegex(
+            ValueError, 'same shape', e.evaluate, [[1, 2], [3]])
+
+        # Exceptions are still passed on
+        e = pints.ParallelEvaluator(
+            ioerror_on_five, n_workers=2, shared_memory=True)
+        self.assertRaisesRegex(
+            Exception, 'Exception in subprocess', e.evaluate, [1, 2, 5])
+        self.assertEqual(e.evaluate([1, 2]), [1, 2])
+
+    def test_parallel_chunks(self):
+
+        # Create test data
+        xs = np.random.normal(0, 10, 100)
+        ys = [f(x) for x in xs]
+
+        # Fixed chunk size, with and without shared memory
+        for chunk_size in (1, 7, 100, 200):
+            e = pints.ParallelEvaluator(f, n_workers=3, chunk_size=chunk_size)
+            self.assertEqual(e.evaluate(xs), ys)
+            e = pints.ParallelEvaluator(
+                f, n_workers=3, chunk_size=chunk_size, shared_memory=True)
+            self.assertEqual(e.evaluate(xs), ys)
+
+        # Guided chunks
+        e = pints.ParallelEvaluator(f, n_workers=4, chunk_size='guided')
+        chunks = e._chunks(100)
+        self.assertEqual(chunks[0], (0, 25))
+        self.assertEqual(chunks[1], (25, 18))
+        self.assertEqual(chunks[-1], (99, 1))
+        self.assertEqual(sum([k for i, k in chunks]), 100)
+        self.assertEqual(e.evaluate(xs), ys)
+
+        # Automatic chunks: first evaluation uses guided chunks, next ones
+        # use a chunk size based on the time per evaluation.
+        e = pints.ParallelEvaluator(f, n_workers=4, chunk_size='auto')
+        self.assertEqual(e._chunks(100), chunks)
+        self.assertEqual(e.evaluate(xs), ys)
+        self.assertEqual(e.evaluate(xs), ys)
+        e._time_per_evaluation = 1
+        self.assertEqual(e._chunks(10), [(i, 1) for i in range(10)])
+        e._time_per_evaluation = 1e-6
+        self.assertEqual(e._chunks(10), [(0, 3), (3, 3), (6, 3), (9, 1)])
+        e._time_per_evaluation = 1e-3
+        self.assertEqual(e._chunks(100)[0], (0, 10))
+
+        # Chunks spanning multiple max_tasks_per_worker
+        e = pints.ParallelEvaluator(
+            f, n_workers=2, chunk_size=5, max_tasks_per_worker=3)
+        self.assertEqual(e.evaluate(xs), ys)
+
+        # Invalid chunk sizes
+        self.assertRaises(
+            ValueError, pints.ParallelEvaluator, f, chunk_size=0)
+        self.assertRaises(
+            ValueError, pints.ParallelEvaluator, f, chunk_size='fast')
+
+    def test_parallel_timeout(self):
+
+        # Evaluations that take too long are replaced by a sentinel value
+        xs = list(range(10))
+        for shared_memory in (False, True):
+            for chunk_size in (1, 3):
+                e = pints.ParallelEvaluator(
+                    sleep_on_three, n_workers=3, timeout=0.5,
+                    chunk_size=chunk_size, shared_memory=shared_memory)
+                ys = e.evaluate(xs)
+                self.assertEqual(ys[:3] + ys[4:], xs[:3] + xs[4:])
+                self.assertEqual(ys[3], float('inf'))
+                self.assertEqual(e.n_timeouts(), 1)
+
+                # Killed workers are replaced, and evaluator can be reused
+                self.assertEqual(len(e._workers), 3)
+                self.assertEqual(e.evaluate([4, 5]), [4, 5])
+                self.assertEqual(e.n_timeouts(), 1)
+
+        # Custom sentinel value
+        e = pints.ParallelEvaluator(
+            sleep_on_three, n_workers=2, timeout=0.5, timeout_value=-1)
+        self.assertEqual(e.evaluate([2, 3]), [2, -1])
+
+        # Default sentinel values
+        r = pints.toy.RosenbrockError()
+        e = pints.ParallelEvaluator(r, timeout=1)
+        self.assertEqual(e._timeout_result(), float('inf'))
+        e.set_function(r.evaluateS1)
+        y, dy = e._timeout_result()
+        self.assertEqual(y, float('inf'))
+        self.assertTrue(np.all(dy == np.zeros(2)))
+        p = pints.toy.GaussianLogPDF([1, 2, 3], [1, 1, 1])
+        e.set_function(p)
+        self.assertEqual(e._timeout_result(), float('-inf'))
+        e.set_function(p.evaluateS1)
+        y, dy = e._timeout_result()
+        self.assertEqual(y, float('-inf'))
+        self.assertTrue(np.all(dy == np.zeros(3)))
+
+        # Speculative re-execution of stragglers
+        e = pints.ParallelEvaluator(
+            sleep_briefly_on_three, n_workers=3, speculative=True)
+        self.assertEqual(e.evaluate(xs), xs)
+        self.assertEqual(e.n_stragglers(), 1)
+        self.assertEqual(e.n_timeouts(), 0)
+        self.assertEqual(e.evaluate(xs), xs)
+        self.assertEqual(e.n_stragglers(), 2)
+
+        # Timeouts and stragglers are shown in the controller log
+        e = pints.ParallelEvaluator(
+            r, n_workers=2, timeout=10, speculative=True)
+        opt = pints.OptimisationController(r, [1.1, 1.1], method=pints.XNES)
+        opt.set_max_iterations(3)
+        opt.set_parallel(e)
+        with StreamCapture() as c:
+            opt.run()
+        self.assertIn('Timeouts Stragglers', c.text())
+
+        # Invalid timeout
+        self.assertRaisesRegex(
+            ValueError, 'Timeout', pints.ParallelEvaluator, f, timeout=0)
+
+    def test_stats(self):
+
+        # Statistics are collected by sequential and parallel evaluators
+        xs = list(range(10))
+        evaluators = [
+            pints.SequentialEvaluator(f, stats=True),
+            pints.ParallelEvaluator(f, n_workers=2, stats=True),
+            pints.ParallelEvaluator(
+                f, n_workers=2, stats=True, shared_memory=True),
+            pints.ParallelEvaluator(
+                f, n_workers=2, stats=True, chunk_size=3, timeout=10),
+        ]
+        for e in evaluators:
+            self.assertEqual(e.evaluate(xs), [f(x) for x in xs])
+            self.assertEqual(e.evaluate(xs[:4]), [f(x) for x in xs[:4]])
+            s = e.stats()
+            self.assertIsInstance(s, pints.EvaluatorStats)
+            self.assertEqual(s.n_calls(), 2)
+            self.assertEqual(s.n_evaluations(), 14)
+            self.assertEqual(len(s.evaluation_times()), 14)
+            self.assertTrue(np.all(s.evaluation_times() >= 0))
+            self.assertAlmostEqual(
+                np.sum(s.task_times()), np.sum(s.evaluation_times()))
+            self.assertGreater(s.wall_time(), 0)
+            self.assertGreater(s.mean_evaluation_time(), 0)
+            self.assertGreater(s.utilisation(), 0)
+            self.assertLessEqual(s.utilisation(), 1)
+            self.assertGreaterEqual(s.queue_wait_time(), 0)
+            self.assertGreaterEqual(s.serialisation_time(), 0)
+            self.assertEqual(s.n_respawns(), 0)
+            p = s.slowest_tasks()
+            self.assertEqual(len(p), 4)
+            self.assertEqual(p[-1], np.max(s.task_times()))
+            self.assertTrue(np.all(p[1:] >= p[:-1]))
+
+            # Statistics can be reset
+            s.reset()
+            self.assertEqual(s.n_calls(), 0)
+            self.assertEqual(s.n_evaluations(), 0)
+            self.assertEqual(s.mean_evaluation_time(), 0)
+            self.assertEqual(s.utilisation(), 0)
+            self.assertTrue(np.all(s.slowest_tasks([50, 100]) == 0))
+
+        # Respawns after the maximum number of tasks are counted
+        e = pints.ParallelEvaluator(
+            f, n_workers=1, max_tasks_per_worker=3, stats=True)
+        self.assertEqual(e.evaluate(xs), [f(x) for x in xs])
+        self.assertGreaterEqual(e.stats().n_respawns(), 3)
+
+        # Statistics are disabled by default
+        self.assertIsNone(pints.SequentialEvaluator(f).stats())
+        self.assertIsNone(pints.ParallelEvaluator(f).stats())
+
+        # A summary is shown in the controller log
+        r = pints.toy.RosenbrockError()
+        for e in (pints.SequentialEvaluator(r, stats=True),
+                  pints.ParallelEvaluator(r, n_workers=2, stats=True)):
+            opt = pints.OptimisationController(
+                r, [1.1, 1.1], method=pints.XNES)
+            opt.set_max_iterations(3)
+            opt.set_parallel(e)
+            with TemporaryDirectory() as d:
+                path = d.path('log.csv')
+                opt.set_log_to_file(path, csv=True)
+                with StreamCapture() as c:
+                    opt.run()
+                with open(path, 'r') as f_log:
+                    header = f_log.readline()
+            self.assertIn('Mean eval.', c.text())
+            self.assertIn('Util.', c.text())
+            self.assertIn('Respawns', c.text())
+            self.assertNotIn('Wait', c.text())
+            self.assertIn('"Wait","Serialisation","Slowest task"', header)
+            self.assertEqual(e.stats().n_evaluations(), 3 * 6)
+
+    def test_parallel_threads_and_pinning(self):
+
+        # Native thread pools are limited in each worker, with a warning if
+        # this can't be done for libraries that are already loaded
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            e = pints.ParallelEvaluator(
+                thread_limit, n_workers=2, max_threads_per_worker=1)
+        installed = pints._evaluation._threadpoolctl() is not None
+        self.assertEqual(len(w), 0 if installed else 1)
+        if not installed:
+            self.assertIn('threadpoolctl', str(w[0].message))
+        self.assertEqual(e.evaluate([1, 2]), ['1', '1'])
+        self.assertRaisesRegex(
+            ValueError, 'threads per worker', pints.ParallelEvaluator, f,
+            max_threads_per_worker=0)
+
+        # Workers can be pinned to CPU cores
+        if not hasattr(os, 'sched_setaffinity'):    # pragma: no cover
+            return
+        cpus = sorted(os.sched_getaffinity(0))
+        e = pints.ParallelEvaluator(affinity, n_workers=2, pin_workers=True)
+        for cores in e.evaluate(list(range(10))):
+            self.assertEqual(len(cores), 1)
+            self.assertIn(cores[0], cpus)
+        slots = sorted(w.slot for w in e._workers)
+        self.assertEqual(slots, [0, 1])
+
+    def test_set_function(self):
+
+        # Sequential and threaded evaluators
+        xs = np.random.normal(0, 10, 10)
+        for e in (pints.SequentialEvaluator(f), pints.ThreadedEvaluator(f)):
+            self.assertEqual(e.evaluate(xs), [f(x) for x in xs])
+            e.set_function(f_args, [1, 2])
+            self.assertEqual(e.evaluate(xs), [f_args(x, 1, 2) for x in xs])
+            self.assertRaisesRegex(
+                ValueError, 'callable', e.set_function, 3)
+            self.assertRaisesRegex(
+                ValueError, 'sequence', e.set_function, f, 1)
+
+        # Batch evaluator
+        e = pints.BatchEvaluator(pints.toy.ParabolicError())
+        self.assertRaisesRegex(
+            ValueError, 'evaluate_batch', e.set_function, f)
+
+        # Parallel evaluator: workers are kept alive
+        for shared_memory in (False, True):
+            e = pints.ParallelEvaluator(
+                f, n_workers=2, shared_memory=shared_memory)
+            self.assertEqual(e.n_workers(), 2)
+            self.assertEqual(e.evaluate(xs), [f(x) for x in xs])
+            pids = sorted(w.pid for w in e._workers)
+            e.set_function(f_args, [1, 2])
+            self.assertEqual(e.evaluate(xs), [f_args(x, 1, 2) for x in xs])
+            e.set_function(f_sum, [3])
+            self.assertEqual(e.evaluate(xs), [f_sum(x, 3) for x in xs])
+            self.assertEqual(sorted(w.pid for w in e._workers), pids)
+
+        # Workers created after a change use the new function
+        e = pints.ParallelEvaluator(f, n_workers=2, max_tasks_per_worker=3)
+        self.assertEqual(e.evaluate(xs), [f(x) for x in xs])
+        e.set_function(f_sum, [3])
+        self.assertEqual(e.evaluate(xs), [f_sum(x, 3) for x in xs])
+
+        # Functions that can't be pickled are passed to new workers
+        e = pints.ParallelEvaluator(f, n_workers=2)
+        self.assertEqual(e.evaluate(xs), [f(x) for x in xs])
+        e.set_function(lambda x: 2 * x)
+        self.assertEqual(e.evaluate(xs), [2 * x for x in xs])
+
+    def test_threaded(self):
+
+        # Create test data
+        xs = np.random.normal(0, 10, 100)
+        ys = [f(x) for x in xs]
+
+        # Test threaded evaluator
+        e = pints.ThreadedEvaluator(f, n_workers=3)
+        self.assertEqual(e.evaluate(xs), ys)
+
+        # Threads are reused
+        threads = list(e._threads)
+        self.assertEqual(len(threads), 3)
+        self.assertEqual(e.evaluate(xs), ys)
+        self.assertEqual(e._threads, threads)
+
+        # Default number of threads
+        e = pints.ThreadedEvaluator(f)
+        self.assertEqual(e.evaluate(xs), ys)
+        self.assertEqual(len(e._threads), pints.ParallelEvaluator.cpu_count())
+
+        # Function must be callable
+        self.assertRaises(ValueError, pints.ThreadedEvaluator, 3)
+
+        # Argument must be sequence
+        self.assertRaises(ValueError, e.evaluate, 1)
+
+        # Test args
+        e = pints.ThreadedEvaluator(f_args, args=[10, 20])
+        self.assertEqual(e.evaluate([1]), [31])
+
+        # Args must be a sequence
+        self.assertRaises(ValueError, pints.ThreadedEvaluator, f_args, args=1)
+
+        # n-workers must be >0
+        self.assertRaises(ValueError, pints.ThreadedEvaluator, f, 0)
+
+        # Exceptions in called method should cause new exception, after which
+        # the evaluator can still be used
+        e = pints.ThreadedEvaluator(ioerror_on_five, n_workers=2)
+        self.assertRaisesRegex(
+            Exception, 'Exception in thread', e.evaluate, [1, 2, 5])
+        self.assertEqual(e.evaluate([1, 2]), [1, 2])
+
+        # System exit
+        e = pints.ThreadedEvaluator(system_exit_on_four, n_workers=2)
+        self.assertRaisesRegex(
+            Exception, 'Exception in thread', e.evaluate, [1, 2, 4])
+        self.assertEqual(e.evaluate([1, 2]), [1, 2])
+
     def test_worker(self):
         """
         Manual test of worker, since cover doesn't pick up on its run method.
@@ -115,18 +792,21 @@ class TestEvaluators(unittest.TestCase):
         results = multiprocessing.Queue()
         errors = multiprocessing.Queue()
         error = multiprocessing.Event()
-        tasks.put((0, 1))
-        tasks.put((1, 2))
-        tasks.put((2, 3))
+        tasks.put((0, [1]))
+        tasks.put((1, [2]))
+        tasks.put((2, [3]))
         max_tasks = 3
 
         w = Worker(
             interrupt_on_30, (), tasks, results, max_tasks, errors, error)
         w.run()
 
-        self.assertEqual(results.get(timeout=0.01), (0, 2))
-        self.assertEqual(results.get(timeout=0.01), (1, 4))
-        self.assertEqual(results.get(timeout=0.01), (2, 6))
+        self.assertEqual(results.get(timeout=0.01), (0, [2]))
+        self.assertEqual(results.get(timeout=0.01), (1, [4]))
+        self.assertEqual(results.get(timeout=0.01), (2, [6]))
+
+        # Worker notifies evaluator that it's exiting
+        self.assertEqual(results.get(timeout=0.01), (None, None))
         self.assertTrue(results.empty())
 
         # Test worker stops if error flag is set
@@ -134,16 +814,16 @@ class TestEvaluators(unittest.TestCase):
         results = multiprocessing.Queue()
         errors = multiprocessing.Queue()
         error = multiprocessing.Event()
-        tasks.put((0, 1))
-        tasks.put((1, 2))
-        tasks.put((2, 3))
+        tasks.put((0, [1]))
+        tasks.put((1, [2]))
+        tasks.put((2, [3]))
         error.set()
 
         w = Worker(
             interrupt_on_30, (), tasks, results, max_tasks, errors, error)
         w.run()
 
-        self.assertEqual(results.get(timeout=0.01), (0, 2))
+        self.assertEqual(results.get(timeout=0.01), (0, [2]))
         self.assertTrue(results.empty())
 
         # Tests worker catches, stores and halts on exception
@@ -151,20 +831,157 @@ class TestEvaluators(unittest.TestCase):
         results = multiprocessing.Queue()
         errors = multiprocessing.Queue()
         error = multiprocessing.Event()
-        tasks.put((0, 1))
-        tasks.put((1, 30))
-        tasks.put((2, 3))
+        tasks.put((0, [1]))
+        tasks.put((1, [30]))
+        tasks.put((2, [3]))
 
         w = Worker(
             interrupt_on_30, (), tasks, results, max_tasks, errors, error)
         w.run()
 
-        self.assertEqual(results.get(timeout=0.01), (0, 2))
+        self.assertEqual(results.get(timeout=0.01), (0, [2]))
+        self.assertEqual(results.get(timeout=0.01), (None, None))
         self.assertTrue(results.empty())
         self.assertTrue(error.is_set())
         #self.assertFalse(errors.empty())   # Fails on travis!
         self.assertIsNotNone(errors.get(timeout=0.01))
 
+        # Test worker with shared memory
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        errors = multiprocessing.Queue()
+        error = multiprocessing.Event()
+        positions = multiprocessing.RawArray('d', [1, 2, 3, 4, 5, 6])
+        values = multiprocessing.RawArray('d', 3)
+        tasks.put((0, 1))
+        tasks.put((1, 2))
+
+        w = Worker(
+            f_sum, (1, ), tasks, results, 3, errors, error, positions,
+            values, (2, ))
+        w.run()
+
+        self.assertEqual(results.get(timeout=0.01), (0, 1))
+        self.assertEqual(results.get(timeout=0.01), (1, 2))
+        self.assertEqual(results.get(timeout=0.01), (None, None))
+        self.assertEqual(list(values), [4, 8, 12])
+
+        # Test worker with tasks containing multiple positions
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        errors = multiprocessing.Queue()
+        error = multiprocessing.Event()
+        tasks.put((0, [1, 2, 3]))
+        tasks.put((3, [4, 5]))
+        tasks.put((5, [6]))
+
+        w = Worker(interrupt_on_30, (), tasks, results, 4, errors, error)
+        w.run()
+
+        self.assertEqual(results.get(timeout=0.01), (0, [2, 4, 6]))
+        self.assertEqual(results.get(timeout=0.01), (3, [8, 10]))
+        self.assertEqual(results.get(timeout=0.01), (None, None))
+        self.assertFalse(tasks.empty())
+
+        # Test worker receiving a new function
+        import pickle
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        errors = multiprocessing.Queue()
+        error = multiprocessing.Event()
+        control = multiprocessing.Queue()
+        version = multiprocessing.RawValue('i', 3)
+        tasks.put((0, [1]))
+        tasks.put((1, [2]))
+
+        w = Worker(
+            interrupt_on_30, (), tasks, results, 2, errors, error,
+            control=control, version=version)
+        self.assertIs(w.control, control)
+        version.value = 4
+        control.put(pickle.dumps((4, f_sum, (10, ))))
+        w.run()
+
+        self.assertEqual(results.get(timeout=0.01), (0, [11]))
+        self.assertEqual(results.get(timeout=0.01), (1, [12]))
+
+        # Test worker reporting its status, and skipping old tasks
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        errors = multiprocessing.Queue()
+        error = multiprocessing.Event()
+        status = multiprocessing.RawArray('d', 10)
+        call = multiprocessing.RawValue('i', 2)
+        tasks.put((0, [1, 2], 1))
+        tasks.put((2, [3, 4], 2))
+        tasks.put((4, [5]))
+
+        w = Worker(
+            interrupt_on_30, (), tasks, results, 3, errors, error,
+            status=status, slot=1, call=call)
+        self.assertEqual(w.slot, 1)
+        w.run()
+
+        self.assertEqual(results.get(timeout=0.01), (2, [6, 8], 2))
+        self.assertEqual(results.get(timeout=0.01), (4, [10]))
+        self.assertEqual(list(status), [0] * 5 + [2, 2, 3, 0, 2])
+
+        # Test worker collecting statistics
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        errors = multiprocessing.Queue()
+        error = multiprocessing.Event()
+        tasks.put((0, pickle.dumps([1, 2]), None, time.time()))
+        tasks.put((2, [3], None, time.time()))
+
+        w = Worker(interrupt_on_30, (), tasks, results, 3, errors, error)
+        w.run()
+
+        i, fs, call, (wait, times, serialisation) = results.get(timeout=0.01)
+        self.assertEqual((i, pickle.loads(fs), call), (0, [2, 4], None))
+        self.assertGreaterEqual(wait, 0)
+        self.assertEqual(len(times), 2)
+        self.assertGreater(serialisation, 0)
+        i, fs, call, (wait, times, serialisation) = results.get(timeout=0.01)
+        self.assertEqual((i, pickle.loads(fs), call), (2, [6], None))
+        self.assertEqual(len(times), 1)
+
+        # Test worker tolerating errors, with and without shared memory
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        errors = multiprocessing.Queue()
+        error = multiprocessing.Event()
+        tasks.put((0, [2, 3]))
+        tasks.put((2, [4]))
+
+        w = Worker(
+            fail_on_three, (), tasks, results, 3, errors, error,
+            tolerant=True)
+        w.run()
+
+        i, fs = results.get(timeout=0.01)
+        self.assertEqual((i, fs[0]), (0, 2))
+        self.assertIn('Bad position', fs[1].trace)
+        self.assertFalse(error.is_set())
+
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        positions = multiprocessing.RawArray('d', [1, 2, 3, 7])
+        values = multiprocessing.RawArray('d', 4)
+        tasks.put((0, 2))
+        tasks.put((2, 2))
+
+        w = Worker(
+            fail_on_three, (), tasks, results, 4, errors, error, positions,
+            values, (), tolerant=True)
+        w.run()
+
+        self.assertEqual(results.get(timeout=0.01), (0, 2))
+        i, fs = results.get(timeout=0.01)
+        self.assertEqual((i, fs[1]), (2, 7))
+        self.assertIn('Bad position', fs[0].trace)
+        self.assertEqual(list(values), [1, 2, 0, 7])
+
 
 def f(x):
     """
@@ -178,6 +995,10 @@ def f_args(x, y, z):
     return x + y + z
 
 
+def f_sum(x, y):
+    return np.sum(x) + y
+
+
 def ioerror_on_five(x):
     if x == 5:
         raise IOError
@@ -196,6 +1017,44 @@ def system_exit_on_four(x):
     return x
 
 
+def sleep_on_three(x):
+    if x == 3:
+        time.sleep(60)
+    return x
+
+
+def fail_on_three(x):
+    if x == 3:
+        raise ValueError('Bad position')
+    if x == 4:
+        return float('nan')
+    if x == 5:
+        return float('inf')
+    if x == 6:
+        return float('-inf')
+    return x
+
+
+def thread_limit(x):
+    return os.environ.get('OMP_NUM_THREADS')
+
+
+def affinity(x):
+    return sorted(os.sched_getaffinity(0))
+
+
+def sleep_above_ten(x):
+    if x > 10:
+        time.sleep(0.05)
+    return x
+
+
+def sleep_briefly_on_three(x):
+    if x == 3:
+        time.sleep(1)
+    return x
+
+
 if __name__ == '__main__':
     print('Add -v for more debug output')
     import sys
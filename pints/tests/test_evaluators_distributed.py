@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+#
+# Tests the distributed evaluator.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import multiprocessing.connection
+import os
+import signal
+import time
+import unittest
+import numpy as np
+import pints
+import pints.toy
+
+from shared import TemporaryDirectory
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
+
+class TestDistributedEvaluator(unittest.TestCase):
+    """
+    Tests the distributed evaluator, using workers on the local machine.
+    """
+    def test_evaluate(self):
+        # Test basic evaluation
+
+        e = pints.DistributedEvaluator(f, chunk_size=3)
+        try:
+            e.start_local_workers(2)
+            self.assertEqual(e.n_workers(), 2)
+            xs = np.random.normal(0, 10, 20)
+            self.assertEqual(e.evaluate(xs), [f(x) for x in xs])
+            self.assertEqual(e.evaluate([]), [])
+
+            # Change function
+            e.set_function(f_args, (1, 2))
+            self.assertEqual(e.evaluate([1, 2]), [4, 5])
+
+            # Errors in workers are raised, after which the evaluator can
+            # still be used
+            e.set_function(ioerror_on_five)
+            self.assertRaisesRegex(
+                Exception, 'in remote worker', e.evaluate, range(10))
+            self.assertEqual(e.evaluate([1, 2]), [1, 2])
+
+            # Asynchronous interface
+            futures = [e.submit(x) for x in range(3)]
+            self.assertEqual(
+                set([x.result() for x in e.as_completed(futures)]),
+                set([0, 1, 2]))
+        finally:
+            e.close()
+
+        # Closed evaluators can't be used
+        self.assertRaisesRegex(RuntimeError, 'closed', e.evaluate, [1])
+        e.close()
+
+    def test_authentication(self):
+        # Workers must know the key to connect
+
+        e = pints.DistributedEvaluator(f, authkey=b'abc')
+        try:
+            self.assertEqual(e.authkey(), b'abc')
+            self.assertRaises(
+                multiprocessing.AuthenticationError,
+                multiprocessing.connection.Client, e.address(),
+                authkey=b'def')
+            self.assertEqual(e.n_workers(), 0)
+        finally:
+            e.close()
+
+    def test_requeue(self):
+        # Test that tasks from dead or unresponsive workers are sent to other
+        # workers
+
+        with TemporaryDirectory() as d:
+
+            # Worker process exits
+            e = pints.DistributedEvaluator(
+                exit_once, args=(d.path('exit'), ), heartbeat_interval=0.05,
+                heartbeat_timeout=1)
+            try:
+                e.start_local_workers(2)
+                self.assertEqual(e.evaluate(range(10)), list(range(10)))
+                self.assertTrue(os.path.isfile(d.path('exit')))
+                self.assertEqual(e.n_workers(), 1)
+            finally:
+                e.close()
+
+            # Worker stops sending heartbeats
+            if not hasattr(signal, 'SIGSTOP'):  # pragma: no cover
+                return
+            e = pints.DistributedEvaluator(
+                stop_once, args=(d.path('stop'), ), heartbeat_interval=0.05,
+                heartbeat_timeout=0.5)
+            try:
+                e.start_local_workers(2)
+                self.assertEqual(e.evaluate(range(10)), list(range(10)))
+                self.assertTrue(os.path.isfile(d.path('stop')))
+                self.assertEqual(e.n_workers(), 1)
+            finally:
+                for p in e._local_workers:
+                    os.kill(p.pid, signal.SIGCONT)
+                e.close()
+
+    def test_no_workers(self):
+        # Test error if no workers connect
+
+        e = pints.DistributedEvaluator(f, connect_timeout=0.2)
+        try:
+            self.assertRaisesRegex(
+                Exception, 'No workers', e.evaluate, [1, 2])
+        finally:
+            e.close()
+
+    def test_bad_arguments(self):
+        # Test invalid constructor arguments
+
+        self.assertRaisesRegex(
+            ValueError, 'Chunk size', pints.DistributedEvaluator, f,
+            chunk_size=0)
+        self.assertRaisesRegex(
+            ValueError, 'interval', pints.DistributedEvaluator, f,
+            heartbeat_interval=0)
+        self.assertRaisesRegex(
+            ValueError, 'timeout', pints.DistributedEvaluator, f,
+            heartbeat_interval=2, heartbeat_timeout=1)
+        self.assertRaisesRegex(
+            ValueError, 'Connect', pints.DistributedEvaluator, f,
+            connect_timeout=0)
+        e = pints.DistributedEvaluator(f)
+        self.assertRaisesRegex(
+            ValueError, 'at least 1', e.start_local_workers, 0)
+        e.close()
+
+    def test_controller(self):
+        # Test using a distributed evaluator with an optimisation
+
+        r = pints.toy.RosenbrockError()
+        e = pints.DistributedEvaluator(r)
+        try:
+            e.start_local_workers(2)
+            opt = pints.OptimisationController(
+                r, [1.1, 1.1], method=pints.XNES)
+            opt.set_max_iterations(10)
+            opt.set_log_to_screen(False)
+            opt.set_parallel(e)
+            self.assertEqual(opt.parallel(), 2)
+            opt.run()
+        finally:
+            e.close()
+
+
+def f(x):
+    """ Test function (must be picklable). """
+    return x ** 2
+
+
+def f_args(x, y, z):
+    return x + y + z
+
+
+def ioerror_on_five(x):
+    if x == 5:
+        raise IOError
+    return x
+
+
+def exit_once(x, path):
+    """ Makes the first worker to evaluate ``x = 3`` exit. """
+    if x == 3 and not os.path.isfile(path):
+        with open(path, 'w') as f:
+            f.write('exit')
+        os._exit(1)
+    return x
+
+
+def stop_once(x, path):
+    """ Makes the first worker to evaluate ``x = 3`` stop responding. """
+    if x == 3 and not os.path.isfile(path):
+        with open(path, 'w') as f:
+            f.write('stop')
+        os.kill(os.getpid(), signal.SIGSTOP)
+        time.sleep(0.1)
+    return x
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@
 #
 from __future__ import print_function, unicode_literals
 import os
+import pickle
 import sys
 import pints
 import pints.io
@@ -103,6 +104,50 @@ class TestIO(unittest.TestCase):
                 self.assertRaises(
                     IOError, pints.io.load_samples, filename, 10)
 
+    def test_load_array(self):
+        # Tests loading memory-mapped arrays with load_array()
+
+        with TemporaryDirectory() as d:
+            # Load .npy file
+            x = np.random.normal(size=(100, 3))
+            np.save(d.path('x.npy'), x)
+            y = pints.io.load_array(d.path('x.npy'))
+            self.assertIsInstance(y, np.memmap)
+            self.assertEqual(y.shape, (100, 3))
+            self.assertTrue(np.all(x == y))
+            self.assertFalse(y.flags.writeable)
+            self.assertRaisesRegex(
+                ValueError, 'can not be used', pints.io.load_array,
+                d.path('x.npy'), shape=(3, 100))
+
+            # Pickled by reference
+            s = pickle.dumps(y[50:])
+            self.assertLess(len(s), 1000)
+            self.assertTrue(np.all(pickle.loads(s) == x[50:]))
+
+            # Fortran ordered arrays are not supported
+            np.save(d.path('f.npy'), np.asfortranarray(x))
+            self.assertRaisesRegex(
+                ValueError, 'Fortran', pints.io.load_array, d.path('f.npy'))
+
+            # Raw binary files
+            x = np.arange(12, dtype=np.float32)
+            x.tofile(d.path('x.bin'))
+            y = pints.io.load_array(d.path('x.bin'), dtype=np.float32)
+            self.assertEqual(y.dtype, np.float32)
+            self.assertTrue(np.all(x == y))
+            y = pints.io.load_array(
+                d.path('x.bin'), np.float32, (2, 5), offset=8)
+            self.assertTrue(np.all(x[2:].reshape((2, 5)) == y))
+            y = pints.io.load_array(d.path('x.bin'))
+            self.assertEqual(y.shape, (6, ))
+            self.assertRaisesRegex(
+                ValueError, 'too small', pints.io.load_array,
+                d.path('x.bin'), shape=(7, ))
+            self.assertRaisesRegex(
+                ValueError, 'negative', pints.io.load_array,
+                d.path('x.bin'), offset=-1)
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
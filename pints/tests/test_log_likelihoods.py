@@ -7,11 +7,20 @@
 #  For licensing information, see the LICENSE file distributed with the PINTS
 #  software package.
 #
+import pickle
 import unittest
 import pints
 import pints.toy
 import numpy as np
 
+from shared import CountingModel
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
 
 class TestLogLikelihood(unittest.TestCase):
 
@@ -695,6 +704,237 @@ class TestLogLikelihood(unittest.TestCase):
                                          0.0, 0.9, 2.0]),
             -214.17034137601107)
 
+    def test_evaluateS1_simulations(self):
+        # Test that evaluateS1 runs a single simulation, and uses it for both
+        # the value and the gradient
+
+        # Single and multi-output problems
+        model = CountingModel(pints.toy.LogisticModel())
+        times = np.linspace(0, 100, 50)
+        values = model.simulate([0.1, 50], times) + np.random.normal(0, 1, 50)
+        single = pints.SingleOutputProblem(model, times, values)
+        multi_model = CountingModel(pints.toy.ConstantModel(2))
+        multi = pints.MultiOutputProblem(
+            multi_model, times, np.random.normal(size=(50, 2)))
+
+        gaussian = pints.GaussianLogLikelihood(single)
+        log_likelihoods = [
+            (gaussian, [0.1, 50, 2]),
+            (pints.GaussianLogLikelihood(multi), [1, 2, 1, 3]),
+            (pints.GaussianKnownSigmaLogLikelihood(single, 2), [0.1, 50]),
+            (pints.GaussianKnownSigmaLogLikelihood(multi, 2), [1, 2]),
+            (pints.ScaledLogLikelihood(gaussian), [0.1, 50, 2]),
+            (pints.SumOfIndependentLogPDFs([gaussian, gaussian]),
+             [0.1, 50, 2]),
+            (pints.LogPosterior(gaussian, pints.UniformLogPrior(
+                [0, 0, 0], [1, 100, 10])), [0.1, 50, 2]),
+        ]
+        for log_likelihood, x in log_likelihoods:
+            model.reset()
+            multi_model.reset()
+            L, dL = log_likelihood.evaluateS1(x)
+            n = 2 if isinstance(
+                log_likelihood, pints.SumOfIndependentLogPDFs) else 1
+            self.assertEqual(model.n_simulate + multi_model.n_simulate, 0)
+            self.assertEqual(
+                model.n_simulateS1 + multi_model.n_simulateS1, n)
+            self.assertAlmostEqual(L, log_likelihood(x))
+
+    def test_model_cache(self):
+        # Test that changing only the noise parameters doesn't require new
+        # simulations
+
+        model = CountingModel(pints.toy.LogisticModel())
+        times = np.linspace(0, 100, 50)
+        values = model.simulate([0.1, 50], times) + np.random.normal(0, 1, 50)
+        problem = pints.SingleOutputProblem(model, times, values)
+        model.reset()
+
+        log_likelihoods = [
+            (pints.AR1LogLikelihood(problem), [0.5, 2]),
+            (pints.ARMA11LogLikelihood(problem), [0.5, 0.3, 2]),
+            (pints.GaussianLogLikelihood(problem), [2]),
+            (pints.StudentTLogLikelihood(problem), [3, 2]),
+            (pints.CauchyLogLikelihood(problem), [2]),
+        ]
+        for f, noise in log_likelihoods:
+            x = [0.1, 50] + noise
+            y = [0.1, 50] + [1.1 * p for p in noise]
+
+            # Caching is disabled by default
+            self.assertEqual(f.model_cache_size(), 0)
+            f(x)
+            f(y)
+            self.assertEqual(model.n_simulate, 2)
+            model.reset()
+
+            f.set_model_cache_size(1)
+            self.assertEqual(f.model_cache_size(), 1)
+            fx = f(x)
+            self.assertEqual(model.n_simulate, 1)
+            f(y)
+            self.assertEqual(model.n_simulate, 1)
+            self.assertEqual(f(x), fx)
+            self.assertEqual(model.n_simulate, 1)
+            f([0.11, 50] + noise)
+            self.assertEqual(model.n_simulate, 2)
+            f(x)
+            self.assertEqual(model.n_simulate, 3)
+
+            # Larger cache
+            f.set_model_cache_size(2)
+            f([0.11, 50] + noise)
+            f(y)
+            self.assertEqual(model.n_simulate, 4)
+
+            # Disabled cache
+            f.set_model_cache_size(0)
+            self.assertEqual(f(x), fx)
+            self.assertEqual(model.n_simulate, 5)
+            model.reset()
+        self.assertRaisesRegex(
+            ValueError, 'negative', f.set_model_cache_size, -1)
+
+        # Sensitivities are cached too, and can be used by evaluate()
+        f = pints.GaussianLogLikelihood(problem)
+        f.set_model_cache_size(1)
+        fx, dfx = f.evaluateS1([0.1, 50, 2])
+        self.assertEqual(f.evaluateS1([0.1, 50, 2])[0], fx)
+        self.assertEqual(f([0.1, 50, 2]), fx)
+        f.evaluateS1([0.1, 50, 3])
+        self.assertEqual(model.n_simulateS1, 1)
+        self.assertEqual(model.n_simulate, 0)
+
+        # Scaled log-likelihoods use the cache of the wrapped likelihood
+        g = pints.ScaledLogLikelihood(f)
+        g.set_model_cache_size(3)
+        self.assertEqual(f.model_cache_size(), 3)
+        self.assertEqual(g.model_cache_size(), 3)
+
+        # Cached results are not pickled
+        h = pickle.loads(pickle.dumps(f))
+        self.assertEqual(len(h._model_cache), 0)
+        self.assertEqual(len(f._model_cache), 1)
+        self.assertEqual(h([0.1, 50, 2]), fx)
+        self.assertEqual(len(h._model_cache), 1)
+
+        # The cache can be shared by several threads
+        xs = [[0.1, 50, 1 + i % 5] for i in range(100)]
+        xs += [[0.1 + 0.01 * (i % 3), 50, 2] for i in range(100)]
+        f.set_model_cache_size(2)
+        e = pints.ThreadedEvaluator(f, n_workers=4)
+        h.set_model_cache_size(0)
+        self.assertEqual(e.evaluate(xs), [h(x) for x in xs])
+
+    def test_evaluateS1_finite_differences(self):
+        # Test the gradients of all log-likelihoods with finite differences
+
+        def finite_differences(f, x, h=1e-6):
+            x = np.array(x, dtype=float)
+            g = np.zeros(len(x))
+            for i in range(len(x)):
+                a, b = np.array(x), np.array(x)
+                a[i] += h
+                b[i] -= h
+                g[i] = (f(a) - f(b)) / (2 * h)
+            return g
+
+        # Single and multi-output problems
+        np.random.seed(1)
+        model = pints.toy.LogisticModel()
+        times = np.linspace(0, 100, 50)
+        values = model.simulate([0.1, 50], times) + np.random.normal(0, 2, 50)
+        single = pints.SingleOutputProblem(model, times, values)
+        model = TwoLogisticsModel()
+        values = model.simulate([0.1, 50], times)
+        values += np.random.normal(0, 2, values.shape)
+        multi = pints.MultiOutputProblem(model, times, values)
+
+        log_likelihoods = [
+            (pints.AR1LogLikelihood(single), [0.1, 50, 0.5, 2]),
+            (pints.AR1LogLikelihood(multi), [0.1, 50, 0.5, 2, -0.3, 3]),
+            (pints.ARMA11LogLikelihood(single), [0.1, 50, 0.5, 0.3, 2]),
+            (pints.ARMA11LogLikelihood(multi),
+             [0.1, 50, 0.5, 0.3, 2, -0.3, 0.2, 3]),
+            (pints.CauchyLogLikelihood(single), [0.1, 50, 2]),
+            (pints.CauchyLogLikelihood(multi), [0.1, 50, 2, 3]),
+            (pints.GaussianIntegratedUniformLogLikelihood(single, 0, 100),
+             [0.1, 50]),
+            (pints.GaussianIntegratedUniformLogLikelihood(single, 1, 3),
+             [0.1, 50]),
+            (pints.GaussianIntegratedUniformLogLikelihood(
+                multi, [1, 0], [3, 5]), [0.1, 50]),
+            (pints.StudentTLogLikelihood(single), [0.1, 50, 3, 2]),
+            (pints.StudentTLogLikelihood(multi), [0.1, 50, 3, 2, 5, 3]),
+        ]
+        for f, x in log_likelihoods:
+            L, dL = f.evaluateS1(x)
+            self.assertAlmostEqual(L, f(x))
+            self.assertEqual(dL.shape, (f.n_parameters(), ))
+            self.assertTrue(np.allclose(
+                dL, finite_differences(f, x), rtol=1e-5, atol=1e-6))
+
+    def test_evaluate_outputs(self):
+        # Tests vectorised evaluation from stacks of model outputs
+
+        model = pints.toy.LogisticModel()
+        times = np.linspace(0, 100, 30)
+        values = model.simulate([0.1, 50], times)
+        single = pints.SingleOutputProblem(
+            model, times, values + np.random.normal(0, 1, values.shape))
+        model = TwoLogisticsModel()
+        values = model.simulate([0.1, 50], times)
+        multi = pints.MultiOutputProblem(
+            model, times, values + np.random.normal(0, 1, values.shape))
+
+        xs = np.array([[0.1, 50], [0.12, 45], [0.09, 52]])
+        for p in (single, multi):
+            no = p.n_outputs()
+            ys = p.evaluate_batch(xs)
+            sigmas = np.random.uniform(0.5, 2, (3, no))
+            log_likelihoods = [
+                (pints.GaussianKnownSigmaLogLikelihood(p, 1.5), xs),
+                (pints.GaussianKnownSigmaLogLikelihood(p, [1.5] * no), xs),
+                (pints.GaussianLogLikelihood(p), np.hstack((xs, sigmas))),
+            ]
+            for f, zs in log_likelihoods:
+                fz = [f(z) for z in zs]
+                self.assertTrue(np.allclose(f.evaluate_outputs(zs, ys), fz))
+                self.assertTrue(np.allclose(f.evaluate_batch(zs), fz))
+                self.assertEqual(f.evaluate_batch(zs[:0]).shape, (0, ))
+                self.assertRaisesRegex(
+                    ValueError, 'shape', f.evaluate_outputs, zs, ys[:, 1:])
+
+            # Scaled log-likelihoods use the vectorised method too
+            f = pints.ScaledLogLikelihood(log_likelihoods[2][0])
+            zs = log_likelihoods[2][1]
+            self.assertTrue(np.allclose(
+                f.evaluate_batch(zs), [f(z) for z in zs]))
+
+
+class TwoLogisticsModel(pints.ForwardModelS1):
+    """
+    Two-output model with outputs ``(y, 2 * y)``, where ``y`` is the output of
+    a :class:`pints.toy.LogisticModel`.
+    """
+    def __init__(self):
+        super(TwoLogisticsModel, self).__init__()
+        self._model = pints.toy.LogisticModel()
+
+    def n_outputs(self):
+        return 2
+
+    def n_parameters(self):
+        return 2
+
+    def simulate(self, parameters, times):
+        y = self._model.simulate(parameters, times)
+        return np.vstack((y, 2 * y)).T
+
+    def simulateS1(self, parameters, times):
+        y, dy = self._model.simulateS1(parameters, times)
+        return np.vstack((y, 2 * y)).T, np.stack((dy, 2 * dy), axis=1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -13,6 +13,8 @@ import pints
 import pints.toy
 import numpy as np
 
+from shared import CountingModel
+
 
 class Testlog_posterior(unittest.TestCase):
 
@@ -52,6 +54,17 @@ class Testlog_posterior(unittest.TestCase):
         y2, dy2 = log_likelihood.evaluateS1(x)
         self.assertTrue(np.all(dy == dy1 + dy2))
 
+        # Test batch evaluation, including points outside the prior
+        p = pints.LogPosterior(
+            log_likelihood, pints.UniformLogPrior([0, 0], [1, 1000]))
+        xs = [[0.014, 501], [-1, 500], [0.015, 499]]
+        ys = p.evaluate_batch(xs)
+        self.assertEqual(ys.shape, (3, ))
+        self.assertEqual(list(ys), [p(x) for x in xs])
+        self.assertEqual(ys[1], -float('inf'))
+        ys = p.evaluate_batch([[-1, 500]])
+        self.assertEqual(list(ys), [-float('inf')])
+
         # Test getting the prior and likelihood back again
         self.assertIs(log_posterior.log_prior(), log_prior)
         self.assertIs(log_posterior.log_likelihood(), log_likelihood)
@@ -68,6 +81,52 @@ class Testlog_posterior(unittest.TestCase):
             ValueError, pints.LogPosterior, log_likelihood,
             pints.GaussianLogPrior(0.015, 0.3))
 
+    def test_components(self):
+        # Test evaluating the log-posterior, log-likelihood, and log-prior at
+        # once, and skipping the log-likelihood when the log-prior is -inf
+
+        model = CountingModel(pints.toy.LogisticModel())
+        times = np.linspace(0, 1000, 100)
+        values = model.simulate([0.015, 500], times)
+        problem = pints.SingleOutputProblem(model, times, values)
+        log_likelihood = pints.GaussianKnownSigmaLogLikelihood(problem, 0.1)
+        log_prior = pints.ComposedLogPrior(
+            pints.UniformLogPrior(0, 1), pints.GaussianLogPrior(500, 100))
+        p = pints.LogPosterior(log_likelihood, log_prior)
+
+        xs = [[0.014, 501], [-1, 500], [0.015, 499]]
+        for x in xs:
+            model.reset()
+            y, a, b = p.evaluate_components(x)
+            if log_prior(x) == -float('inf'):
+                self.assertEqual(model.n_simulate, 0)
+                self.assertEqual(y, -float('inf'))
+                self.assertTrue(np.isnan(a))
+            else:
+                self.assertEqual(model.n_simulate, 1)
+                self.assertEqual(a, log_likelihood(x))
+            self.assertEqual(y, p(x))
+            self.assertEqual(b, log_prior(x))
+
+        model.reset()
+        ys, as_, bs = p.evaluate_components_batch(xs)
+        self.assertEqual(model.n_simulate, 2)
+        self.assertEqual(list(ys), [p(x) for x in xs])
+        self.assertTrue(np.isnan(as_[1]))
+        self.assertEqual(as_[0], log_likelihood(xs[0]))
+        self.assertEqual(as_[2], log_likelihood(xs[2]))
+        self.assertEqual(list(bs), [log_prior(x) for x in xs])
+
+        # Derivatives don't simulate when the log-prior is -inf
+        model.reset()
+        y, dy = p.evaluateS1(xs[1])
+        self.assertEqual(model.n_simulateS1, 0)
+        self.assertEqual(y, -float('inf'))
+        self.assertEqual(dy.shape, (2, ))
+        y, dy = p.evaluateS1(xs[0])
+        self.assertEqual(model.n_simulateS1, 1)
+        self.assertEqual(y, p(xs[0]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -13,6 +13,12 @@ import pints
 import numpy as np
 import scipy.stats
 
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
 
 class TestPrior(unittest.TestCase):
 
@@ -104,6 +110,18 @@ class TestPrior(unittest.TestCase):
         self.assertEqual(p1.n_parameters(), 1)
         self.assertEqual(p2.n_parameters(), 1)
 
+        # Test derivatives against finite differences
+        h = 1e-6
+        for p in (p1, p2):
+            for x in [-20., -1., 0., 3., 10., 50.]:
+                y, dy = p.evaluateS1([x])
+                self.assertEqual(y, p([x]))
+                self.assertEqual(dy.shape, (1, ))
+                self.assertAlmostEqual(
+                    dy[0], (p([x + h]) - p([x - h])) / (2 * h))
+        self.assertEqual(p1.evaluateS1([0])[1][0], 0)
+        self.assertAlmostEqual(p2.evaluateS1([15])[1][0], -0.2)
+
     def test_cauchy_prior_sampling(self):
         # Aren't many tests for Cauchy distributions
         # because they have no mean or variance!
@@ -203,6 +221,80 @@ class TestPrior(unittest.TestCase):
         x = p.sample(n)
         self.assertEqual(x.shape, (n, d))
 
+    def test_evaluate_batch(self):
+        # Test batch evaluation against evaluation of individual points
+
+        priors = [
+            pints.BetaLogPrior(0.123, 2.34),
+            pints.CauchyLogPrior(1, 2),
+            pints.ExponentialLogPrior(1.5),
+            pints.GammaLogPrior(0.5, 3),
+            pints.GaussianLogPrior(1, 2),
+            pints.HalfCauchyLogPrior(1, 2),
+            pints.InverseGammaLogPrior(2, 3),
+            pints.LogNormalLogPrior(1, 2),
+            pints.StudentTLogPrior(1, 3, 2),
+            pints.UniformLogPrior([0, 1], [2, 3]),
+            pints.MultivariateGaussianLogPrior([0, 1], [[1, .3], [.3, 2]]),
+            pints.ComposedLogPrior(
+                pints.GaussianLogPrior(0, 1),
+                pints.UniformLogPrior([0, 1], [2, 3]),
+                pints.GammaLogPrior(2, 3)),
+        ]
+        points = [-2, -0.5, 0, 0.001, 0.3, 0.5, 1, 1.5, 2, 2.5, 10]
+        np.random.seed(1)
+        for p in priors:
+            n = p.n_parameters()
+            xs = np.random.uniform(-1, 4, size=(20, n))
+            if n == 1:
+                xs = np.vstack([xs, np.array(points).reshape((-1, 1))])
+            else:
+                xs = np.vstack([xs, np.zeros((1, n)), np.ones((1, n)) * 2])
+
+            fx = p.evaluate_batch(xs)
+            self.assertEqual(fx.shape, (len(xs), ))
+            self.assertTrue(np.allclose(fx, [p(x) for x in xs]))
+            self.assertEqual(p.evaluate_batch(np.zeros((0, n))).shape, (0, ))
+
+            try:
+                p.evaluateS1(xs[0])
+            except NotImplementedError:
+                continue
+            fx, dfx = p.evaluateS1_batch(xs)
+            self.assertEqual(dfx.shape, xs.shape)
+            for x, f, df in zip(xs, fx, dfx):
+                g, dg = p.evaluateS1(x)
+                self.assertAlmostEqual(f, g)
+                self.assertTrue(np.allclose(df, dg))
+            fx, dfx = p.evaluateS1_batch(np.zeros((0, n)))
+            self.assertEqual(fx.shape, (0, ))
+            self.assertEqual(dfx.shape, (0, n))
+
+        # Composed priors need derivatives for all sub-priors
+        class FlatLogPrior(pints.LogPrior):
+            def __call__(self, x):
+                return 0
+
+            def n_parameters(self):
+                return 1
+
+        p = pints.ComposedLogPrior(
+            pints.GaussianLogPrior(0, 1), FlatLogPrior())
+        self.assertRaises(
+            NotImplementedError, p.evaluateS1_batch, np.zeros((3, 2)))
+
+        # Uniform prior with non-rectangular boundaries
+        class CircleBoundaries(pints.Boundaries):
+            def check(self, x):
+                return x[0]**2 + x[1]**2 < 1
+
+            def n_parameters(self):
+                return 2
+
+        p = pints.UniformLogPrior(CircleBoundaries())
+        xs = np.random.uniform(-1, 1, size=(20, 2))
+        self.assertTrue(np.all(p.evaluate_batch(xs) == [p(x) for x in xs]))
+
     def test_exponential_prior(self):
 
         # Test input parameter
@@ -415,6 +507,31 @@ class TestPrior(unittest.TestCase):
         self.assertEqual(p1.n_parameters(), 1)
         self.assertEqual(p2.n_parameters(), 1)
 
+        # Test derivatives against finite differences
+        h = 1e-6
+        for p in (p1, p2):
+            for x in [0.1, 3., 10., 50.]:
+                y, dy = p.evaluateS1([x])
+                self.assertEqual(y, p([x]))
+                self.assertEqual(dy.shape, (1, ))
+                self.assertAlmostEqual(
+                    dy[0], (p([x + h]) - p([x - h])) / (2 * h))
+        self.assertAlmostEqual(p2.evaluateS1([15])[1][0], -0.2)
+
+        # Outside of the support
+        for x in [-1, 0]:
+            y, dy = p2.evaluateS1([x])
+            self.assertEqual(y, -float('inf'))
+            self.assertEqual(dy[0], 0)
+
+        # Composed priors can now be differentiated
+        p = pints.ComposedLogPrior(
+            pints.CauchyLogPrior(10, 5), pints.HalfCauchyLogPrior(10, 5),
+            pints.MultivariateGaussianLogPrior([0, 1], [[1, 0], [0, 2]]))
+        y, dy = p.evaluateS1([15, 15, 1, 2])
+        self.assertAlmostEqual(y, p([15, 15, 1, 2]))
+        self.assertTrue(np.allclose(dy, [-0.2, -0.2, -1, -0.5]))
+
     def test_half_cauchy_prior_sampling(self):
         # Aren't many tests for Cauchy distributions
         # because they have no mean or variance!
@@ -604,10 +721,37 @@ class TestPrior(unittest.TestCase):
         for idx, component in enumerate(mean):
             self.assertAlmostEqual(p.mean()[idx], component)
 
+        # Test values and derivatives against scipy and a direct solve
+        np.random.seed(1)
+        a = np.random.normal(size=(5, 5))
+        covariance = a.dot(a.T) + 5 * np.eye(5)
+        p = pints.MultivariateGaussianLogPrior(mean, covariance)
+        xs = np.random.normal(0, 3, size=(10, 5))
+        fxs = scipy.stats.multivariate_normal.logpdf(xs, mean, covariance)
+        dfxs = -np.linalg.solve(covariance, (xs - mean).T).T
+        for x, fx, dfx in zip(xs, fxs, dfxs):
+            self.assertAlmostEqual(p(x), fx)
+            y, dy = p.evaluateS1(x)
+            self.assertAlmostEqual(y, fx)
+            self.assertEqual(dy.shape, (5, ))
+            self.assertTrue(np.allclose(dy, dfx))
+        self.assertTrue(np.allclose(p.evaluate_batch(xs), fxs))
+        y, dy = p.evaluateS1_batch(xs)
+        self.assertTrue(np.allclose(y, fxs))
+        self.assertTrue(np.allclose(dy, dfxs))
+
+        # Far away points are finite
+        self.assertTrue(np.isfinite(p(np.array(mean) + 1e3)))
+
         # Test errors
         self.assertRaises(
             ValueError, pints.MultivariateGaussianLogPrior, [1, 2],
             [[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+        self.assertRaisesRegex(
+            ValueError, 'positive definite',
+            pints.MultivariateGaussianLogPrior, [1, 2], [[1, 2], [2, 1]])
+        self.assertRaisesRegex(
+            ValueError, 'must have length 5', p.evaluateS1, [1, 2])
 
     def test_multivariate_normal_sampling(self):
         d = 1
@@ -637,7 +781,7 @@ class TestPrior(unittest.TestCase):
         # Roughly check distribution (main checks are in numpy!)
         np.random.seed(1)
         p = pints.MultivariateGaussianLogPrior(mean, covariance)
-        x = p.sample(10000)
+        x = p.sample(100000)
         self.assertTrue(np.all(np.abs(mean - x.mean(axis=0)) < 0.1))
         self.assertTrue(np.all(
             np.abs(np.diag(covariance) - x.std(axis=0)**2) < 0.1))
@@ -855,6 +999,80 @@ class TestPrior(unittest.TestCase):
         self.assertTrue(
             np.linalg.norm(x.mean(axis=0) - 0.5 * (upper + lower)) < 0.1)
 
+    def test_unit_cube(self):
+        # Test conversion to and from the unit cube
+
+        priors = [
+            pints.BetaLogPrior(0.123, 2.34),
+            pints.CauchyLogPrior(1, 2),
+            pints.ExponentialLogPrior(1.5),
+            pints.GammaLogPrior(0.5, 3),
+            pints.GaussianLogPrior(1, 2),
+            pints.HalfCauchyLogPrior(1, 2),
+            pints.InverseGammaLogPrior(2, 3),
+            pints.LogNormalLogPrior(1, 2),
+            pints.StudentTLogPrior(1, 3, 2),
+            pints.UniformLogPrior([0, 1], [2, 3]),
+            pints.MultivariateGaussianLogPrior([0, 1], [[1, .3], [.3, 2]]),
+            pints.ComposedLogPrior(
+                pints.GaussianLogPrior(0, 1),
+                pints.UniformLogPrior([0, 1], [2, 3]),
+                pints.GammaLogPrior(2, 3)),
+        ]
+        np.random.seed(1)
+        for p in priors:
+            n = p.n_parameters()
+            u = np.random.uniform(0.01, 0.99, size=(100, n))
+            x = p.convert_from_unit_cube(u)
+            self.assertEqual(x.shape, u.shape)
+            self.assertTrue(np.all(np.isfinite(p.evaluate_batch(x))))
+            v = p.convert_to_unit_cube(x)
+            self.assertEqual(v.shape, u.shape)
+            self.assertTrue(np.allclose(u, v))
+
+        # Test against inverse cdfs
+        p = pints.GaussianLogPrior(3, 2)
+        self.assertAlmostEqual(p.convert_from_unit_cube([0.5])[0, 0], 3)
+        self.assertAlmostEqual(
+            p.convert_from_unit_cube([0.975])[0, 0], 3 + 1.959964 * 2, 5)
+        p = pints.ExponentialLogPrior(2)
+        self.assertAlmostEqual(
+            p.convert_from_unit_cube([0.5])[0, 0], np.log(2) / 2)
+        p = pints.UniformLogPrior([0, 1], [2, 5])
+        x = p.convert_from_unit_cube([[0, 0], [0.5, 0.25], [0.75, 1]])
+        self.assertTrue(np.all(x == [[0, 1], [1, 2], [1.5, 5]]))
+        p = pints.HalfCauchyLogPrior(-1, 2)
+        self.assertEqual(p.convert_from_unit_cube([0])[0, 0], 0)
+        self.assertEqual(p.convert_to_unit_cube([-1])[0, 0], 0)
+
+        # Composed priors convert block-wise
+        p = pints.ComposedLogPrior(
+            pints.GaussianLogPrior(0, 1),
+            pints.UniformLogPrior([0, 1], [2, 3]))
+        x = p.convert_from_unit_cube([[0.5, 0.5, 0.5]])
+        self.assertTrue(np.allclose(x, [[0, 1, 2]]))
+
+        # Samples from converted points have the right distribution
+        p = pints.MultivariateGaussianLogPrior([1, 2], [[1, .5], [.5, 2]])
+        x = p.convert_from_unit_cube(np.random.uniform(size=(100000, 2)))
+        self.assertTrue(np.all(np.abs(x.mean(axis=0) - [1, 2]) < 0.02))
+        self.assertTrue(
+            np.allclose(np.cov(x.T), [[1, .5], [.5, 2]], atol=0.05))
+
+        # Not implemented for non-rectangular boundaries
+        class CircleBoundaries(pints.Boundaries):
+            def check(self, x):
+                return x[0]**2 + x[1]**2 < 1
+
+            def n_parameters(self):
+                return 2
+
+        p = pints.UniformLogPrior(CircleBoundaries())
+        self.assertRaises(
+            NotImplementedError, p.convert_from_unit_cube, [[0.5, 0.5]])
+        self.assertRaises(
+            NotImplementedError, p.convert_to_unit_cube, [[0.5, 0.5]])
+
 
 if __name__ == '__main__':
     unittest.main()
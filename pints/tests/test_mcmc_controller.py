@@ -11,6 +11,7 @@ from __future__ import absolute_import, division
 from __future__ import print_function, unicode_literals
 import os
 import pints
+import pints.io
 import pints.toy
 import unittest
 import numpy as np
@@ -311,6 +312,40 @@ class TestMCMCController(unittest.TestCase):
         self.assertEqual(chains.shape[1], niterations)
         self.assertEqual(chains.shape[2], nparameters)
 
+        # Test with automatic choice of workers
+        mcmc.set_parallel('auto')
+        self.assertEqual(mcmc.parallel(), pints.ParallelEvaluator.cpu_count())
+        with StreamCapture() as c:
+            chains = mcmc.run()
+        self.assertIn('worker processes automatically', c.text())
+        self.assertEqual(chains.shape, (nchains, niterations, nparameters))
+
+        # Test with worker threads
+        mcmc.set_parallel(3, threads=True)
+        self.assertEqual(mcmc.parallel(), 3)
+        with StreamCapture() as c:
+            chains = mcmc.run()
+        self.assertIn('with 3 worker threads', c.text())
+        self.assertEqual(chains.shape, (nchains, niterations, nparameters))
+
+        # Test with a pool of workers, shared with an optimisation
+        pool = pints.ParallelEvaluator(
+            self.log_posterior, n_workers=2, max_tasks_per_worker=100000)
+        opt = pints.OptimisationController(
+            self.log_posterior, self.real_parameters, method=pints.XNES)
+        opt.set_max_iterations(5)
+        opt.set_log_to_screen(False)
+        opt.set_parallel(pool)
+        opt.run()
+        pids = sorted(w.pid for w in pool._workers)
+        mcmc.set_parallel(pool)
+        self.assertEqual(mcmc.parallel(), 2)
+        with StreamCapture() as c:
+            chains = mcmc.run()
+        self.assertIn('with 2 worker', c.text())
+        self.assertEqual(chains.shape, (nchains, niterations, nparameters))
+        self.assertEqual(sorted(w.pid for w in pool._workers), pids)
+
     def test_logging(self):
 
         np.random.seed(1)
@@ -528,7 +563,8 @@ class TestMCMCController(unittest.TestCase):
                 for chain in chains1:
                     logpdfs = np.array([self.log_posterior(x) for x in chain])
                     logpriors = np.array([self.log_prior(x) for x in chain])
-                    loglikelihoods = logpdfs - logpriors
+                    loglikelihoods = np.array(
+                        [self.log_likelihood(x) for x in chain])
                     evals = np.array([logpdfs, loglikelihoods, logpriors]).T
                     evals1.append(evals)
                 evals1 = np.array(evals1)
@@ -592,7 +628,8 @@ class TestMCMCController(unittest.TestCase):
                 for chain in chains1:
                     logpdfs = np.array([self.log_posterior(x) for x in chain])
                     logpriors = np.array([self.log_prior(x) for x in chain])
-                    loglikelihoods = logpdfs - logpriors
+                    loglikelihoods = np.array(
+                        [self.log_likelihood(x) for x in chain])
                     evals = np.array([logpdfs, loglikelihoods, logpriors]).T
                     evals1.append(evals)
                 evals1 = np.array(evals1)
@@ -767,7 +804,8 @@ class TestMCMCController(unittest.TestCase):
                 for chain in chains1:
                     logpdfs = np.array([self.log_posterior(x) for x in chain])
                     logpriors = np.array([self.log_prior(x) for x in chain])
-                    loglikelihoods = logpdfs - logpriors
+                    loglikelihoods = np.array(
+                        [self.log_likelihood(x) for x in chain])
                     evals = np.array([logpdfs, loglikelihoods, logpriors]).T
                     evals1.append(evals)
                 evals1 = np.array(evals1)
@@ -779,6 +817,87 @@ class TestMCMCController(unittest.TestCase):
             self.assertIn('Writing evaluations to', text)
             self.assertIn('evals_0.csv', text)
 
+    def test_eval_logging_components(self):
+        """
+        Test writing evaluations of a log-posterior doesn't re-evaluate the
+        log-prior, and works with samplers that use sensitivities.
+        """
+
+        class CountingLogPrior(pints.ComposedLogPrior):
+            def __init__(self, *priors):
+                super(CountingLogPrior, self).__init__(*priors)
+                self.n_evals = 0
+
+            def __call__(self, x):
+                self.n_evals += 1
+                return super(CountingLogPrior, self).__call__(x)
+
+            def evaluate_batch(self, xs):
+                self.n_evals += len(xs)
+                return super(CountingLogPrior, self).evaluate_batch(xs)
+
+            def evaluateS1(self, x):
+                self.n_evals += 1
+                return super(CountingLogPrior, self).evaluateS1(x)
+
+        log_pdf = pints.toy.GaussianLogPDF([1, 2], [1, 3])
+        log_prior = CountingLogPrior(
+            pints.GaussianLogPrior(0, 10), pints.GaussianLogPrior(0, 10))
+        log_posterior = pints.LogPosterior(log_pdf, log_prior)
+        nchains = 2
+        xs = [[1, 2], [0.5, 1.5]]
+
+        for method in (pints.AdaptiveCovarianceMCMC, pints.HamiltonianMCMC):
+            np.random.seed(1)
+            log_prior.n_evals = 0
+            mcmc = pints.MCMCController(
+                log_posterior, nchains, xs, method=method)
+            mcmc.set_max_iterations(20)
+            mcmc.set_log_to_screen(False)
+            with TemporaryDirectory() as d:
+                mcmc.set_log_pdf_filename(d.path('evals.csv'))
+                chains = mcmc.run()
+                evals = np.array(pints.io.load_samples(
+                    d.path('evals.csv'), nchains))
+
+            # One prior evaluation per log-posterior evaluation
+            if method is pints.AdaptiveCovarianceMCMC:
+                self.assertEqual(log_prior.n_evals, 20 * nchains)
+
+            for chain, chain_evals in zip(chains, evals):
+                for x, e in zip(chain, chain_evals):
+                    self.assertAlmostEqual(e[0], log_posterior(x))
+                    self.assertAlmostEqual(e[1], log_pdf(x))
+                    self.assertAlmostEqual(e[2], log_prior(x))
+
+    def test_eval_logging_components_error_policy(self):
+        # Test proposals outside the prior are not logged as errors when
+        # writing evaluations with an error-tolerant evaluator
+
+        log_pdf = pints.toy.GaussianLogPDF([1, 2], [1, 3])
+        log_prior = pints.UniformLogPrior([0, 0], [1.5, 2.5])
+        log_posterior = pints.LogPosterior(log_pdf, log_prior)
+        nchains = 2
+        xs = [[1, 2], [0.5, 1.5]]
+
+        for method in (pints.AdaptiveCovarianceMCMC, pints.HamiltonianMCMC):
+            np.random.seed(1)
+            evaluator = pints.SequentialEvaluator(
+                log_posterior, error_policy='sentinel')
+            mcmc = pints.MCMCController(
+                log_posterior, nchains, xs, method=method)
+            mcmc.set_max_iterations(50)
+            mcmc.set_log_to_screen(False)
+            mcmc.set_parallel(evaluator)
+            with TemporaryDirectory() as d:
+                mcmc.set_log_pdf_filename(d.path('evals.csv'))
+                mcmc.run()
+                evals = np.array(pints.io.load_samples(
+                    d.path('evals.csv'), nchains))
+
+            self.assertEqual(evaluator.error_log(), [])
+            self.assertTrue(np.all(np.isfinite(evals)))
+
     def test_deprecated_alias(self):
 
         mcmc = pints.MCMCSampling(
@@ -10,10 +10,13 @@
 from __future__ import print_function, unicode_literals
 import sys
 import pints
+import pints.io
 import pints.toy
 import numpy as np
 import unittest
 
+from shared import TemporaryDirectory
+
 
 class TestMultiOutputProblem(unittest.TestCase):
     """
@@ -56,6 +59,44 @@ class TestMultiOutputProblem(unittest.TestCase):
         values = model.simulate([1, 1], times)
         pints.MultiOutputProblem(model, times, values)
 
+    def test_evaluate_batch(self):
+
+        model = pints.toy.FitzhughNagumoModel()
+        times = [0, 1, 2, 3]
+        values = np.zeros((4, 2))
+        problem = pints.MultiOutputProblem(model, times, values)
+        xs = np.array([[1, 1, 1], [0.1, 0.2, 3]])
+        ys = problem.evaluate_batch(xs)
+        self.assertEqual(ys.shape, (2, 4, 2))
+        for x, y in zip(xs, ys):
+            self.assertTrue(np.all(y == problem.evaluate(x)))
+
+    def test_memory_mapped(self):
+        # Test using memory-mapped data, which isn't copied
+
+        model = pints.toy.FitzhughNagumoModel()
+        times = np.linspace(0, 10, 20)
+        values = model.simulate([0.1, 0.5, 3], times)
+        with TemporaryDirectory() as d:
+            np.save(d.path('t.npy'), times)
+            np.save(d.path('v.npy'), values)
+            t = pints.io.load_array(d.path('t.npy'))
+            v = pints.io.load_array(d.path('v.npy'))
+            problem = pints.MultiOutputProblem(model, t, v, shared=True)
+            self.assertTrue(np.may_share_memory(problem.times(), t))
+            self.assertTrue(np.may_share_memory(problem.values(), v))
+            self.assertTrue(np.all(problem.values() == values))
+
+            # 1d arrays are reshaped
+            model = pints.toy.LogisticModel()
+            values = model.simulate([1, 10], times)
+            np.save(d.path('v.npy'), values)
+            v = pints.io.load_array(d.path('v.npy'))
+            problem = pints.MultiOutputProblem(model, t, v)
+            self.assertTrue(np.may_share_memory(problem.values(), v))
+            self.assertEqual(problem.values().shape, (20, 1))
+            del(problem, t, v)
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
@@ -25,6 +25,21 @@ except AttributeError:
 debug = False
 
 
+class NoUnitCubePrior(pints.LogPrior):
+    """ Wraps a prior, but doesn't support conversion from the unit cube. """
+    def __init__(self, prior):
+        self._prior = prior
+
+    def __call__(self, x):
+        return self._prior(x)
+
+    def n_parameters(self):
+        return self._prior.n_parameters()
+
+    def sample(self, n=1):
+        return self._prior.sample(n)
+
+
 class TestNestedRejectionSampler(unittest.TestCase):
     """
     Unit (not functional!) tests for :class:`NestedRejectionSampler`.
@@ -72,6 +87,55 @@ class TestNestedRejectionSampler(unittest.TestCase):
         # Check output: Note n returned samples = n posterior samples
         self.assertEqual(samples.shape, (10, 2))
 
+    def test_unit_cube(self):
+        """ Test runs with and without conversion from the unit cube. """
+
+        np.random.seed(1)
+        for log_prior, unit_cube in (
+                (self.log_prior, True),
+                (NoUnitCubePrior(self.log_prior), False)):
+            sampler = pints.NestedRejectionSampler(
+                self.log_likelihood, log_prior)
+            self.assertEqual(sampler._unit_cube, unit_cube)
+            sampler.set_posterior_samples(10)
+            sampler.set_iterations(50)
+            sampler.set_active_points_rate(50)
+            sampler.set_log_to_screen(False)
+            samples, margin = sampler.run()
+            self.assertEqual(samples.shape, (10, 2))
+            self.assertTrue(np.all(np.isfinite(log_prior.evaluate_batch(
+                samples))))
+
+    def test_reject_sample(self):
+        """ Test points drawn but not evaluated are used in later calls. """
+
+        sampler = pints.NestedRejectionSampler(
+            self.log_likelihood, self.log_prior)
+        drawn = []
+
+        def draw(n):
+            drawn.append(n)
+            return sampler._sample_search_space(n)
+
+        np.random.seed(1)
+        threshold = self.log_likelihood(self.real_parameters[:2]) - 1000
+        for i in range(100):
+            u, x, fx = sampler._reject_sample(draw, threshold)
+            self.assertGreaterEqual(fx, threshold)
+            self.assertEqual(fx, self.log_likelihood(x))
+            self.assertTrue(np.all(
+                self.log_prior.convert_from_unit_cube(u.reshape((1, 2)))
+                == x))
+        self.assertLessEqual(sum(drawn), sampler._n_evals + 1000)
+
+        # Unused points are only used for the same key
+        n = len(drawn)
+        self.assertGreater(len(sampler._unused[1]), 0)
+        sampler._reject_sample(draw, -np.inf)
+        self.assertEqual(len(drawn), n)
+        sampler._reject_sample(draw, -np.inf, 'other')
+        self.assertEqual(len(drawn), n + 1)
+
     def test_construction_errors(self):
         """ Tests if invalid constructor calls are picked up. """
 
@@ -274,6 +338,28 @@ class TestNestedEllipsoidSampler(unittest.TestCase):
         # Check output: Note n returned samples = n posterior samples
         self.assertEqual(samples.shape, (10, 2))
 
+    def test_unit_cube(self):
+        """ Test runs with and without conversion from the unit cube. """
+
+        np.random.seed(1)
+        for log_prior, unit_cube in (
+                (self.log_prior, True),
+                (NoUnitCubePrior(self.log_prior), False)):
+            sampler = pints.NestedEllipsoidSampler(
+                self.log_likelihood, log_prior)
+            self.assertEqual(sampler._unit_cube, unit_cube)
+            sampler.set_posterior_samples(10)
+            sampler.set_rejection_samples(20)
+            sampler.set_iterations(50)
+            sampler.set_active_points_rate(50)
+            sampler.set_log_to_screen(False)
+            samples, margin = sampler.run()
+            self.assertEqual(samples.shape, (10, 2))
+            if unit_cube:
+                # Points outside the unit cube are never evaluated
+                self.assertTrue(np.all(np.isfinite(
+                    log_prior.evaluate_batch(samples))))
+
     def test_settings_check(self):
         """
         Tests the settings check at the start of a run.
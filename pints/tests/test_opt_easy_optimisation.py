@@ -83,6 +83,17 @@ class TestEasyOptimisation(unittest.TestCase):
         # Test with parallelisation
         pints.curve_fit(g, x, y, p0, parallel=True, method=pints.XNES)
 
+        # Test re-using a pool of workers for fmin and curve_fit
+        pool = pints.ParallelEvaluator(
+            f, n_workers=2, max_tasks_per_worker=100000)
+        xopt, fopt = pints.fmin(f, [1, 1], parallel=pool, method=pints.XNES)
+        self.assertAlmostEqual(xopt[0], 3)
+        pids = sorted(w.pid for w in pool._workers)
+        self.assertEqual(len(pids), 2)
+        pints.curve_fit(g, x, y, p0, parallel=pool, method=pints.XNES)
+        pints.fmin(f, [1, 1], parallel=pool, method=pints.XNES)
+        self.assertEqual(sorted(w.pid for w in pool._workers), pids)
+
         # Test with invalid sizes of `x` and `y`
         x = np.linspace(-5, 5, 99)
         self.assertRaisesRegexp(
@@ -198,6 +198,55 @@ class TestOptimisationController(unittest.TestCase):
         self.assertTrue(type(opt.parallel()) == int)
         self.assertEqual(opt.parallel(), 1)
 
+        # Run with automatic choice of workers
+        opt = pints.OptimisationController(r, x, boundaries=b, method=method)
+        opt.set_max_iterations(10)
+        opt.set_log_to_screen(True)
+        opt.set_parallel('auto')
+        self.assertEqual(opt.parallel(), pints.ParallelEvaluator.cpu_count())
+        with StreamCapture() as c:
+            opt.run()
+        self.assertIn('worker processes automatically', c.text())
+        self.assertIn('Workers', c.text())
+
+        # Run with threads
+        opt = pints.OptimisationController(r, x, boundaries=b, method=method)
+        opt.set_max_iterations(10)
+        opt.set_log_to_screen(True)
+        opt.set_parallel(2, threads=True)
+        self.assertEqual(opt.parallel(), 2)
+        with StreamCapture() as c:
+            opt.run()
+        self.assertIn('with 2 worker threads', c.text())
+
+        # Run twice with the same pool of workers
+        pool = pints.ParallelEvaluator(r, n_workers=2)
+        for i in range(2):
+            opt = pints.OptimisationController(
+                r, x, boundaries=b, method=method)
+            opt.set_max_iterations(10)
+            opt.set_log_to_screen(True)
+            opt.set_parallel(pool)
+            self.assertEqual(opt.parallel(), 2)
+            with StreamCapture() as c:
+                opt.run()
+            self.assertIn('with 2 worker processes', c.text())
+        self.assertEqual(len(pool._workers), 2)
+
+        # Run with a caching pool
+        cache = pints.CachingEvaluator(pool)
+        opt.set_parallel(cache)
+        self.assertEqual(opt.parallel(), 2)
+        opt.run()
+        self.assertTrue(cache.misses() > 0)
+
+        # Run with a pool of threads
+        opt.set_parallel(pints.ThreadedEvaluator(r, n_workers=3))
+        self.assertEqual(opt.parallel(), 3)
+        with StreamCapture() as c:
+            opt.run()
+        self.assertIn('with 3 worker threads', c.text())
+
     def test_deprecated_alias(self):
         # Tests Optimisation()
         r = pints.toy.RosenbrockError()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+#
+# Tests the shared (memory-mapped) array type.
+#
+# This file is part of PINTS.
+#  Copyright (c) 2017-2019, University of Oxford.
+#  For licensing information, see the LICENSE file distributed with the PINTS
+#  software package.
+#
+import gc
+import os
+import pickle
+import unittest
+import numpy as np
+import pints
+import pints.toy
+
+from shared import TemporaryDirectory
+
+
+class TestSharedArray(unittest.TestCase):
+    """
+    Tests conversion to a read-only array backed by a memory-mapped file.
+    """
+    def test_shared_array(self):
+        # Test basic use
+
+        x = np.arange(5000).reshape((1000, 5))
+        y = pints.shared_array(x)
+        self.assertTrue(np.all(x == y))
+        self.assertEqual(y.dtype, float)
+        self.assertFalse(y.flags.writeable)
+        self.assertTrue(os.path.isfile(y.filename))
+
+        # Arrays and contiguous slices are pickled by reference
+        for z in [y, y[10:], y[3], y[500:510]]:
+            s = pickle.dumps(z)
+            self.assertLess(len(s), 1000)
+            w = pickle.loads(s)
+            self.assertTrue(np.all(z == w))
+            self.assertEqual(w.filename, y.filename)
+            self.assertFalse(w.flags.writeable)
+
+        # Slices of unpickled views work too
+        w = pickle.loads(pickle.dumps(y[10:]))
+        self.assertTrue(np.all(pickle.loads(pickle.dumps(w[5:7])) == x[15:17]))
+
+        # Non-contiguous slices are copied
+        z = y[:, 2]
+        w = pickle.loads(pickle.dumps(z))
+        self.assertTrue(np.all(z == w))
+        self.assertNotIsInstance(w, np.memmap)
+
+        # Results of calculations are ordinary arrays
+        self.assertNotIsInstance(y * 2, np.memmap)
+
+        # File is removed when no longer used
+        path = y.filename
+        del(x, y, z, w)
+        gc.collect()
+        self.assertFalse(os.path.exists(path))
+
+        # Empty arrays
+        y = pints.shared_array([])
+        self.assertEqual(y.shape, (0, ))
+        self.assertEqual(pickle.loads(pickle.dumps(y)).shape, (0, ))
+
+        # Custom directory
+        with TemporaryDirectory() as d:
+            os.makedirs(d.path('data'))
+            y = pints.shared_array([1, 2, 3], d.path('data'))
+            self.assertEqual(os.path.dirname(y.filename), d.path('data'))
+            del(y)
+            gc.collect()
+
+    def test_shared_problems(self):
+        # Test using problems with shared data
+
+        model = pints.toy.LogisticModel()
+        times = np.linspace(0, 100, 10000)
+        values = model.simulate([0.1, 50], times)
+        problem = pints.SingleOutputProblem(model, times, values, shared=True)
+        self.assertTrue(np.all(problem.times() == times))
+        self.assertTrue(np.all(problem.values() == values))
+        self.assertIsInstance(problem.values(), np.memmap)
+
+        # Data isn't copied when a likelihood is pickled
+        log_likelihood = pints.GaussianKnownSigmaLogLikelihood(problem, 1)
+        self.assertLess(len(pickle.dumps(log_likelihood)), 10000)
+        self.assertGreater(
+            len(pickle.dumps(pints.GaussianKnownSigmaLogLikelihood(
+                pints.SingleOutputProblem(model, times, values), 1))), 160000)
+
+        # Parallel evaluation gives same results
+        xs = [[0.1, 50], [0.11, 49], [0.09, 52]]
+        e = pints.ParallelEvaluator(log_likelihood, n_workers=2)
+        self.assertEqual(e.evaluate(xs), [log_likelihood(x) for x in xs])
+
+        # Multi-output problem
+        model = pints.toy.FitzhughNagumoModel()
+        times = np.linspace(0, 10, 1000)
+        values = model.simulate([0.1, 0.5, 3], times)
+        problem = pints.MultiOutputProblem(model, times, values, shared=True)
+        self.assertTrue(np.all(problem.values() == values))
+        self.assertEqual(problem.values().shape, (1000, 2))
+        copy = pickle.loads(pickle.dumps(problem))
+        self.assertEqual(copy.values().filename, problem.values().filename)
+        self.assertTrue(np.all(copy.evaluate([0.1, 0.5, 3]) == values))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,10 +10,19 @@
 from __future__ import print_function, unicode_literals
 import sys
 import pints
+import pints.io
 import pints.toy
 import numpy as np
 import unittest
 
+from shared import TemporaryDirectory
+
+# Consistent unit testing in Python 2 and 3
+try:
+    unittest.TestCase.assertRaisesRegex
+except AttributeError:
+    unittest.TestCase.assertRaisesRegex = unittest.TestCase.assertRaisesRegexp
+
 
 class TestSingleOutputProblem(unittest.TestCase):
     """
@@ -53,6 +62,85 @@ class TestSingleOutputProblem(unittest.TestCase):
         self.assertRaises(
             ValueError, pints.SingleOutputProblem, model, times, values)
 
+    def test_evaluate_batch(self):
+
+        model = pints.toy.LogisticModel()
+        times = [0, 1, 2, 3, 4]
+        problem = pints.SingleOutputProblem(model, times, [1, 2, 3, 4, 5])
+        xs = np.array([[1, 10], [0.5, 20], [0.1, 5]])
+        ys = problem.evaluate_batch(xs)
+        self.assertEqual(ys.shape, (3, 5))
+        for x, y in zip(xs, ys):
+            self.assertTrue(np.all(y == problem.evaluate(x)))
+        self.assertTrue(np.all(
+            model.simulate_batch(xs, times) == ys))
+
+    def test_memory_mapped(self):
+        # Test using memory-mapped data, which isn't copied
+
+        model = pints.toy.LogisticModel()
+        times = np.linspace(0, 10, 20)
+        values = model.simulate([1, 10], times)
+        with TemporaryDirectory() as d:
+            np.save(d.path('t.npy'), times)
+            np.save(d.path('v.npy'), values.reshape((20, 1)))
+            t = pints.io.load_array(d.path('t.npy'))
+            v = pints.io.load_array(d.path('v.npy'))
+            problem = pints.SingleOutputProblem(model, t, v)
+            self.assertTrue(np.may_share_memory(problem.times(), t))
+            self.assertTrue(np.may_share_memory(problem.values(), v))
+            self.assertEqual(problem.values().shape, (20, ))
+            self.assertFalse(problem.values().flags.writeable)
+            self.assertTrue(np.all(problem.times() == times))
+            self.assertTrue(np.all(problem.values() == values))
+
+            # Copy-on-write maps are copied
+            v = np.load(d.path('v.npy'), mmap_mode='c')
+            problem = pints.SingleOutputProblem(model, t, v)
+            self.assertFalse(np.may_share_memory(problem.values(), v))
+
+            # Writable maps are used, but can't be changed via the problem
+            v = np.load(d.path('v.npy'), mmap_mode='r+')
+            problem = pints.SingleOutputProblem(model, t, v)
+            self.assertTrue(np.may_share_memory(problem.values(), v))
+            self.assertFalse(problem.values().flags.writeable)
+
+            # Maps of other types are converted to native 64-bit floats
+            for dtype in (np.float32, np.dtype(float).newbyteorder()):
+                np.save(d.path('v.npy'), values.astype(dtype))
+                v = pints.io.load_array(d.path('v.npy'))
+                problem = pints.SingleOutputProblem(model, t, v)
+                self.assertEqual(problem.values().dtype, np.dtype(float))
+                self.assertFalse(np.may_share_memory(problem.values(), v))
+                self.assertTrue(np.allclose(problem.values(), values))
+            del(problem, t, v)
+
+            # Times are checked
+            np.save(d.path('t.npy'), times[::-1])
+            t = pints.io.load_array(d.path('t.npy'))
+            self.assertRaisesRegex(
+                ValueError, 'increasing', pints.SingleOutputProblem, model, t,
+                values)
+            del(t)
+
+    def test_check_times(self):
+        # Test checking times in chunks
+
+        f = pints._core._check_times
+        t = np.arange(10)
+        self.assertEqual(f(t, True, 3), (False, False))
+        self.assertEqual(f(t, True, 100), (False, False))
+        self.assertEqual(f([], True, 3), (False, False))
+
+        # Errors across chunk boundaries are detected
+        t = np.array([0, 1, 2, 2, 4, 5])
+        self.assertEqual(f(t, True, 3), (False, True))
+        self.assertEqual(f(t, False, 3), (False, False))
+        t = np.array([0, 1, 2, 1, 4, 5])
+        self.assertEqual(f(t, False, 3), (False, True))
+        t = np.array([0, 1, 2, 3, 4, -5])
+        self.assertEqual(f(t, True, 3), (True, True))
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
@@ -140,6 +140,17 @@ class TestAnnulusLogPDF(unittest.TestCase):
         self.assertAlmostEqual(dl[2], top / (9 * bottom))
         self.assertAlmostEqual(dl[3], top / (3 * bottom))
 
+    def test_evaluate_batch(self):
+        # Test batch evaluation gives same results as single evaluations
+        f = pints.toy.AnnulusLogPDF(dimensions=3)
+        np.random.seed(1)
+        xs = np.random.normal(0, 10, size=(10, 3))
+        self.assertTrue(np.allclose(
+            f.evaluate_batch(xs), [f(x) for x in xs]))
+        self.assertEqual(f.evaluate_batch(xs[:1]).shape, (1, ))
+        self.assertRaisesRegex(
+            ValueError, 'same dimensions', f.evaluate_batch, xs[:, :2])
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
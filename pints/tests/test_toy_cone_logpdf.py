@@ -122,6 +122,17 @@ class TestConeLogPDF(unittest.TestCase):
         x = np.ones((100, 5, 2))
         self.assertRaises(ValueError, f.distance, x)
 
+    def test_evaluate_batch(self):
+        # Test batch evaluation gives same results as single evaluations
+        f = pints.toy.ConeLogPDF(dimensions=3, beta=1.5)
+        np.random.seed(1)
+        xs = np.random.normal(0, 1, size=(10, 3))
+        self.assertTrue(np.allclose(
+            f.evaluate_batch(xs), [f(x) for x in xs]))
+        self.assertEqual(f.evaluate_batch(xs[:1]).shape, (1, ))
+        self.assertRaisesRegex(
+            ValueError, 'same dimensions', f.evaluate_batch, xs[:, :2])
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
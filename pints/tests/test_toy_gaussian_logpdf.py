@@ -132,6 +132,15 @@ class TestGaussianLogPDF(unittest.TestCase):
         self.assertAlmostEqual(L, -25.10903637045394)
         self.assertTrue(np.array_equal(dL, [0.25, 3.5, 3.0]))
 
+    def test_evaluate_batch(self):
+        # Test batch evaluation gives same results as single evaluations
+        f = pints.toy.GaussianLogPDF([1, 2], [[2, 0.5], [0.5, 3]])
+        np.random.seed(1)
+        xs = np.random.normal(0, 1, size=(10, 2))
+        self.assertTrue(np.allclose(
+            f.evaluate_batch(xs), [f(x) for x in xs]))
+        self.assertEqual(f.evaluate_batch(xs[:1]).shape, (1, ))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -106,6 +106,15 @@ class TestHighDimensionalGaussianLogPDF(unittest.TestCase):
             ValueError, pints.toy.HighDimensionalGaussianLogPDF, 11, -0.11
         )
 
+    def test_evaluate_batch(self):
+        # Test batch evaluation gives same results as single evaluations
+        f = pints.toy.HighDimensionalGaussianLogPDF(dimension=5)
+        np.random.seed(1)
+        xs = np.random.normal(0, 1, size=(10, 5))
+        self.assertTrue(np.allclose(
+            f.evaluate_batch(xs), [f(x) for x in xs]))
+        self.assertEqual(f.evaluate_batch(xs[:1]).shape, (1, ))
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
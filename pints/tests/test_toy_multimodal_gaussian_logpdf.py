@@ -195,6 +195,15 @@ class TestMultimodalGaussianLogPDF(unittest.TestCase):
         samples1 = g.sample(n)
         self.assertTrue(f.distance(samples1) > f.distance(samples))
 
+    def test_evaluate_batch(self):
+        # Test batch evaluation gives same results as single evaluations
+        f = pints.toy.MultimodalGaussianLogPDF()
+        np.random.seed(1)
+        xs = np.random.normal(0, 5, size=(10, 2))
+        self.assertTrue(np.allclose(
+            f.evaluate_batch(xs), [f(x) for x in xs]))
+        self.assertEqual(f.evaluate_batch(xs[:1]).shape, (1, ))
+
 
 if __name__ == '__main__':
     unittest.main()
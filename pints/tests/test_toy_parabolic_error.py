@@ -10,6 +10,7 @@
 import pints
 import pints.toy
 import unittest
+import numpy as np
 
 
 class TestParabolicError(unittest.TestCase):
@@ -31,6 +32,15 @@ class TestParabolicError(unittest.TestCase):
         self.assertEqual(f([1, 1, 1]), 0)
         self.assertTrue(f([1.1, 1.1, 1.1]) > 0)
 
+    def test_evaluate_batch(self):
+        # Test batch evaluation gives same results as single evaluations
+        f = pints.toy.ParabolicError([1, -2, 3])
+        np.random.seed(1)
+        xs = np.random.normal(0, 1, size=(10, 3))
+        self.assertTrue(np.allclose(
+            f.evaluate_batch(xs), [f(x) for x in xs]))
+        self.assertEqual(f.evaluate_batch(xs[:1]).shape, (1, ))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -80,6 +80,17 @@ class TestRosenbrock(unittest.TestCase):
         self.assertTrue(f.distance(samples1) > 0)
         self.assertTrue(f.distance(samples) > f.distance(samples1))
 
+    def test_evaluate_batch(self):
+        # Test batch evaluation gives same results as single evaluations
+        np.random.seed(1)
+        xs = np.random.uniform(-2, 3, size=(10, 2))
+        f = pints.toy.RosenbrockError()
+        self.assertTrue(np.allclose(
+            f.evaluate_batch(xs), [f(x) for x in xs]))
+        f = pints.toy.RosenbrockLogPDF()
+        self.assertTrue(np.allclose(
+            f.evaluate_batch(xs), [f(x) for x in xs]))
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
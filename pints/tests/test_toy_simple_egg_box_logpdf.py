@@ -101,6 +101,15 @@ class TestSimpleEggBoxLogPDF(unittest.TestCase):
         self.assertTrue(f.kl_divergence(samples) > 0)
         self.assertEqual(f.kl_divergence(samples), f.distance(samples))
 
+    def test_evaluate_batch(self):
+        # Test batch evaluation gives same results as single evaluations
+        f = pints.toy.SimpleEggBoxLogPDF()
+        np.random.seed(1)
+        xs = np.random.normal(0, 5, size=(10, 2))
+        self.assertTrue(np.allclose(
+            f.evaluate_batch(xs), [f(x) for x in xs]))
+        self.assertEqual(f.evaluate_batch(xs[:1]).shape, (1, ))
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
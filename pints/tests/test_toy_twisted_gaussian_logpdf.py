@@ -111,6 +111,15 @@ class TestTwistedGaussianLogPDF(unittest.TestCase):
         self.assertEqual(dl[2], 3)
         self.assertEqual(dl[3], -12)
 
+    def test_evaluate_batch(self):
+        # Test batch evaluation gives same results as single evaluations
+        f = pints.toy.TwistedGaussianLogPDF(dimension=4)
+        np.random.seed(1)
+        xs = np.random.normal(0, 3, size=(10, 4))
+        self.assertTrue(np.allclose(
+            f.evaluate_batch(xs), [f(x) for x in xs]))
+        self.assertEqual(f.evaluate_batch(xs[:1]).shape, (1, ))
+
 
 if __name__ == '__main__':
     print('Add -v for more debug output')
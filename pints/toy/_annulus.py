@@ -96,6 +96,14 @@ class AnnulusLogPDF(ToyLogPDF):
         dL = np.array([var * cons for var in x])
         return L, dL
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = np.asarray(xs, dtype=float)
+        if xs.ndim != 2 or xs.shape[1] != self._n_parameters:
+            raise ValueError('x must be of same dimensions as density')
+        return scipy.stats.norm.logpdf(
+            np.linalg.norm(xs, axis=1), self._r0, self._sigma)
+
     def mean(self):
         """
         Returns the mean of this distribution.
@@ -103,6 +103,13 @@ class ConeLogPDF(ToyLogPDF):
         dL = np.array([-var * norm for var in x])
         return L, dL
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = np.asarray(xs, dtype=float)
+        if xs.ndim != 2 or xs.shape[1] != self._n_parameters:
+            raise ValueError('x must be of same dimensions as density')
+        return -np.linalg.norm(xs, axis=1)**self._beta
+
     def mean_normed(self):
         """
         Returns the mean of the normed distance from the origin
@@ -75,6 +75,11 @@ class GaussianLogPDF(ToyLogPDF):
         dL = -np.matmul(self._sigma_inv, self._x_minus_mu)
         return L, dL
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`pints.LogPDF.evaluate_batch()`. """
+        xs = np.asarray(xs, dtype=float)
+        return np.reshape(self._phi.logpdf(xs), (len(xs), ))
+
     def kl_divergence(self, samples):
         """
         Calculates the Kullback-Leibler divergence between a given list of
@@ -71,6 +71,11 @@ class HighDimensionalGaussianLogPDF(ToyLogPDF):
         """
         return self.kl_divergence(samples)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`pints.LogPDF.evaluate_batch()`. """
+        xs = np.asarray(xs, dtype=float)
+        return np.reshape(self._var.logpdf(xs), (len(xs), ))
+
     def kl_divergence(self, samples):
         """
         Returns approximate Kullback-Leibler divergence between samples
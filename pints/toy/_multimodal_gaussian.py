@@ -114,6 +114,15 @@ class MultimodalGaussianLogPDF(ToyLogPDF):
             for i, var in enumerate(self._vars)], axis=0)
         return L, -numer / denom
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = np.asarray(xs, dtype=float)
+        f = np.zeros(len(xs))
+        for var in self._vars:
+            f += np.reshape(var.pdf(xs), (len(xs), ))
+        with np.errstate(divide='ignore'):
+            return np.log(f)
+
     def kl_divergence(self, samples):
         """
         Calculates the approximate Kullback-Leibler divergence between a
@@ -29,6 +29,10 @@ class ParabolicError(pints.ErrorMeasure):
     def __call__(self, x):
         return np.sum((self._c - x)**2)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`pints.ErrorMeasure.evaluate_batch()`. """
+        return np.sum((self._c - np.asarray(xs, dtype=float))**2, axis=1)
+
     def n_parameters(self):
         """ See :meth:`pints.ErrorMeasure.n_parameters()`. """
         return self._n
@@ -31,6 +31,11 @@ class RosenbrockError(pints.ErrorMeasure):
     def __call__(self, x):
         return (self._a - x[0])**2 + self._b * (x[1] - x[0]**2)**2
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`pints.ErrorMeasure.evaluate_batch()`. """
+        xs = np.asarray(xs, dtype=float)
+        return self.__call__(xs.T)
+
     def n_parameters(self):
         """ See :meth:`pints.ErrorMeasure.n_parameters()`. """
         return 2
@@ -105,6 +110,10 @@ class RosenbrockLogPDF(ToyLogPDF):
         dL = np.array([dx, dy])
         return L, dL
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        return -np.log(1.0 + self._f.evaluate_batch(xs))
+
     def n_parameters(self):
         """ See :meth:`pints.LogPDF.n_parameters()`. """
         return self._f.n_parameters()
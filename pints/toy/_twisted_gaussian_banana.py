@@ -94,6 +94,14 @@ class TwistedGaussianLogPDF(ToyLogPDF):
             dL = [dx_first, dy_first]
         return L, np.array(dL)
 
+    def evaluate_batch(self, xs):
+        """ See :meth:`LogPDF.evaluate_batch()`. """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.array(xs, copy=True)
+        ys[:, 0] /= np.sqrt(self._V)
+        ys[:, 1] += self._b * ((xs[:, 0] ** 2) - self._V)
+        return np.reshape(self._phi.logpdf(ys), (len(xs), ))
+
     def kl_divergence(self, samples):
         """
         Calculates the approximate Kullback-Leibler divergence between a
@@ -43,6 +43,9 @@ setup(
             'guzzle-sphinx-theme',      # Nice theme for docs
             'sphinx>=1.5, !=1.7.3',     # For doc generation
         ],
+        'threads': [
+            'threadpoolctl',        # For ParallelEvaluator thread limits
+        ],
         'dev': [
             'flake8>=3',            # For code style checking
             'jupyter',              # For documentation and testing